@@ -0,0 +1,81 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pydantic
+
+from src.infra.amqp.codecs import CodecRegistry, JsonCodec
+from src.infra.amqp.consumer import AmqpConsumer
+
+MESSAGES = 2_000
+PRODUCTS = 200
+PROCESSING_SECONDS = 0.002
+
+
+class BenchDTO(pydantic.BaseModel):
+    product: str
+
+
+class BenchMessage:
+    def __init__(self, body: bytes):
+        self.body = body
+        self.headers = None
+        self.content_type = None
+        self.message_id = None
+
+    @asynccontextmanager
+    async def process(self, requeue=False):
+        yield
+
+
+class SlowProcessor:
+    async def execute(self, dto):
+        await asyncio.sleep(PROCESSING_SECONDS)
+
+
+def fake_connection():
+    queue = MagicMock()
+    queue.consume = AsyncMock(return_value="consumer-tag")
+    queue.cancel = AsyncMock()
+    channel = MagicMock()
+    channel.set_qos = AsyncMock()
+    channel.declare_queue = AsyncMock(return_value=queue)
+    channel.close = AsyncMock()
+    connection = MagicMock()
+    connection.channel = AsyncMock(return_value=channel)
+    return connection, queue
+
+
+async def measure(partitions):
+    connection, queue = fake_connection()
+    consumer = AmqpConsumer(connection, partitions=partitions)
+    consumer.subscribe_from_topic(
+        "inventory",
+        SlowProcessor(),
+        CodecRegistry(JsonCodec(BenchDTO)),
+        partition_keys=lambda dto: [dto.product],
+    )
+    await consumer.run()
+    callback = queue.consume.call_args.args[0]
+    messages = [
+        BenchMessage(BenchDTO(product=f"SKU{index % PRODUCTS}").model_dump_json())
+        for index in range(MESSAGES)
+    ]
+
+    started = time.perf_counter()
+    for message in messages:
+        await callback(message)
+    await consumer.stop(timeout=60)
+    elapsed = time.perf_counter() - started
+    print(f"partitions {partitions:3d}  {MESSAGES / elapsed:8.1f} msg/s")
+
+
+async def main():
+    print(f"{MESSAGES} messages, {PROCESSING_SECONDS * 1000:.0f} ms each")
+    for partitions in (1, 2, 4, 8, 16):
+        await measure(partitions)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
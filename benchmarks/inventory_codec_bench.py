@@ -0,0 +1,65 @@
+import datetime
+import time
+
+import orjson
+
+from src.domain.use_cases.product_inventory_processor import (
+    InputInventoryProcessorDTO,
+    InventoryAction,
+)
+from src.infra.amqp.codecs import InventoryBinaryCodec, JsonCodec
+
+MESSAGES = 100_000
+
+
+def make_messages():
+    expiration_date = datetime.datetime(2024, 12, 31, tzinfo=datetime.UTC)
+    return [
+        InputInventoryProcessorDTO(
+            code=f"SKU{index:06d}",
+            supplier="Fornecedor A",
+            expiration_date=expiration_date,
+            action=InventoryAction.ADD,
+            quantity=index % 50 + 1,
+        )
+        for index in range(MESSAGES)
+    ]
+
+
+def legacy_encode(dto):
+    return dto.model_dump_json().encode()
+
+
+def legacy_decode(body):
+    return InputInventoryProcessorDTO(**orjson.loads(body.decode()))
+
+
+def measure(name, encode, decode, messages):
+    started = time.perf_counter()
+    bodies = [encode(dto) for dto in messages]
+    encoded = time.perf_counter()
+    for body in bodies:
+        decode(body)
+    decoded = time.perf_counter()
+
+    size = sum(len(body) for body in bodies) / len(bodies)
+    print(
+        f"{name:<8} encode {(encoded - started) / len(bodies) * 1e6:6.2f} us/msg"
+        f"  decode {(decoded - encoded) / len(bodies) * 1e6:6.2f} us/msg"
+        f"  size {size:5.1f} B/msg"
+    )
+
+
+def main():
+    messages = make_messages()
+    json_codec = JsonCodec(InputInventoryProcessorDTO)
+    binary_codec = InventoryBinaryCodec()
+
+    print(f"{MESSAGES} messages")
+    measure("legacy", legacy_encode, legacy_decode, messages)
+    measure("json", json_codec.encode, json_codec.decode, messages)
+    measure("binary", binary_codec.encode, binary_codec.decode, messages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import asyncio
+import datetime
+import time
+
+from decouple import config
+
+from src.domain.entities.inventory import InventoryChange
+from src.domain.entities.product import Product, ProductKey
+from src.infra.sqlalchemy import models
+from src.infra.sqlalchemy.connection import SingletonSqlAlchemyConnection
+from src.infra.sqlalchemy.repositories.product_repository import (
+    SQLAlchemyProductRepository,
+)
+
+WRITERS = config("BENCH_WRITERS", default=32, cast=int)
+CHANGES_PER_WRITER = config("BENCH_CHANGES_PER_WRITER", default=200, cast=int)
+SHARDS = config("BENCH_SHARDS", default=16, cast=int)
+EXPIRATION_DATE = datetime.datetime(2099, 12, 31, tzinfo=datetime.UTC)
+
+
+async def reset_product(repository, code):
+    await repository.remove(code, "bench", EXPIRATION_DATE)
+    await repository.create(
+        Product(
+            title="Bench product",
+            description="Hot SKU used by the contention benchmark",
+            code=code,
+            supplier="bench",
+            inventory_quantity=WRITERS * CHANGES_PER_WRITER,
+            buy_price=1.0,
+            sell_price=2.0,
+            weight_in_kilograms=1.0,
+            expiration_date=EXPIRATION_DATE,
+            created_at=datetime.datetime.now(datetime.UTC),
+            updated_at=datetime.datetime.now(datetime.UTC),
+        )
+    )
+    return ProductKey(code, "bench", EXPIRATION_DATE)
+
+
+async def writer(repository, key, index):
+    for step in range(CHANGES_PER_WRITER):
+        quantity = 1 if (index + step) % 2 else -1
+        await repository.apply_inventory_changes([InventoryChange(key, quantity)])
+
+
+async def measure(name, repository, shards):
+    key = await reset_product(repository, f"BENCH-{name}")
+    await repository.set_inventory_shards(
+        key.code, key.supplier, key.expiration_date, shards
+    )
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(repository, key, index) for index in range(WRITERS)))
+    elapsed = time.perf_counter() - started
+    await repository.compact_inventory_shards()
+
+    product = await repository.get_by_code_supplier_expiration(
+        key.code, key.supplier, key.expiration_date
+    )
+    changes = WRITERS * CHANGES_PER_WRITER
+    print(
+        f"{name:<8} shards {shards:3d}  {changes / elapsed:8.1f} changes/s"
+        f"  final inventory {product.inventory_quantity}"
+    )
+    await repository.remove(key.code, key.supplier, key.expiration_date)
+
+
+async def main():
+    instance = SingletonSqlAlchemyConnection.get_instance()
+    instance.engine.echo = False
+    await models.create_all(instance.engine)
+    repository = SQLAlchemyProductRepository(instance)
+
+    print(f"{WRITERS} writers x {CHANGES_PER_WRITER} changes on one product")
+    await measure("single", repository, 0)
+    await measure("sharded", repository, SHARDS)
+    await instance.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+import datetime
+import gc
+import time
+from collections import namedtuple
+
+from src.domain.entities.product import Product
+from src.infra.sqlalchemy.repositories.product_repository import _product_from_row
+
+ROWS = 20_000
+REPEATS = 7
+
+Row = namedtuple(
+    "Row",
+    [
+        "id",
+        "title",
+        "description",
+        "code",
+        "supplier",
+        "inventory_quantity",
+        "sharded_inventory_quantity",
+        "buy_price",
+        "sell_price",
+        "weight_in_kilograms",
+        "expiration_date",
+        "created_at",
+        "updated_at",
+        "version",
+    ],
+)
+
+
+def make_rows():
+    now = datetime.datetime(2024, 6, 1, tzinfo=datetime.UTC)
+    return [
+        Row(
+            id=f"SKU{index:06d}",
+            title=f"Product {index}",
+            description="Description of a product read from the database",
+            code=f"SKU{index:06d}",
+            supplier="Fornecedor A",
+            inventory_quantity=index % 50,
+            sharded_inventory_quantity=0,
+            buy_price=10.0,
+            sell_price=15.0,
+            weight_in_kilograms=1.5,
+            expiration_date=now + datetime.timedelta(days=30),
+            created_at=now,
+            updated_at=now,
+            version=1,
+        )
+        for index in range(ROWS)
+    ]
+
+
+def fields_of(row):
+    return dict(
+        title=row.title,
+        description=row.description,
+        code=row.code,
+        supplier=row.supplier,
+        inventory_quantity=row.inventory_quantity + row.sharded_inventory_quantity,
+        buy_price=row.buy_price,
+        sell_price=row.sell_price,
+        weight_in_kilograms=row.weight_in_kilograms,
+        expiration_date=row.expiration_date,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        version=row.version,
+    )
+
+
+def validated(row):
+    return Product(**fields_of(row))
+
+
+def constructed(row):
+    return Product.model_construct(**fields_of(row))
+
+
+def best_of(run):
+    timings = []
+    for _ in range(REPEATS):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+    return min(timings)
+
+
+def measure(name, build, rows):
+    elapsed = best_of(lambda: [build(row) for row in rows])
+    print(f"{name:<10} {elapsed / len(rows) * 1e6:6.2f} us/row")
+
+
+def main():
+    rows = make_rows()
+
+    print(f"{ROWS} rows")
+    measure("validated", validated, rows)
+    measure("construct", constructed, rows)
+    measure("trusted", _product_from_row, rows)
+
+
+if __name__ == "__main__":
+    main()
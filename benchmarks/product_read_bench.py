@@ -0,0 +1,91 @@
+import asyncio
+import datetime
+import time
+
+from decouple import config
+from sqlalchemy import select
+
+from src.domain.entities.product import Product
+from src.infra.sqlalchemy import models
+from src.infra.sqlalchemy.connection import SingletonSqlAlchemyConnection
+from src.infra.sqlalchemy.models import ProductModel, make_product_id_from_base
+from src.infra.sqlalchemy.repositories.product_repository import (
+    SQLAlchemyProductRepository,
+)
+
+PRODUCTS = config("BENCH_PRODUCTS", default=100, cast=int)
+QUERIES = config("BENCH_QUERIES", default=5000, cast=int)
+EXPIRATION_DATE = datetime.datetime(2099, 12, 31, tzinfo=datetime.UTC)
+
+
+async def orm_get(instance, code, supplier, expiration_date):
+    async with instance.async_session() as session:
+        product_id = make_product_id_from_base(code, supplier, expiration_date)
+        statement = select(ProductModel).where(ProductModel.id == product_id)
+        product_model = (await session.execute(statement)).scalar_one_or_none()
+        return None if not product_model else product_model.to_entity()
+
+
+async def orm_exists(instance, code, supplier, expiration_date):
+    return await orm_get(instance, code, supplier, expiration_date) is not None
+
+
+async def seed(repository):
+    codes = [f"READ-BENCH-{index:04d}" for index in range(PRODUCTS)]
+    for code in codes:
+        await repository.remove(code, "bench", EXPIRATION_DATE)
+        await repository.create(
+            Product(
+                title="Bench product",
+                description="Product used by the read benchmark",
+                code=code,
+                supplier="bench",
+                inventory_quantity=100,
+                buy_price=1.0,
+                sell_price=2.0,
+                weight_in_kilograms=1.0,
+                expiration_date=EXPIRATION_DATE,
+                created_at=datetime.datetime.now(datetime.UTC),
+                updated_at=datetime.datetime.now(datetime.UTC),
+            )
+        )
+    return codes
+
+
+async def measure(name, read, codes):
+    for code in codes:
+        await read(code, "bench", EXPIRATION_DATE)
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    for index in range(QUERIES):
+        await read(codes[index % len(codes)], "bench", EXPIRATION_DATE)
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    print(
+        f"{name:<11} {cpu / QUERIES * 1e6:7.1f} us cpu/query"
+        f"  {elapsed / QUERIES * 1e6:7.1f} us/query"
+    )
+
+
+async def main():
+    instance = SingletonSqlAlchemyConnection.get_instance()
+    instance.engine.echo = False
+    await models.create_all(instance.engine)
+    repository = SQLAlchemyProductRepository(instance)
+    codes = await seed(repository)
+
+    print(f"{QUERIES} sequential queries over {PRODUCTS} products")
+    await measure("orm get", lambda *key: orm_get(instance, *key), codes)
+    await measure("core get", repository.get_by_code_supplier_expiration, codes)
+    await measure("orm exists", lambda *key: orm_exists(instance, *key), codes)
+    await measure("core exists", repository.exists_from, codes)
+
+    for code in codes:
+        await repository.remove(code, "bench", EXPIRATION_DATE)
+    await instance.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
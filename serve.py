@@ -0,0 +1,5 @@
+from src.infra.http.runner import main
+
+
+if __name__ == "__main__":
+    main()
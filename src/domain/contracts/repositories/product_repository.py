@@ -1,8 +1,14 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from src.domain.entities.product import Product
+from src.domain.entities.inventory import InventoryChange
+from src.domain.entities.product import (
+    Product,
+    ProductKey,
+    ProductVersion,
+    SupplierValuation,
+)
 
 
 class IProductRepository(ABC):
@@ -17,25 +23,97 @@ class IProductRepository(ABC):
     @abstractmethod
     async def exists(self, product: Product) -> bool: ...
 
+    @abstractmethod
+    async def missing_from(self, keys: List[ProductKey]) -> List[ProductKey]: ...
+
     @abstractmethod
     async def update(self, product: Product) -> Product | None: ...
 
+    @abstractmethod
+    async def patch(
+        self,
+        code: str,
+        supplier: str,
+        expiration_date: datetime,
+        changes: Dict[str, Any],
+        version: Optional[int] = None,
+    ) -> Product | None: ...
+
     @abstractmethod
     async def remove(
         self, code: str, supplier: str, expiration_date: datetime
     ) -> str | None: ...
 
+    @abstractmethod
+    async def remove_many(
+        self, keys: List[ProductKey], chunk_size: int = 500
+    ) -> List[str]: ...
+
+    @abstractmethod
+    async def remove_matching(
+        self,
+        supplier: Optional[str] = None,
+        expired_before: Optional[datetime] = None,
+        chunk_size: int = 500,
+    ) -> List[str]: ...
+
     @abstractmethod
     async def add_inventory_to(
         self, code: str, supplier: str, expiration_date: datetime
-    ) -> Product: ...
+    ) -> Product | None: ...
 
     @abstractmethod
     async def remove_inventory_from(
         self, code: str, supplier: str, expiration_date: datetime
-    ) -> Product: ...
+    ) -> Product | None: ...
+
+    @abstractmethod
+    async def apply_inventory_changes(
+        self, changes: List[InventoryChange], event_id: Optional[str] = None
+    ) -> List[ProductKey]: ...
+
+    @abstractmethod
+    async def prune_inventory_events(
+        self, processed_before: datetime, chunk_size: int = 5000
+    ) -> int: ...
+
+    @abstractmethod
+    async def archive_expired(
+        self, expired_before: datetime, chunk_size: int = 500
+    ) -> Tuple[int, int]: ...
+
+    @abstractmethod
+    async def set_inventory_shards(
+        self, code: str, supplier: str, expiration_date: datetime, shards: int
+    ) -> bool: ...
+
+    @abstractmethod
+    async def compact_inventory_shards(self) -> int: ...
 
     @abstractmethod
     async def get_by_code_supplier_expiration(
         self, code: str, supplier: str, expiration_date: datetime
     ) -> Optional[Product]: ...
+
+    @abstractmethod
+    async def get_many(self, keys: List[ProductKey]) -> List[Optional[Product]]: ...
+
+    @abstractmethod
+    async def list_modified_since(
+        self, since: Optional[datetime] = None
+    ) -> List[Product]: ...
+
+    @abstractmethod
+    async def supplier_valuations(
+        self, suppliers: Optional[List[str]] = None
+    ) -> List[SupplierValuation]: ...
+
+    @abstractmethod
+    async def suppliers_modified_since(
+        self, since: Optional[datetime] = None
+    ) -> Dict[str, Tuple[datetime, int]]: ...
+
+    @abstractmethod
+    async def get_version_by_code_supplier_expiration(
+        self, code: str, supplier: str, expiration_date: datetime
+    ) -> Optional[ProductVersion]: ...
@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+
+from src.domain.entities.product import ProductSearchPage
+
+
+class IProductSearchRepository(ABC):
+    @abstractmethod
+    async def search(
+        self, query: str, offset: int, limit: int
+    ) -> ProductSearchPage: ...
@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+from src.domain.entities.product import ProductKey
+
+
+@dataclass(frozen=True, slots=True)
+class InventoryChange:
+    product: ProductKey
+    quantity: int
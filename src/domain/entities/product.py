@@ -1,8 +1,25 @@
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Self
+from typing import List, Optional, Self
 
 import pydantic
 
+from src.domain.entities.trusted import build_trusted
+
+
+@dataclass(frozen=True, slots=True)
+class ProductKey:
+    code: str
+    supplier: str
+    expiration_date: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class ProductVersion:
+    product_id: str
+    modified_at: datetime
+    inventory_quantity: int
+
 
 class Product(pydantic.BaseModel):
     title: str
@@ -16,6 +33,7 @@ class Product(pydantic.BaseModel):
     expiration_date: datetime
     created_at: datetime = None
     updated_at: datetime = None
+    version: Optional[int] = None
 
     @staticmethod
     def from_input_dto(dto) -> Self:
@@ -32,3 +50,25 @@ class Product(pydantic.BaseModel):
             created_at=datetime.now(),
             updated_at=datetime.now(),
         )
+
+    @classmethod
+    def from_trusted(cls, **fields) -> Self:
+        # Rows from our own database are already valid.
+        return build_trusted(cls, **fields)
+
+
+@dataclass(frozen=True, slots=True)
+class SupplierValuation:
+    supplier: str
+    products: int
+    inventory_quantity: int
+    stock_value: float
+    potential_revenue: float
+    margin: float
+    weight_in_kilograms: float
+
+
+@dataclass(frozen=True, slots=True)
+class ProductSearchPage:
+    products: List[Product]
+    total: int
@@ -0,0 +1,23 @@
+class ProductNotFoundError(Exception):
+    retryable = False
+
+
+class InsufficientInventoryError(Exception):
+    retryable = True
+
+
+class InventoryEventsFailedError(Exception):
+    def __init__(self, failures):
+        super().__init__(failures)
+        self.failures = failures
+        self.retryable = any(
+            getattr(error, "retryable", True) for error in failures.values()
+        )
+
+
+class PublishBufferFullError(Exception):
+    retryable = True
+
+
+class ConcurrentUpdateError(Exception):
+    retryable = True
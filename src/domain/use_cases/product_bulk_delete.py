@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Self
+
+import pydantic
+
+from src.domain.contracts.repositories.product_repository import IProductRepository
+from src.domain.entities.product import ProductKey
+from src.domain.use_cases.product_delete import InputProductDeleteDTO
+
+
+class InputProductBulkDeleteDTO(pydantic.BaseModel):
+    keys: Optional[List[InputProductDeleteDTO]] = pydantic.Field(
+        None, min_length=1, max_length=1000
+    )
+    supplier: Optional[str] = None
+    expired_before: Optional[datetime] = None
+
+    @pydantic.model_validator(mode="after")
+    def check_selection(self) -> Self:
+        uses_filter = self.supplier is not None or self.expired_before is not None
+        if (self.keys is None) == (not uses_filter):
+            raise ValueError("send either keys or a supplier/expired_before filter")
+        return self
+
+
+class OutputProductBulkDeleteDTO(pydantic.BaseModel):
+    success: bool
+    deleted: int
+    msg: Optional[str] = None
+
+
+@dataclass
+class ProductBulkDeleteUseCase:
+    repository: IProductRepository
+    chunk_size: int = 500
+
+    async def execute(
+        self, input_dto: InputProductBulkDeleteDTO
+    ) -> OutputProductBulkDeleteDTO:
+        if input_dto.keys is not None:
+            removed_ids = await self.repository.remove_many(
+                [
+                    ProductKey(key.code, key.supplier, key.expiration_date)
+                    for key in input_dto.keys
+                ],
+                chunk_size=self.chunk_size,
+            )
+        else:
+            removed_ids = await self.repository.remove_matching(
+                supplier=input_dto.supplier,
+                expired_before=input_dto.expired_before,
+                chunk_size=self.chunk_size,
+            )
+
+        return OutputProductBulkDeleteDTO(success=True, deleted=len(removed_ids))
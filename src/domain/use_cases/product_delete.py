@@ -32,23 +32,12 @@ class ProductDeleteUseCase:
     repository: IProductRepository
 
     async def execute(self, input_dto: InputProductDeleteDTO) -> OutputProductDeleteDTO:
-        product_exists = await self.repository.exists_from(
-            code=input_dto.code,
-            supplier=input_dto.supplier,
-            expiration_date=input_dto.expiration_date,
-        )
-        if not product_exists:
-            return OutputProductDeleteDTO.do_error("Product not exists")
-
         product_id = await self.repository.remove(
             code=input_dto.code,
             supplier=input_dto.supplier,
             expiration_date=input_dto.expiration_date,
         )
-
         if not product_id:
-            return OutputProductDeleteDTO.do_error(
-                "product not deleted",
-            )
+            return OutputProductDeleteDTO.do_error("Product not exists")
 
         return OutputProductDeleteDTO.do_success(product_id)
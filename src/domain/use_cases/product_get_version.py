@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import pydantic
+
+from src.domain.contracts.repositories.product_repository import IProductRepository
+from src.domain.entities.product import ProductVersion
+from src.domain.use_cases.product_get import InputProductGetDTO
+
+
+class OutputProductGetVersionDTO(pydantic.BaseModel):
+    success: bool
+    version: Optional[ProductVersion] = None
+    msg: Optional[str] = None
+
+
+@dataclass
+class ProductGetVersionUseCase:
+    repository: IProductRepository
+
+    async def execute(
+        self, input_dto: InputProductGetDTO
+    ) -> OutputProductGetVersionDTO:
+        version = await self.repository.get_version_by_code_supplier_expiration(
+            code=input_dto.code,
+            supplier=input_dto.supplier,
+            expiration_date=input_dto.expiration_date,
+        )
+        if not version:
+            return OutputProductGetVersionDTO(
+                success=False, msg="product does not exists"
+            )
+
+        return OutputProductGetVersionDTO(success=True, version=version)
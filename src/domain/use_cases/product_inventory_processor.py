@@ -1,10 +1,28 @@
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from typing import List, Optional, Self
 
 import pydantic
 
 from src.domain.contracts.repositories.product_repository import IProductRepository
+from src.domain.entities.inventory import InventoryChange
+from src.domain.entities.product import ProductKey
+from src.domain.exceptions import (
+    InsufficientInventoryError,
+    InventoryEventsFailedError,
+    ProductNotFoundError,
+)
+
+MAX_INVENTORY_QUANTITY = 2**31 - 1
+MAX_EVENT_ID_LENGTH = 64
+MAX_INVENTORY_EVENTS = 1000
+# The binary codec packs the line count and the code and supplier sizes in
+# 16 bits; the string limits are the product table's column sizes.
+MAX_INVENTORY_LINES = 1000
+MAX_CODE_LENGTH = 50
+MAX_SUPPLIER_LENGTH = 100
 
 
 class InventoryAction(Enum):
@@ -12,25 +30,128 @@ class InventoryAction(Enum):
     REMOVE = "r"
 
 
-class InputInventoryProcessorDTO(pydantic.BaseModel):
-    code: str
-    supplier: str
+class InventoryLine(pydantic.BaseModel):
+    code: str = pydantic.Field(max_length=MAX_CODE_LENGTH)
+    supplier: str = pydantic.Field(max_length=MAX_SUPPLIER_LENGTH)
     expiration_date: datetime
-    action: InventoryAction
+    quantity: int = pydantic.Field(
+        ge=-MAX_INVENTORY_QUANTITY, le=MAX_INVENTORY_QUANTITY
+    )
+
+    def to_key(self) -> ProductKey:
+        return ProductKey(self.code, self.supplier, self.expiration_date)
+
+    def to_change(self) -> InventoryChange:
+        return InventoryChange(product=self.to_key(), quantity=self.quantity)
+
+
+class InputInventoryProcessorDTO(pydantic.BaseModel):
+    code: Optional[str] = pydantic.Field(None, max_length=MAX_CODE_LENGTH)
+    supplier: Optional[str] = pydantic.Field(None, max_length=MAX_SUPPLIER_LENGTH)
+    expiration_date: Optional[datetime] = None
+    action: Optional[InventoryAction] = None
+    quantity: int = pydantic.Field(1, le=MAX_INVENTORY_QUANTITY)
+    lines: List[InventoryLine] = pydantic.Field([], max_length=MAX_INVENTORY_LINES)
+    events: List["InputInventoryProcessorDTO"] = pydantic.Field(
+        [], max_length=MAX_INVENTORY_EVENTS
+    )
+    event_id: Optional[str] = pydantic.Field(
+        default=None, max_length=MAX_EVENT_ID_LENGTH
+    )
+
+    @pydantic.model_validator(mode="after")
+    def check_product_or_lines(self) -> Self:
+        single_product = [
+            field is not None
+            for field in (self.code, self.supplier, self.expiration_date)
+        ]
+        if any(single_product) and not all(single_product):
+            raise ValueError("code, supplier and expiration_date must be sent together")
+        if self.events:
+            if any(single_product) or self.lines:
+                raise ValueError("events can not be sent with a product or lines")
+            if any(event.events for event in self.events):
+                raise ValueError("events can not be nested")
+            return self
+        if not any(single_product) and not self.lines:
+            raise ValueError("code, supplier and expiration_date or lines required")
+        if self.code is not None and self.action is None:
+            raise ValueError("action is required when code is informed")
+        if self.action is not None and self.quantity < 1:
+            raise ValueError("quantity must be positive when action is informed")
+        return self
+
+    def to_lines(self) -> List[InventoryLine]:
+        lines = [line for event in self.events for line in event.to_lines()]
+        lines.extend(self.lines)
+        if self.code is not None:
+            sign = -1 if self.action is InventoryAction.REMOVE else 1
+            lines.append(
+                InventoryLine(
+                    code=self.code,
+                    supplier=self.supplier,
+                    expiration_date=self.expiration_date,
+                    quantity=sign * self.quantity,
+                )
+            )
+        return lines
+
+
+class RecentEventIds:
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self._ids = OrderedDict()
+
+    def __contains__(self, event_id: str) -> bool:
+        if event_id not in self._ids:
+            return False
+        self._ids.move_to_end(event_id)
+        return True
+
+    def add(self, event_id: str):
+        self._ids[event_id] = None
+        self._ids.move_to_end(event_id)
+        if len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
 
 
 @dataclass
 class InventoryProcessorUseCase:
     repository: IProductRepository
+    recent_event_ids: RecentEventIds = field(default_factory=RecentEventIds)
 
     async def execute(self, input_dto: InputInventoryProcessorDTO):
-        match input_dto.action:
-            case InventoryAction.ADD:
-                await self.repository.add_inventory_to(
-                    input_dto.code, input_dto.supplier, input_dto.expiration_date
-                )
+        if input_dto.events:
+            await self._execute_each(input_dto.events)
+            return
 
-            case InventoryAction.REMOVE:
-                await self.repository.remove_inventory_from(
-                    input_dto.code, input_dto.supplier, input_dto.expiration_date
-                )
+        event_id = input_dto.event_id
+        if event_id is not None and event_id in self.recent_event_ids:
+            return
+
+        changes = [line.to_change() for line in input_dto.to_lines()]
+        rejected = await self.repository.apply_inventory_changes(
+            changes, event_id=event_id
+        )
+        if not rejected:
+            if event_id is not None:
+                self.recent_event_ids.add(event_id)
+            return
+
+        missing = await self.repository.missing_from(rejected)
+        if missing:
+            raise ProductNotFoundError(missing)
+
+        raise InsufficientInventoryError(rejected)
+
+    async def _execute_each(self, events: List[InputInventoryProcessorDTO]):
+        # Events sharing a message are applied on their own, so one failure
+        # does not hold back the others; a redelivery skips the applied ones.
+        failures = {}
+        for event in events:
+            try:
+                await self.execute(event)
+            except (InsufficientInventoryError, ProductNotFoundError) as error:
+                failures[event.event_id] = error
+        if failures:
+            raise InventoryEventsFailedError(failures)
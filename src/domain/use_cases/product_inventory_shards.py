@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import pydantic
+
+from src.domain.contracts.repositories.product_repository import IProductRepository
+
+MAX_INVENTORY_SHARDS = 64
+
+
+class InputProductInventoryShardsDTO(pydantic.BaseModel):
+    code: str
+    supplier: str
+    expiration_date: datetime
+    shards: int = pydantic.Field(ge=0, le=MAX_INVENTORY_SHARDS)
+
+
+class OutputProductInventoryShardsDTO(pydantic.BaseModel):
+    success: bool
+    msg: Optional[str] = None
+
+
+@dataclass
+class ProductInventoryShardsUseCase:
+    repository: IProductRepository
+
+    async def execute(
+        self, input_dto: InputProductInventoryShardsDTO
+    ) -> OutputProductInventoryShardsDTO:
+        updated = await self.repository.set_inventory_shards(
+            code=input_dto.code,
+            supplier=input_dto.supplier,
+            expiration_date=input_dto.expiration_date,
+            shards=input_dto.shards,
+        )
+        if not updated:
+            return OutputProductInventoryShardsDTO(
+                success=False, msg="product does not exists"
+            )
+
+        return OutputProductInventoryShardsDTO(success=True)
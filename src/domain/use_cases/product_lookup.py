@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+import pydantic
+
+from src.domain.contracts.repositories.product_repository import IProductRepository
+from src.domain.entities.product import Product, ProductKey
+from src.domain.use_cases.product_get import InputProductGetDTO
+
+MAX_LOOKUP_KEYS = 200
+
+
+class InputProductLookupDTO(pydantic.BaseModel):
+    keys: List[InputProductGetDTO] = pydantic.Field(
+        min_length=1, max_length=MAX_LOOKUP_KEYS
+    )
+
+
+class ProductLookupResult(pydantic.BaseModel):
+    code: str
+    supplier: str
+    expiration_date: datetime
+    found: bool
+    product: Optional[Product] = None
+
+
+class OutputProductLookupDTO(pydantic.BaseModel):
+    success: bool
+    results: List[ProductLookupResult] = []
+    msg: Optional[str] = None
+
+
+@dataclass
+class ProductLookupUseCase:
+    repository: IProductRepository
+
+    async def execute(self, input_dto: InputProductLookupDTO) -> OutputProductLookupDTO:
+        products = await self.repository.get_many(
+            [
+                ProductKey(key.code, key.supplier, key.expiration_date)
+                for key in input_dto.keys
+            ]
+        )
+
+        return OutputProductLookupDTO(
+            success=True,
+            results=[
+                ProductLookupResult(
+                    code=key.code,
+                    supplier=key.supplier,
+                    expiration_date=key.expiration_date,
+                    found=product is not None,
+                    product=product,
+                )
+                for key, product in zip(input_dto.keys, products)
+            ],
+        )
@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+import pydantic
+
+from src.domain.contracts.repositories.product_search_repository import (
+    IProductSearchRepository,
+)
+from src.domain.entities.product import Product
+
+MAX_SEARCH_PAGE_SIZE = 100
+
+
+class InputProductSearchDTO(pydantic.BaseModel):
+    query: str = pydantic.Field(min_length=1, max_length=200)
+    page: int = pydantic.Field(1, ge=1)
+    page_size: int = pydantic.Field(20, ge=1, le=MAX_SEARCH_PAGE_SIZE)
+
+
+class OutputProductSearchDTO(pydantic.BaseModel):
+    success: bool
+    products: List[Product] = []
+    total: int = 0
+    page: int
+    page_size: int
+    msg: Optional[str] = None
+
+
+@dataclass
+class ProductSearchUseCase:
+    search_repository: IProductSearchRepository
+
+    async def execute(self, input_dto: InputProductSearchDTO) -> OutputProductSearchDTO:
+        result = await self.search_repository.search(
+            query=input_dto.query,
+            offset=(input_dto.page - 1) * input_dto.page_size,
+            limit=input_dto.page_size,
+        )
+        return OutputProductSearchDTO(
+            success=True,
+            products=result.products,
+            total=result.total,
+            page=input_dto.page,
+            page_size=input_dto.page_size,
+        )
@@ -1,6 +1,5 @@
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
+from typing import Optional, Self
 
 import pydantic
 
@@ -8,15 +7,15 @@ from src.domain.contracts.repositories.inventory_repository import IInventoryRep
 from src.domain.contracts.repositories.product_repository import IProductRepository
 from src.domain.use_cases.product_inventory_processor import (
     InputInventoryProcessorDTO,
-    InventoryAction,
 )
 
 
-class InputProductSendInventoryDTO(pydantic.BaseModel):
-    code: str
-    supplier: str
-    expiration_date: datetime
-    action: InventoryAction
+class InputProductSendInventoryDTO(InputInventoryProcessorDTO):
+    @pydantic.model_validator(mode="after")
+    def check_no_events(self) -> Self:
+        if self.events:
+            raise ValueError("events are only sent between services")
+        return self
 
 
 class OutputProductSendInventoryDTO(pydantic.BaseModel):
@@ -32,12 +31,10 @@ class ProductSendInventoryUseCase:
     async def execute(
         self, input_dto: InputProductSendInventoryDTO
     ) -> OutputProductSendInventoryDTO:
-        product_exists = await self.product_repository.exists_from(
-            code=input_dto.code,
-            supplier=input_dto.supplier,
-            expiration_date=input_dto.expiration_date,
+        missing = await self.product_repository.missing_from(
+            [line.to_key() for line in input_dto.to_lines()]
         )
-        if not product_exists:
+        if missing:
             return OutputProductSendInventoryDTO(
                 success=False, message="product not exists"
             )
@@ -47,6 +44,9 @@ class ProductSendInventoryUseCase:
             supplier=input_dto.supplier,
             expiration_date=input_dto.expiration_date,
             action=input_dto.action,
+            quantity=input_dto.quantity,
+            lines=input_dto.lines,
+            event_id=input_dto.event_id,
         )
         await self.repository.send(input_inventory_processor_dto)
         return OutputProductSendInventoryDTO(success=True, message="sent event")
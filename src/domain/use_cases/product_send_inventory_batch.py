@@ -0,0 +1,83 @@
+import uuid
+from dataclasses import dataclass
+from typing import List, Self
+
+import pydantic
+
+from src.domain.contracts.repositories.inventory_repository import IInventoryRepository
+from src.domain.contracts.repositories.product_repository import IProductRepository
+from src.domain.use_cases.product_inventory_processor import (
+    InputInventoryProcessorDTO,
+)
+from src.domain.use_cases.product_send_inventory import (
+    InputProductSendInventoryDTO,
+    OutputProductSendInventoryDTO,
+)
+
+
+class InputProductSendInventoryBatchDTO(pydantic.BaseModel):
+    items: List[InputProductSendInventoryDTO] = pydantic.Field(
+        min_length=1, max_length=1000
+    )
+
+    @pydantic.model_validator(mode="after")
+    def check_unique_event_ids(self) -> Self:
+        event_ids = [item.event_id for item in self.items if item.event_id is not None]
+        if len(event_ids) != len(set(event_ids)):
+            raise ValueError("event_id must be unique within a batch")
+        return self
+
+
+class OutputProductSendInventoryBatchDTO(pydantic.BaseModel):
+    success: bool
+    results: List[OutputProductSendInventoryDTO]
+
+
+@dataclass
+class ProductSendInventoryBatchUseCase:
+    repository: IInventoryRepository
+    product_repository: IProductRepository
+    events_per_message: int = 100
+
+    async def execute(
+        self, input_dto: InputProductSendInventoryBatchDTO
+    ) -> OutputProductSendInventoryBatchDTO:
+        lines_per_item = [item.to_lines() for item in input_dto.items]
+        missing = set(
+            await self.product_repository.missing_from(
+                [line.to_key() for lines in lines_per_item for line in lines]
+            )
+        )
+
+        results = []
+        events = []
+        for item, lines in zip(input_dto.items, lines_per_item):
+            if any(line.to_key() in missing for line in lines):
+                results.append(
+                    OutputProductSendInventoryDTO(
+                        success=False, message="product not exists"
+                    )
+                )
+                continue
+
+            # Every item keeps its own id so a redelivered message only applies
+            # the items that were not applied yet.
+            events.append(
+                InputInventoryProcessorDTO(
+                    lines=lines, event_id=item.event_id or uuid.uuid4().hex
+                )
+            )
+            results.append(
+                OutputProductSendInventoryDTO(success=True, message="sent event")
+            )
+
+        for start in range(0, len(events), self.events_per_message):
+            await self.repository.send(
+                InputInventoryProcessorDTO(
+                    events=events[start : start + self.events_per_message]
+                )
+            )
+
+        return OutputProductSendInventoryBatchDTO(
+            success=any(result.success for result in results), results=results
+        )
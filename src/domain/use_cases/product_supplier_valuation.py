@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+import pydantic
+
+from src.domain.contracts.repositories.product_repository import IProductRepository
+from src.domain.entities.product import SupplierValuation
+
+
+class InputProductSupplierValuationDTO(pydantic.BaseModel):
+    supplier: Optional[str] = None
+
+
+class OutputProductSupplierValuationDTO(pydantic.BaseModel):
+    success: bool
+    valuations: List[SupplierValuation] = []
+    msg: Optional[str] = None
+
+
+@dataclass
+class ProductSupplierValuationUseCase:
+    repository: IProductRepository
+
+    async def execute(
+        self, input_dto: InputProductSupplierValuationDTO
+    ) -> OutputProductSupplierValuationDTO:
+        if input_dto.supplier is None:
+            valuations = await self.repository.supplier_valuations()
+        else:
+            valuations = await self.repository.supplier_valuations([input_dto.supplier])
+            if not valuations:
+                return OutputProductSupplierValuationDTO(
+                    success=False, msg="supplier has no products"
+                )
+
+        return OutputProductSupplierValuationDTO(success=True, valuations=valuations)
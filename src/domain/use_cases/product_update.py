@@ -19,6 +19,7 @@ class InputProductUpdateDTO(pydantic.BaseModel):
     supplier: str
     expiration_date: datetime
     update: UpdatableInformation
+    version: Optional[int] = None
 
 
 class OutputProductUpdateDTO(pydantic.BaseModel):
@@ -27,51 +28,36 @@ class OutputProductUpdateDTO(pydantic.BaseModel):
     msg: Union[str, None]
 
 
-def get_or_default(a, b):
-    return a or b
-
-
 @dataclass
 class ProductUpdateUseCase:
     repository: IProductRepository
 
     async def execute(self, input_dto: InputProductUpdateDTO) -> OutputProductUpdateDTO:
-        product = await self.repository.get_by_code_supplier_expiration(
-            input_dto.code, input_dto.supplier, input_dto.expiration_date
-        )
-        if not product:
-            return OutputProductUpdateDTO(
-                success=False, msg="Product not found", product=None
+        changes = input_dto.update.model_dump(exclude_unset=True, exclude_none=True)
+        if not changes:
+            exists = await self.repository.exists_from(
+                input_dto.code, input_dto.supplier, input_dto.expiration_date
             )
-
-        any_information_to_update = any(input_dto.update.model_dump().values())
-        if (not input_dto.update) or (not any_information_to_update):
             return OutputProductUpdateDTO(
                 success=False,
-                msg="This request no contains information to update",
+                msg=(
+                    "This request no contains information to update"
+                    if exists
+                    else "Product not found"
+                ),
                 product=None,
             )
 
-        product.title = get_or_default(input_dto.update.title, product.title)
-        product.description = get_or_default(
-            input_dto.update.description, product.description
+        updated_product = await self.repository.patch(
+            input_dto.code,
+            input_dto.supplier,
+            input_dto.expiration_date,
+            changes,
+            version=input_dto.version,
         )
-        product.buy_price = get_or_default(
-            input_dto.update.buy_price, product.buy_price
-        )
-        product.sell_price = get_or_default(
-            input_dto.update.sell_price, product.sell_price
-        )
-        product.weight_in_kilograms = get_or_default(
-            input_dto.update.weight_in_kilograms, product.weight_in_kilograms
-        )
-
-        updated_product = await self.repository.update(product)
-        if updated_product:
+        if not updated_product:
             return OutputProductUpdateDTO(
-                success=True, product=updated_product, msg=None
+                success=False, msg="Product not found", product=None
             )
 
-        return OutputProductUpdateDTO(
-            success=False, product="update not found", msg=None
-        )
+        return OutputProductUpdateDTO(success=True, product=updated_product, msg=None)
@@ -0,0 +1,263 @@
+import struct
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Optional
+
+from src.domain.entities.trusted import build_trusted
+from src.domain.use_cases.product_inventory_processor import (
+    MAX_EVENT_ID_LENGTH,
+    InputInventoryProcessorDTO,
+    InventoryAction,
+    InventoryLine,
+)
+
+JSON_CONTENT_TYPE = "application/json"
+INVENTORY_BINARY_CONTENT_TYPE = "application/vnd.inventory.v1+binary"
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_MINUTE = timedelta(minutes=1)
+_NAIVE_OFFSET = -32768
+_HEADER = struct.Struct("<BBH")
+_LINE = struct.Struct("<qhiHH")
+_EVENT_ID_SIZE = struct.Struct("<B")
+_EVENT_SIZE = struct.Struct("<I")
+_BINARY_VERSION = 1
+_BINARY_VERSION_WITH_EVENT_ID = 2
+_BINARY_VERSION_WITH_EVENTS = 3
+_SINGLE_PRODUCT = 1
+
+
+class CodecError(ValueError):
+    retryable = False
+
+
+class JsonCodec:
+    content_type = JSON_CONTENT_TYPE
+
+    def __init__(self, model):
+        self.model = model
+
+    def encode(self, dto) -> bytes:
+        return self.model.__pydantic_serializer__.to_json(dto)
+
+    def decode(self, body: bytes):
+        return self.model.model_validate_json(body)
+
+
+class InventoryBinaryCodec:
+    content_type = INVENTORY_BINARY_CONTENT_TYPE
+
+    def encode(self, dto: InputInventoryProcessorDTO) -> bytes:
+        if dto.events:
+            return self._encode_events(dto)
+
+        lines = [
+            (line.code, line.supplier, line.expiration_date, line.quantity)
+            for line in dto.lines
+        ]
+        flags = 0
+        if dto.code is not None:
+            sign = -1 if dto.action is InventoryAction.REMOVE else 1
+            lines.append(
+                (dto.code, dto.supplier, dto.expiration_date, sign * dto.quantity)
+            )
+            flags = _SINGLE_PRODUCT if len(lines) == 1 else 0
+
+        try:
+            if dto.event_id is None:
+                chunks = [_HEADER.pack(_BINARY_VERSION, flags, len(lines))]
+            else:
+                event_id = dto.event_id.encode()
+                chunks = [
+                    _HEADER.pack(_BINARY_VERSION_WITH_EVENT_ID, flags, len(lines)),
+                    _EVENT_ID_SIZE.pack(len(event_id)),
+                    event_id,
+                ]
+            for code, supplier, expiration_date, quantity in lines:
+                code = code.encode()
+                supplier = supplier.encode()
+                wall_time, offset_minutes = _split_datetime(expiration_date)
+                chunks.append(
+                    _LINE.pack(
+                        wall_time, offset_minutes, quantity, len(code), len(supplier)
+                    )
+                )
+                chunks.append(code)
+                chunks.append(supplier)
+        except (struct.error, UnicodeEncodeError) as error:
+            raise CodecError(str(error)) from error
+        return b"".join(chunks)
+
+    def _encode_events(self, dto: InputInventoryProcessorDTO) -> bytes:
+        events = [self.encode(event) for event in dto.events]
+        event_id = (dto.event_id or "").encode()
+        try:
+            chunks = [
+                _HEADER.pack(_BINARY_VERSION_WITH_EVENTS, 0, len(events)),
+                _EVENT_ID_SIZE.pack(len(event_id)),
+                event_id,
+            ]
+            for event in events:
+                chunks.append(_EVENT_SIZE.pack(len(event)))
+                chunks.append(event)
+        except struct.error as error:
+            raise CodecError(str(error)) from error
+        return b"".join(chunks)
+
+    def decode(self, body: bytes) -> InputInventoryProcessorDTO:
+        view = memoryview(body)
+        try:
+            version, flags, count = _HEADER.unpack_from(view, 0)
+            if version == _BINARY_VERSION_WITH_EVENTS:
+                return self._decode_events(view, count)
+
+            offset = _HEADER.size
+            event_id = None
+            if version == _BINARY_VERSION_WITH_EVENT_ID:
+                (event_id_size,) = _EVENT_ID_SIZE.unpack_from(view, offset)
+                offset += _EVENT_ID_SIZE.size
+                event_id = str(view[offset : offset + event_id_size], "utf-8")
+                offset += event_id_size
+                if len(event_id) > MAX_EVENT_ID_LENGTH:
+                    raise CodecError("inventory event id is too long")
+            elif version != _BINARY_VERSION:
+                raise CodecError(f"unsupported inventory binary version {version}")
+
+            lines = []
+            for _ in range(count):
+                wall_time, offset_minutes, quantity, code_size, supplier_size = (
+                    _LINE.unpack_from(view, offset)
+                )
+                offset += _LINE.size
+                code = str(view[offset : offset + code_size], "utf-8")
+                offset += code_size
+                supplier = str(view[offset : offset + supplier_size], "utf-8")
+                offset += supplier_size
+                lines.append(
+                    (
+                        code,
+                        supplier,
+                        _join_datetime(wall_time, offset_minutes),
+                        quantity,
+                    )
+                )
+        except struct.error as error:
+            raise CodecError(str(error)) from error
+
+        if offset != len(body):
+            raise CodecError("trailing bytes in inventory message")
+        if not lines:
+            raise CodecError("inventory message without lines")
+
+        if flags & _SINGLE_PRODUCT and count == 1:
+            code, supplier, expiration_date, quantity = lines[0]
+            return build_trusted(
+                InputInventoryProcessorDTO,
+                code=code,
+                supplier=supplier,
+                expiration_date=expiration_date,
+                action=None,
+                quantity=quantity,
+                lines=[],
+                events=[],
+                event_id=event_id,
+            )
+
+        return build_trusted(
+            InputInventoryProcessorDTO,
+            code=None,
+            supplier=None,
+            expiration_date=None,
+            action=None,
+            quantity=1,
+            lines=[
+                build_trusted(
+                    InventoryLine,
+                    code=code,
+                    supplier=supplier,
+                    expiration_date=expiration_date,
+                    quantity=quantity,
+                )
+                for code, supplier, expiration_date, quantity in lines
+            ],
+            events=[],
+            event_id=event_id,
+        )
+
+    def _decode_events(self, view: memoryview, count: int):
+        offset = _HEADER.size
+        (event_id_size,) = _EVENT_ID_SIZE.unpack_from(view, offset)
+        offset += _EVENT_ID_SIZE.size
+        event_id = str(view[offset : offset + event_id_size], "utf-8") or None
+        offset += event_id_size
+        if event_id is not None and len(event_id) > MAX_EVENT_ID_LENGTH:
+            raise CodecError("inventory event id is too long")
+
+        events = []
+        for _ in range(count):
+            (event_size,) = _EVENT_SIZE.unpack_from(view, offset)
+            offset += _EVENT_SIZE.size
+            if offset + event_size > len(view):
+                raise CodecError("truncated inventory event")
+            event = self.decode(view[offset : offset + event_size])
+            if event.events:
+                raise CodecError("inventory events can not be nested")
+            events.append(event)
+            offset += event_size
+
+        if offset != len(view):
+            raise CodecError("trailing bytes in inventory message")
+        if not events:
+            raise CodecError("inventory message without events")
+        return build_trusted(
+            InputInventoryProcessorDTO,
+            code=None,
+            supplier=None,
+            expiration_date=None,
+            action=None,
+            quantity=1,
+            lines=[],
+            events=events,
+            event_id=event_id,
+        )
+
+
+@lru_cache(maxsize=4096)
+def _split_datetime(value: datetime):
+    offset = value.utcoffset()
+    wall_time = (value.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+    offset_minutes = _NAIVE_OFFSET if offset is None else offset // _MINUTE
+    return wall_time, offset_minutes
+
+
+@lru_cache(maxsize=4096)
+def _join_datetime(wall_time: int, offset_minutes: int) -> datetime:
+    value = _EPOCH + timedelta(microseconds=wall_time)
+    if offset_minutes == _NAIVE_OFFSET:
+        return value
+    return value.replace(tzinfo=timezone(timedelta(minutes=offset_minutes)))
+
+
+class CodecRegistry:
+    def __init__(self, default, *codecs):
+        self.default = default
+        self.codecs: Dict[str, object] = {default.content_type: default}
+        for codec in codecs:
+            self.codecs[codec.content_type] = codec
+
+    def get(self, content_type: Optional[str]):
+        if content_type is None:
+            return self.default
+        codec = self.codecs.get(content_type)
+        if codec is None:
+            raise CodecError(f"unsupported content type {content_type}")
+        return codec
+
+    def decode(self, body: bytes, content_type: Optional[str]):
+        return self.get(content_type).decode(body)
+
+
+inventory_codecs = CodecRegistry(
+    JsonCodec(InputInventoryProcessorDTO), InventoryBinaryCodec()
+)
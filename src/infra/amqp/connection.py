@@ -1,6 +1,8 @@
+import os
 from typing import Self
 import aio_pika
-from aio_pika.abc import AbstractConnection
+from aio_pika.abc import AbstractChannel, AbstractConnection
+from aio_pika.pool import Pool
 from decouple import config
 
 
@@ -9,6 +11,10 @@ class SingletonAMQPConnection:
 
     def __init__(self, connection):
         self.connection: AbstractConnection = connection
+        self.channel_pool: Pool[AbstractChannel] = Pool(
+            connection.channel,
+            max_size=config("BROKER_CHANNEL_POOL_SIZE", default=10, cast=int),
+        )
 
     @classmethod
     async def get_instance(cls) -> AbstractConnection:
@@ -19,3 +25,22 @@ class SingletonAMQPConnection:
             cls._instance = cls(connection)
 
         return cls._instance.connection
+
+    @classmethod
+    async def get_channel_pool(cls) -> Pool[AbstractChannel]:
+        await cls.get_instance()
+        return cls._instance.channel_pool
+
+    @classmethod
+    async def close(cls):
+        if cls._instance is not None:
+            await cls._instance.channel_pool.close()
+            await cls._instance.connection.close()
+            cls._instance = None
+
+    @classmethod
+    def _forget_inherited_instance(cls):
+        cls._instance = None
+
+
+os.register_at_fork(after_in_child=SingletonAMQPConnection._forget_inherited_instance)
@@ -1,29 +1,180 @@
 import asyncio
+import logging
+import zlib
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
 import aio_pika
-import aiormq
-import orjson
+import pydantic
+
+from src.infra.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+ATTEMPT_HEADER = "x-attempt"
+# Each partition queue is delivered to one consumer at a time, which keeps the
+# order of its messages across processes; the other subscribers stay as standbys.
+SINGLE_ACTIVE_CONSUMER = {"x-single-active-consumer": True}
+
+
+@dataclass(slots=True)
+class DrainReport:
+    drained: int = 0
+    requeued: int = 0
+
+
+@dataclass(slots=True)
+class RetryPolicy:
+    max_attempts: int = 5
+    base_delay_ms: int = 1000
+    multiplier: int = 2
+
+    def delay_ms_for(self, attempt: int) -> int:
+        return self.base_delay_ms * self.multiplier ** (attempt - 1)
+
+
+class _PartitionedWork:
+    __slots__ = ("message", "dto", "pending", "done")
+
+    def __init__(self, message, dto, pending: int):
+        self.message = message
+        self.dto = dto
+        self.pending = pending
+        self.done = asyncio.Event()
+
+
+def partition_of(key: str, partitions: int) -> int:
+    return zlib.crc32(key.encode()) % partitions
+
+
+def partition_queue_name(topic: str, partition: int) -> str:
+    return f"{topic}.partition.{partition}"
+
+
+def retry_queue_name(topic: str, attempt: int) -> str:
+    return f"{topic}.retry.{attempt}"
+
+
+def dead_letter_queue_name(topic: str) -> str:
+    return f"{topic}.dead-letter"
 
 
 class AmqpConsumer:
-    def __init__(self, connection):
+    def __init__(
+        self,
+        connection,
+        prefetch_count: int = 0,
+        retry_policy: RetryPolicy | None = None,
+        partitions: int = 1,
+        owner: Optional[Tuple[int, int]] = None,
+        standby_delay: float = 5.0,
+    ):
         self.connection = connection
+        self.prefetch_count = prefetch_count
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.partitions = max(partitions, 1)
+        self.owner = owner
+        self.standby_delay = standby_delay
         self.subscribers = {}
+        self._channels = []
+        self._workers = []
+        self._standbys = []
+        self._consumer_tags = []
+        self._draining = False
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._report = DrainReport()
 
-    def subscribe_from_topic(self, topic, subscriber, parser):
+    def subscribe_from_topic(
+        self, topic, subscriber, parser, partition_keys=None, partition_queues=0
+    ):
         if self.subscribers.get(topic) is None:
             self.subscribers[topic] = {}
             self.subscribers[topic]["subscribers"] = []
 
         self.subscribers[topic]["parser"] = parser
+        self.subscribers[topic]["partition_keys"] = partition_keys
+        self.subscribers[topic]["partition_queues"] = partition_queues
         self.subscribers[topic]["subscribers"].append(subscriber)
 
+    def owns_partition(self, partition: int) -> bool:
+        if self.owner is None:
+            return True
+        index, processes = self.owner
+        return partition % processes == index
+
     async def run(self):
-        def wrapper_consumer(processor, parser):
+        def wrapper_consumer(
+            channel, topic, processor, parser, partition_keys, partitions
+        ):
+            retried = registry.counter(
+                "amqp_messages_retried_total",
+                "Messages sent to a delayed retry queue",
+                topic=topic,
+            )
+            dead_lettered = registry.counter(
+                "amqp_messages_dead_lettered_total",
+                "Messages sent to the dead-letter queue",
+                topic=topic,
+            )
+
+            async def handle(message, dto):
+                async with message.process(requeue=True):
+                    attempt = int((message.headers or {}).get(ATTEMPT_HEADER, 1))
+                    try:
+                        await processor.execute(dto)
+                    except Exception as error:
+                        retryable = getattr(error, "retryable", True)
+                        if retryable and attempt < self.retry_policy.max_attempts:
+                            await self._retry(channel, topic, message, attempt, error)
+                            retried.inc()
+                        else:
+                            await self._dead_letter(channel, topic, message, error)
+                            dead_lettered.inc()
+
+            if partitions:
+                partitions = [asyncio.Queue() for _ in range(partitions)]
+                for queue in partitions:
+                    self._workers.append(
+                        asyncio.create_task(self._partition_worker(queue, handle))
+                    )
 
             async def consumer(message: aio_pika.IncomingMessage):
-                async with message.process():
-                    decoded_message = message.body.decode()
-                    await processor.execute(parser(**orjson.loads(decoded_message)))
+                if self._draining:
+                    await message.nack(requeue=True)
+                    self._report.requeued += 1
+                    return
+
+                self._in_flight += 1
+                self._idle.clear()
+                queued = False
+                try:
+                    try:
+                        dto = parser.decode(message.body, message.content_type)
+                    except (ValueError, pydantic.ValidationError) as error:
+                        async with message.process(requeue=True):
+                            await self._dead_letter(channel, topic, message, error)
+                            dead_lettered.inc()
+                        return
+
+                    if not partitions:
+                        await handle(message, dto)
+                        return
+
+                    selected = {0}
+                    if partition_keys is not None:
+                        selected = {
+                            partition_of(key, len(partitions))
+                            for key in partition_keys(dto)
+                        } or selected
+                    work = _PartitionedWork(message, dto, len(selected))
+                    for partition in sorted(selected):
+                        partitions[partition].put_nowait(work)
+                    queued = True
+                finally:
+                    if not queued:
+                        self._done()
 
             return consumer
 
@@ -32,10 +183,157 @@ class AmqpConsumer:
 
         for topic, data in self.subscribers.items():
             channel = await self.connection.channel()
+            self._channels.append(channel)
+            if self.prefetch_count:
+                await channel.set_qos(prefetch_count=self.prefetch_count)
             queue = await channel.declare_queue(topic)
+            await self._declare_retry_queues(channel, topic)
             parser = data["parser"]
+            partition_keys = data["partition_keys"]
 
             for subscriber in data["subscribers"]:
-                asyncio.ensure_future(
-                    queue.consume(wrapper_consumer(subscriber, parser))
+                consumer_tag = await queue.consume(
+                    wrapper_consumer(
+                        channel,
+                        topic,
+                        subscriber,
+                        parser,
+                        partition_keys,
+                        0 if partition_keys is None else self.partitions,
+                    )
+                )
+                self._consumer_tags.append((queue, consumer_tag))
+
+            standby = []
+            for partition in range(data["partition_queues"]):
+                partition_queue = await channel.declare_queue(
+                    partition_queue_name(topic, partition),
+                    durable=True,
+                    arguments=SINGLE_ACTIVE_CONSUMER,
                 )
+                for subscriber in data["subscribers"]:
+                    callback = wrapper_consumer(
+                        channel, topic, subscriber, parser, None, 1
+                    )
+                    if self.owns_partition(partition):
+                        await self._consume(partition_queue, callback)
+                    else:
+                        standby.append((partition_queue, callback))
+            if standby:
+                self._standbys.append(asyncio.create_task(self._stand_by(standby)))
+
+    async def _consume(self, queue, callback):
+        consumer_tag = await queue.consume(callback)
+        self._consumer_tags.append((queue, consumer_tag))
+
+    async def _stand_by(self, subscriptions):
+        # Partitions owned by other processes are subscribed late, so their
+        # owners register first and become the active consumers.
+        await asyncio.sleep(self.standby_delay)
+        for queue, callback in subscriptions:
+            await self._consume(queue, callback)
+
+    async def _partition_worker(self, queue: asyncio.Queue, handle):
+        while True:
+            work = await queue.get()
+            work.pending -= 1
+            if work.pending:
+                await work.done.wait()
+                continue
+
+            try:
+                await handle(work.message, work.dto)
+            except Exception:
+                logger.exception("failed to settle message %s", work.message.message_id)
+            finally:
+                work.done.set()
+                self._done()
+
+    def _done(self):
+        self._in_flight -= 1
+        if not self._in_flight:
+            self._idle.set()
+
+    async def _declare_retry_queues(self, channel, topic):
+        for attempt in range(1, self.retry_policy.max_attempts):
+            await channel.declare_queue(
+                retry_queue_name(topic, attempt),
+                durable=True,
+                arguments={
+                    "x-message-ttl": self.retry_policy.delay_ms_for(attempt),
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": topic,
+                },
+            )
+        await channel.declare_queue(dead_letter_queue_name(topic), durable=True)
+
+    async def _retry(self, channel, topic, message, attempt, error):
+        logger.warning(
+            "retrying message %s from %s (attempt %s): %r",
+            message.message_id,
+            topic,
+            attempt,
+            error,
+        )
+        await self._republish(
+            channel, message, retry_queue_name(topic, attempt), attempt + 1, error
+        )
+
+    async def _dead_letter(self, channel, topic, message, error):
+        logger.error(
+            "dead-lettering message %s from %s: %r", message.message_id, topic, error
+        )
+        attempt = int((message.headers or {}).get(ATTEMPT_HEADER, 1))
+        await self._republish(
+            channel, message, dead_letter_queue_name(topic), attempt, error
+        )
+
+    async def _republish(self, channel, message, routing_key, attempt, error):
+        headers = dict(message.headers or {})
+        headers[ATTEMPT_HEADER] = attempt
+        headers["x-last-error"] = repr(error)[:255]
+        await channel.default_exchange.publish(
+            aio_pika.Message(
+                body=message.body,
+                headers=headers,
+                content_type=message.content_type,
+                message_id=message.message_id,
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            ),
+            routing_key=routing_key,
+        )
+
+    async def stop(self, timeout: float) -> DrainReport:
+        self._draining = True
+        for standby in self._standbys:
+            standby.cancel()
+        await asyncio.gather(*self._standbys, return_exceptions=True)
+        self._standbys.clear()
+        for queue, consumer_tag in self._consumer_tags:
+            await queue.cancel(consumer_tag)
+        self._consumer_tags.clear()
+
+        pending = self._in_flight
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        self._report.drained += pending - self._in_flight
+        self._report.requeued += self._in_flight
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+        for channel in self._channels:
+            await channel.close()
+        self._channels.clear()
+
+        logger.info(
+            "consumer drained %s messages and requeued %s",
+            self._report.drained,
+            self._report.requeued,
+        )
+        return self._report
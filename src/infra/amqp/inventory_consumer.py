@@ -0,0 +1,174 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from decouple import config
+
+from src.domain.use_cases.product_inventory_processor import (
+    InputInventoryProcessorDTO,
+    InventoryProcessorUseCase,
+    RecentEventIds,
+)
+from src.infra.amqp.codecs import JSON_CONTENT_TYPE, inventory_codecs
+from src.infra.amqp.connection import SingletonAMQPConnection
+from src.infra.amqp.consumer import AmqpConsumer, RetryPolicy
+from src.infra.amqp.inventory_routing import (
+    InventoryRouter,
+    get_inventory_partitions,
+    inventory_partition_keys,
+)
+from src.infra.amqp.outbox_relay import OutboxRelay
+from src.infra.amqp.repositories.buffered_inventory_repository import (
+    BufferedInventoryRepository,
+    OverflowPolicy,
+)
+from src.infra.amqp.repositories.inventory_repository import AmqpInventoryRepository
+from src.infra.product_archiver import ProductArchiver
+from src.infra.scheduler import PeriodicTask
+from src.infra.sqlalchemy.connection import SingletonSqlAlchemyConnection
+from src.infra.sqlalchemy.repositories.inventory_outbox_repository import (
+    SQLAlchemyOutboxInventoryRepository,
+)
+from src.infra.sqlalchemy.repositories.product_repository import (
+    SQLAlchemyProductRepository,
+)
+
+INVENTORY_TOPIC = "inventory"
+OUTBOX_PUBLISH_MODE = "outbox"
+BUFFERED_PUBLISH_MODE = "buffered"
+
+
+def get_inventory_publish_mode() -> str:
+    return config("INVENTORY_PUBLISH_MODE", default="broker")
+
+
+def publishes_through_outbox() -> bool:
+    return get_inventory_publish_mode() == OUTBOX_PUBLISH_MODE
+
+
+def publishes_through_buffer() -> bool:
+    return get_inventory_publish_mode() == BUFFERED_PUBLISH_MODE
+
+
+def get_inventory_publish_codec():
+    return inventory_codecs.get(
+        config("INVENTORY_CONTENT_TYPE", default=JSON_CONTENT_TYPE)
+    )
+
+
+async def setup_inventory_publisher(topic: str = INVENTORY_TOPIC):
+    router = InventoryRouter(topic, get_inventory_partitions())
+    if publishes_through_outbox():
+        return SQLAlchemyOutboxInventoryRepository(
+            SingletonSqlAlchemyConnection.get_instance(),
+            get_inventory_publish_codec(),
+            router,
+        )
+
+    channel_pool = await SingletonAMQPConnection.get_channel_pool()
+    repository = AmqpInventoryRepository(
+        channel_pool, topic, get_inventory_publish_codec(), router
+    )
+    if not publishes_through_buffer():
+        return repository
+
+    return BufferedInventoryRepository(
+        repository,
+        max_size=config("INVENTORY_BUFFER_SIZE", default=10_000, cast=int),
+        overflow_policy=config(
+            "INVENTORY_BUFFER_OVERFLOW", default="block", cast=OverflowPolicy
+        ),
+        batch_size=config("INVENTORY_BUFFER_BATCH_SIZE", default=100, cast=int),
+        spill_directory=config("INVENTORY_BUFFER_SPILL_DIR", default=None),
+    )
+
+
+async def setup_inventory_consumer(
+    owner: Optional[Tuple[int, int]] = None,
+) -> AmqpConsumer:
+    connection_instance = SingletonSqlAlchemyConnection.get_instance()
+    product_repository = SQLAlchemyProductRepository(connection_instance)
+    broker_connection = await SingletonAMQPConnection.get_instance()
+    partitions = config("INVENTORY_CONSUMER_PARTITIONS", default=8, cast=int)
+    consumer = AmqpConsumer(
+        broker_connection,
+        prefetch_count=config(
+            "INVENTORY_CONSUMER_PREFETCH", default=max(10, 2 * partitions), cast=int
+        ),
+        partitions=partitions,
+        owner=owner,
+        standby_delay=config("INVENTORY_STANDBY_DELAY", default=5.0, cast=float),
+        retry_policy=RetryPolicy(
+            max_attempts=config("INVENTORY_MAX_ATTEMPTS", default=5, cast=int),
+            base_delay_ms=config(
+                "INVENTORY_RETRY_BASE_DELAY_MS", default=1000, cast=int
+            ),
+        ),
+    )
+    consumer.subscribe_from_topic(
+        INVENTORY_TOPIC,
+        InventoryProcessorUseCase(
+            product_repository,
+            RecentEventIds(
+                config("INVENTORY_DEDUP_CACHE_SIZE", default=10_000, cast=int)
+            ),
+        ),
+        inventory_codecs,
+        partition_keys=inventory_partition_keys,
+        partition_queues=get_inventory_partitions(),
+    )
+    return consumer
+
+
+async def setup_inventory_maintenance() -> List[PeriodicTask]:
+    connection_instance = SingletonSqlAlchemyConnection.get_instance()
+    product_repository = SQLAlchemyProductRepository(connection_instance)
+    event_ttl = timedelta(
+        hours=config("INVENTORY_EVENT_TTL_HOURS", default=72, cast=float)
+    )
+
+    archiver = ProductArchiver(
+        product_repository,
+        retention=timedelta(
+            days=config("PRODUCT_ARCHIVE_RETENTION_DAYS", default=30, cast=float)
+        ),
+        chunk_size=config("PRODUCT_ARCHIVE_CHUNK_SIZE", default=500, cast=int),
+        pause=config("PRODUCT_ARCHIVE_CHUNK_PAUSE", default=0.1, cast=float),
+    )
+
+    async def prune_inventory_events():
+        await product_repository.prune_inventory_events(
+            datetime.now(timezone.utc) - event_ttl
+        )
+
+    tasks = [
+        PeriodicTask(
+            "inventory-shard-compaction",
+            config("INVENTORY_SHARD_COMPACTION_INTERVAL", default=5.0, cast=float),
+            product_repository.compact_inventory_shards,
+        ),
+        PeriodicTask(
+            "inventory-event-pruning",
+            config("INVENTORY_EVENT_PRUNE_INTERVAL", default=600.0, cast=float),
+            prune_inventory_events,
+        ),
+        PeriodicTask(
+            "product-archival",
+            config("PRODUCT_ARCHIVE_INTERVAL", default=3600.0, cast=float),
+            archiver.run,
+        ),
+    ]
+    if publishes_through_outbox():
+        relay = OutboxRelay(
+            connection_instance,
+            await SingletonAMQPConnection.get_channel_pool(),
+            INVENTORY_TOPIC,
+            batch_size=config("INVENTORY_OUTBOX_BATCH_SIZE", default=500, cast=int),
+        )
+        tasks.append(
+            PeriodicTask(
+                "inventory-outbox-relay",
+                config("INVENTORY_OUTBOX_POLL_INTERVAL", default=0.2, cast=float),
+                relay.relay_pending,
+            )
+        )
+    return tasks
@@ -0,0 +1,47 @@
+from typing import Dict, List, Tuple
+
+from decouple import config
+
+from src.domain.use_cases.product_inventory_processor import InputInventoryProcessorDTO
+from src.infra.amqp.consumer import partition_of, partition_queue_name
+from src.infra.sqlalchemy.models import make_product_id_from_base
+
+
+def get_inventory_partitions() -> int:
+    return config("INVENTORY_PARTITIONS", default=8, cast=int)
+
+
+def inventory_partition_keys(dto: InputInventoryProcessorDTO) -> List[str]:
+    return [
+        make_product_id_from_base(line.code, line.supplier, line.expiration_date)
+        for line in dto.to_lines()
+    ]
+
+
+class InventoryRouter:
+    def __init__(self, topic: str, partitions: int):
+        self.topic = topic
+        self.partitions = partitions
+
+    def routing_key_for(self, dto: InputInventoryProcessorDTO) -> str:
+        if not self.partitions:
+            return self.topic
+        keys = inventory_partition_keys(dto)
+        partition = partition_of(keys[0], self.partitions) if keys else 0
+        return partition_queue_name(self.topic, partition)
+
+    def split(
+        self, dto: InputInventoryProcessorDTO
+    ) -> List[Tuple[str, InputInventoryProcessorDTO]]:
+        if not dto.events or not self.partitions:
+            return [(self.routing_key_for(dto), dto)]
+
+        events_per_key: Dict[str, List[InputInventoryProcessorDTO]] = {}
+        for event in dto.events:
+            events_per_key.setdefault(self.routing_key_for(event), []).append(event)
+        if len(events_per_key) == 1:
+            return [(self.routing_key_for(dto), dto)]
+        return [
+            (routing_key, dto.model_copy(update={"events": events, "event_id": None}))
+            for routing_key, events in events_per_key.items()
+        ]
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import zlib
+
+import aio_pika
+from aio_pika.abc import AbstractChannel
+from aio_pika.pool import Pool
+from sqlalchemy import BigInteger, any_, bindparam, delete, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from src.infra.metrics import registry
+from src.infra.sqlalchemy.models import InventoryOutboxModel
+
+logger = logging.getLogger(__name__)
+
+# Only one relay may publish at a time, across every process, so rows reach the
+# broker in id order; the lock is released when the batch commits.
+_try_relay_lock = select(func.pg_try_advisory_xact_lock(bindparam("lock_key")))
+
+_pending_outbox_messages = (
+    select(
+        InventoryOutboxModel.id,
+        InventoryOutboxModel.message_id,
+        InventoryOutboxModel.routing_key,
+        InventoryOutboxModel.content_type,
+        InventoryOutboxModel.body,
+    )
+    .order_by(InventoryOutboxModel.id)
+    .limit(bindparam("batch_size"))
+    .with_for_update()
+)
+
+_delete_outbox_messages = delete(InventoryOutboxModel).where(
+    InventoryOutboxModel.id == any_(bindparam("ids", type_=ARRAY(BigInteger)))
+)
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        sqlalchemy_instance,
+        channel_pool: Pool[AbstractChannel],
+        topic: str,
+        batch_size: int = 500,
+    ):
+        self.sqlalchemy_instance = sqlalchemy_instance
+        self.channel_pool = channel_pool
+        self.topic = topic
+        self.batch_size = batch_size
+        self._lock_key = zlib.crc32(f"outbox-relay:{topic}".encode())
+        self._published = registry.counter(
+            "outbox_messages_published_total",
+            "Outbox messages published to the broker",
+            topic=topic,
+        )
+
+    async def relay_pending(self) -> int:
+        relayed = 0
+        while True:
+            published = await self.relay_batch()
+            relayed += published
+            if published < self.batch_size:
+                return relayed
+
+    async def relay_batch(self) -> int:
+        async with self.sqlalchemy_instance.async_session() as session:
+            locked = await session.execute(
+                _try_relay_lock, {"lock_key": self._lock_key}
+            )
+            if not locked.scalar():
+                return 0
+
+            result = await session.execute(
+                _pending_outbox_messages, {"batch_size": self.batch_size}
+            )
+            rows = result.all()
+            if not rows:
+                return 0
+
+            async with self.channel_pool.acquire() as channel:
+                # Publishes on one channel reach the broker in order, so the
+                # confirms can be awaited together.
+                await asyncio.gather(
+                    *(
+                        channel.default_exchange.publish(
+                            aio_pika.Message(
+                                body=row.body,
+                                content_type=row.content_type,
+                                message_id=row.message_id,
+                            ),
+                            routing_key=row.routing_key or self.topic,
+                        )
+                        for row in rows
+                    )
+                )
+
+            await session.execute(
+                _delete_outbox_messages,
+                {"ids": [row.id for row in rows]},
+                execution_options={"synchronize_session": False},
+            )
+            await session.commit()
+
+        self._published.inc(len(rows))
+        return len(rows)
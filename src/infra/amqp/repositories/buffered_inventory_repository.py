@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from enum import Enum
+from pathlib import Path
+from typing import Deque, List, Optional, Tuple
+
+from src.domain.contracts.repositories.inventory_repository import IInventoryRepository
+from src.domain.exceptions import PublishBufferFullError
+from src.domain.use_cases.product_inventory_processor import InputInventoryProcessorDTO
+from src.infra.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+_SPILL_SUFFIX = ".jsonl"
+_DRAINING_SUFFIX = ".draining"
+
+
+class OverflowPolicy(Enum):
+    BLOCK = "block"
+    REJECT = "reject"
+    SPILL = "spill"
+
+
+class BufferedInventoryRepository(IInventoryRepository):
+    def __init__(
+        self,
+        inner,
+        max_size: int = 10_000,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        batch_size: int = 100,
+        spill_directory: Optional[str] = None,
+        retry_delay: float = 1.0,
+    ):
+        if overflow_policy is OverflowPolicy.SPILL and spill_directory is None:
+            raise ValueError("spill overflow policy requires a spill directory")
+
+        self.inner = inner
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.batch_size = batch_size
+        self.spill_directory = Path(spill_directory) if spill_directory else None
+        self.retry_delay = retry_delay
+        self._buffer: Deque[Tuple[float, InputInventoryProcessorDTO]] = deque()
+        self._publishing: List[InputInventoryProcessorDTO] = []
+        self._publishing_since: Optional[float] = None
+        self._spilling = False
+        self._changed: Optional[asyncio.Condition] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._depth = registry.gauge(
+            "inventory_publish_buffer_depth", "Inventory events waiting to be published"
+        )
+        self._age = registry.gauge(
+            "inventory_publish_buffer_age_seconds",
+            "Age of the oldest inventory event waiting to be published",
+        )
+        self._rejected = registry.counter(
+            "inventory_publish_buffer_rejected_total",
+            "Inventory events rejected because the publish buffer was full",
+        )
+        self._spilled = registry.counter(
+            "inventory_publish_buffer_spilled_total",
+            "Inventory events written to disk because the publish buffer was full",
+        )
+        self._dropped = registry.counter(
+            "inventory_publish_buffer_dropped_total",
+            "Inventory events dropped because they can never be published",
+        )
+
+    @property
+    def _spill_file(self) -> Path:
+        return self.spill_directory / f"inventory-{os.getpid()}{_SPILL_SUFFIX}"
+
+    def _draining_file(self, tag: str) -> Path:
+        return self.spill_directory / f"inventory-{os.getpid()}.{tag}{_DRAINING_SUFFIX}"
+
+    async def send(self, dto: InputInventoryProcessorDTO):
+        if dto.event_id is None:
+            dto = dto.model_copy(update={"event_id": uuid.uuid4().hex})
+        self._ensure_flusher()
+        if self._spilling or len(self._buffer) >= self.max_size:
+            if self.overflow_policy is OverflowPolicy.REJECT:
+                self._rejected.inc()
+                raise PublishBufferFullError()
+            if self.overflow_policy is OverflowPolicy.SPILL:
+                self._spill(dto)
+                return
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self._buffer) < self.max_size)
+
+        self._buffer.append((time.monotonic(), dto))
+        self._update_gauges()
+        async with self._changed:
+            self._changed.notify_all()
+
+    def _spill(self, dto: InputInventoryProcessorDTO):
+        self._spilling = True
+        self.spill_directory.mkdir(parents=True, exist_ok=True)
+        with open(self._spill_file, "a", encoding="utf-8") as spill:
+            spill.write(dto.model_dump_json() + "\n")
+        self._spilled.inc()
+
+    def _ensure_flusher(self):
+        if self._flusher is None:
+            self._changed = asyncio.Condition()
+            self._spilling = self._claim_spilled_files()
+            self._flusher = asyncio.create_task(self._flush_forever())
+
+    def _claim_spilled_files(self) -> bool:
+        if self.spill_directory is None or not self.spill_directory.exists():
+            return False
+
+        for path in self.spill_directory.glob("inventory-*"):
+            owner = path.name.split(".")[0].removeprefix("inventory-")
+            if not owner.isdigit():
+                continue
+            if int(owner) != os.getpid():
+                try:
+                    os.kill(int(owner), 0)
+                    continue
+                except ProcessLookupError:
+                    pass
+                except PermissionError:
+                    continue
+            elif path.name.endswith(_DRAINING_SUFFIX):
+                continue
+            try:
+                path.rename(self._draining_file(f"{time.time_ns()}-{owner}"))
+            except FileNotFoundError:
+                continue
+
+        return any(self.spill_directory.glob(f"inventory-{os.getpid()}.*"))
+
+    async def _flush_forever(self):
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: self._buffer or self._spilling)
+
+            try:
+                if self._buffer:
+                    self._publishing_since = self._buffer[0][0]
+                    self._publishing = [
+                        self._buffer.popleft()[1]
+                        for _ in range(min(self.batch_size, len(self._buffer)))
+                    ]
+                    self._update_gauges()
+                    async with self._changed:
+                        self._changed.notify_all()
+                    await self._publish(self._publishing)
+                    self._publishing = []
+                    self._publishing_since = None
+                else:
+                    await self._drain_spilled()
+            except Exception:
+                logger.exception("failed to flush the inventory publish buffer")
+                await asyncio.sleep(self.retry_delay)
+
+            self._update_gauges()
+            async with self._changed:
+                self._changed.notify_all()
+
+    async def _publish(self, batch: List[InputInventoryProcessorDTO]):
+        # The whole batch goes out in order on one channel; after a failure it
+        # is sent again from the start, and redelivered events are skipped by
+        # their event_id.
+        while batch:
+            try:
+                await self.inner.send_many(batch)
+                return
+            except Exception as error:
+                if getattr(error, "retryable", True):
+                    logger.warning(
+                        "failed to publish %s inventory events, retrying", len(batch)
+                    )
+                    self._update_gauges()
+                    await asyncio.sleep(self.retry_delay)
+                    continue
+            batch = await self._drop_rejected(batch)
+
+    async def _drop_rejected(
+        self, batch: List[InputInventoryProcessorDTO]
+    ) -> List[InputInventoryProcessorDTO]:
+        # Sends one event at a time up to the first one that can never be
+        # published, drops it and hands the events after it back to _publish.
+        for index, dto in enumerate(batch):
+            try:
+                await self.inner.send_many([dto])
+            except Exception as error:
+                if getattr(error, "retryable", True):
+                    return batch[index:]
+                logger.error(
+                    "dropping inventory event %s that can not be published: %s",
+                    dto.event_id,
+                    error,
+                )
+                self._dropped.inc()
+                return batch[index + 1 :]
+        return []
+
+    async def _drain_spilled(self):
+        if self._spill_file.exists():
+            self._spill_file.rename(self._draining_file(str(time.time_ns())))
+
+        for path in sorted(
+            self.spill_directory.glob(f"inventory-{os.getpid()}.*{_DRAINING_SUFFIX}")
+        ):
+            with open(path, encoding="utf-8") as spill:
+                dtos = [
+                    InputInventoryProcessorDTO.model_validate_json(line)
+                    for line in spill
+                    if line.strip()
+                ]
+            for start in range(0, len(dtos), self.batch_size):
+                await self._publish(dtos[start : start + self.batch_size])
+            path.unlink()
+
+        if not self._spill_file.exists():
+            self._spilling = False
+
+    def _update_gauges(self):
+        # The batch being published is older than anything still buffered.
+        oldest = self._publishing_since
+        if oldest is None and self._buffer:
+            oldest = self._buffer[0][0]
+        self._depth.set(len(self._buffer) + len(self._publishing))
+        self._age.set(0 if oldest is None else time.monotonic() - oldest)
+
+    def _is_drained(self) -> bool:
+        return not self._buffer and not self._publishing and not self._spilling
+
+    async def flush(self, timeout: float) -> int:
+        if self._flusher is None:
+            return await self.inner.flush(timeout)
+
+        started = time.monotonic()
+        try:
+            async with self._changed:
+                await asyncio.wait_for(
+                    self._changed.wait_for(self._is_drained), timeout
+                )
+        except asyncio.TimeoutError:
+            pass
+
+        self._flusher.cancel()
+        try:
+            await self._flusher
+        except asyncio.CancelledError:
+            pass
+        self._flusher = None
+
+        not_flushed = self._publishing + [dto for _, dto in self._buffer]
+        self._publishing = []
+        self._publishing_since = None
+        self._buffer.clear()
+        if not_flushed and self.spill_directory is not None:
+            for dto in not_flushed:
+                self._spill(dto)
+            logger.info("spilled %s inventory events to disk", len(not_flushed))
+            not_flushed = []
+
+        remaining = max(timeout - (time.monotonic() - started), 0)
+        return len(not_flushed) + await self.inner.flush(remaining)
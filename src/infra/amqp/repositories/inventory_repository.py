@@ -1,16 +1,70 @@
+import asyncio
+import uuid
+from typing import List
+
 import aio_pika
+from aio_pika.abc import AbstractChannel
+from aio_pika.pool import Pool
+
 from src.domain.contracts.repositories.inventory_repository import IInventoryRepository
 from src.domain.use_cases.product_inventory_processor import InputInventoryProcessorDTO
 
 
 class AmqpInventoryRepository(IInventoryRepository):
-    def __init__(self, connection, topic):
-        self.connection = connection
+    def __init__(self, channel_pool: Pool[AbstractChannel], topic, codec, router=None):
+        self.channel_pool = channel_pool
         self.topic = topic
+        self.codec = codec
+        self.router = router
+        self._pending = 0
+        self._flushed = asyncio.Event()
+        self._flushed.set()
 
     async def send(self, dto: InputInventoryProcessorDTO):
-        channel = await self.connection.channel()
-        await channel.default_exchange.publish(
-            aio_pika.Message(body=dto.model_dump_json().encode()),
-            routing_key=self.topic,
+        await self.send_many([dto])
+
+    async def send_many(self, dtos: List[InputInventoryProcessorDTO]):
+        messages = [
+            self._message(routing_key, part)
+            for dto in dtos
+            for routing_key, part in self._split(dto)
+        ]
+        self._pending += 1
+        self._flushed.clear()
+        try:
+            async with self.channel_pool.acquire() as channel:
+                # Publishes on one channel reach the broker in order, so the
+                # confirms can be awaited together.
+                await asyncio.gather(
+                    *(
+                        channel.default_exchange.publish(
+                            message, routing_key=routing_key
+                        )
+                        for routing_key, message in messages
+                    )
+                )
+        finally:
+            self._pending -= 1
+            if not self._pending:
+                self._flushed.set()
+
+    def _split(self, dto: InputInventoryProcessorDTO):
+        if self.router is None:
+            return [(self.topic, dto)]
+        return self.router.split(dto)
+
+    def _message(self, routing_key: str, dto: InputInventoryProcessorDTO):
+        if dto.event_id is None:
+            dto = dto.model_copy(update={"event_id": uuid.uuid4().hex})
+        return routing_key, aio_pika.Message(
+            body=self.codec.encode(dto),
+            content_type=self.codec.content_type,
+            message_id=dto.event_id,
         )
+
+    async def flush(self, timeout: float) -> int:
+        try:
+            await asyncio.wait_for(self._flushed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._pending
@@ -0,0 +1,82 @@
+import asyncio
+import signal
+from multiprocessing import get_context
+
+from decouple import config
+
+from src.infra.amqp.connection import SingletonAMQPConnection
+from src.infra.amqp.inventory_consumer import (
+    setup_inventory_consumer,
+    setup_inventory_maintenance,
+)
+from src.infra.metrics import serve_metrics
+from src.infra.resources import resources_per_process
+from src.infra.sqlalchemy import models
+from src.infra.sqlalchemy.connection import SingletonSqlAlchemyConnection
+
+
+async def run_inventory_worker(owner=None):
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signal_number, stop_event.set)
+
+    instance = SingletonSqlAlchemyConnection.get_instance()
+    await models.create_all(instance.engine)
+
+    metrics_port = config("METRICS_PORT", default=0, cast=int)
+    if metrics_port:
+        await serve_metrics(config("METRICS_HOST", default="0.0.0.0"), metrics_port)
+
+    consumer = await setup_inventory_consumer(owner)
+    await consumer.run()
+    maintenance = await setup_inventory_maintenance()
+    for task in maintenance:
+        task.start()
+    await stop_event.wait()
+
+    await consumer.stop(config("SHUTDOWN_DRAIN_TIMEOUT", default=20.0, cast=float))
+    for task in maintenance:
+        await task.stop()
+    await SingletonAMQPConnection.close()
+    await instance.dispose()
+
+
+def _run_worker_process(index: int, processes: int):
+    asyncio.run(run_inventory_worker((index, processes)))
+
+
+def main():
+    processes = config("CONSUMER_PROCESSES", default=1, cast=int)
+    resources_per_process(
+        postgres_connection_budget=config(
+            "CONSUMER_POSTGRES_CONNECTION_BUDGET", default=5 * processes, cast=int
+        ),
+        broker_channel_budget=config(
+            "CONSUMER_BROKER_CHANNEL_BUDGET", default=2 * processes, cast=int
+        ),
+        processes=processes,
+    ).export()
+
+    if processes <= 1:
+        _run_worker_process(0, 1)
+        return
+
+    context = get_context("spawn")
+    workers = [
+        context.Process(
+            target=_run_worker_process, args=(index, processes), daemon=False
+        )
+        for index in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+
+    def forward_signal(signal_number, _frame):
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+    signal.signal(signal.SIGTERM, forward_signal)
+    for worker in workers:
+        worker.join()
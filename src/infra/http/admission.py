@@ -0,0 +1,167 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+import orjson
+
+from src.infra.metrics import registry
+
+
+class AimdLimit:
+    def __init__(
+        self,
+        initial: float,
+        min_limit: float = 1,
+        max_limit: float = 1000,
+        backoff: float = 0.9,
+        tolerance: float = 2.0,
+        smoothing: float = 0.01,
+    ):
+        self.value = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.baseline: Optional[float] = None
+
+    def update(self, latency: float, in_flight: int, failed: bool):
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        else:
+            self.baseline += (latency - self.baseline) * self.smoothing
+
+        if failed or latency > self.baseline * self.tolerance:
+            self.value = max(self.min_limit, self.value * self.backoff)
+        elif in_flight * 2 >= self.value:
+            self.value = min(self.max_limit, self.value + 1 / self.value)
+
+
+class ConcurrencyLimiter:
+    def __init__(self, limit: AimdLimit, queue_timeout: float, max_queue: int):
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> bool:
+        if self.in_flight < int(self.limit.value) and not self._waiters:
+            self.in_flight += 1
+            return True
+        if len(self._waiters) >= self.max_queue or self.queue_timeout <= 0:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                return True
+            waiter.cancel()
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._give_back()
+            waiter.cancel()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self, latency: float, failed: bool):
+        self.limit.update(latency, self.in_flight, failed)
+        self._give_back()
+
+    def _give_back(self):
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < int(self.limit.value):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class AdmissionControlMiddleware:
+    def __init__(
+        self,
+        app,
+        limiters: Dict[str, ConcurrencyLimiter],
+        routes: Iterable[Tuple[str, str]],
+        default_group: str,
+        bypass_prefixes: Iterable[str] = (),
+        retry_after: int = 1,
+    ):
+        self.app = app
+        self.limiters = limiters
+        self.routes = sorted(routes, key=lambda route: len(route[0]), reverse=True)
+        self.default_group = default_group
+        self.bypass_prefixes = tuple(bypass_prefixes)
+        self.retry_after = str(retry_after).encode()
+        self._shed = {
+            group: registry.counter(
+                "http_requests_shed_total",
+                "Requests rejected by admission control",
+                group=group,
+            )
+            for group in limiters
+        }
+        self._limits = {
+            group: registry.gauge(
+                "http_concurrency_limit",
+                "Current adaptive concurrency limit",
+                group=group,
+            )
+            for group in limiters
+        }
+
+    def group_for(self, path: str) -> str:
+        for prefix, group in self.routes:
+            if path.startswith(prefix):
+                return group
+        return self.default_group
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.bypass_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        group = self.group_for(scope["path"])
+        limiter = self.limiters[group]
+        if not await limiter.acquire():
+            self._shed[group].inc()
+            await self._reject(send)
+            return
+
+        status = 500
+        started = time.monotonic()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            limiter.release(time.monotonic() - started, failed=status >= 500)
+            self._limits[group].set(limiter.limit.value)
+
+    async def _reject(self, send):
+        body = orjson.dumps({"success": False, "message": "server overloaded"})
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", self.retry_after),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,63 @@
+import datetime
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Mapping
+
+from src.domain.entities.product import Product, ProductVersion
+from src.infra.sqlalchemy.models import make_product_id_from
+
+
+def version_of(product: Product) -> ProductVersion:
+    return ProductVersion(
+        product_id=make_product_id_from(product),
+        modified_at=product.updated_at or product.created_at,
+        inventory_quantity=product.inventory_quantity,
+    )
+
+
+def _as_utc(moment: datetime.datetime) -> datetime.datetime:
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=datetime.UTC)
+    return moment.astimezone(datetime.UTC)
+
+
+def etag_of(version: ProductVersion) -> str:
+    token = (
+        f"{version.product_id}|{_as_utc(version.modified_at).isoformat()}"
+        f"|{version.inventory_quantity}"
+    )
+    return f'"{hashlib.blake2b(token.encode(), digest_size=16).hexdigest()}"'
+
+
+def validator_headers(version: ProductVersion) -> Dict[str, str]:
+    return {
+        "ETag": etag_of(version),
+        "Last-Modified": format_datetime(_as_utc(version.modified_at), usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+
+def is_conditional(headers: Mapping[str, str]) -> bool:
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def is_not_modified(headers: Mapping[str, str], version: ProductVersion) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        etag = etag_of(version)
+        candidates = (
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        )
+        return etag in candidates
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    modified_at = _as_utc(version.modified_at).replace(microsecond=0)
+    return modified_at <= _as_utc(since)
@@ -0,0 +1,24 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.infra.metrics import registry
+
+router = APIRouter(prefix="/api/metrics")
+
+
+@router.get(
+    "",
+    tags=["Metrics"],
+    summary="Exportar as métricas da aplicação",
+    response_class=PlainTextResponse,
+)
+async def metrics() -> PlainTextResponse:
+    """
+    Exporta as métricas do processo no formato texto do Prometheus.
+
+    ## Respostas:
+    - **200 OK**: Métricas do worker que atendeu a requisição.
+    """
+    return PlainTextResponse(
+        content=registry.render(), media_type="text/plain; version=0.0.4"
+    )
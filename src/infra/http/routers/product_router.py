@@ -1,7 +1,13 @@
 from datetime import datetime
-from typing import Self
-from fastapi import APIRouter, Depends
-from fastapi.responses import ORJSONResponse
+from typing import Optional, Self
+from decouple import config
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import ORJSONResponse, Response
+from src.domain.use_cases.product_bulk_delete import (
+    InputProductBulkDeleteDTO,
+    OutputProductBulkDeleteDTO,
+    ProductBulkDeleteUseCase,
+)
 from src.domain.use_cases.product_create import (
     InputProductCreateDTO,
     ProductCreateUseCase,
@@ -17,24 +23,65 @@ from src.domain.use_cases.product_get import (
     OutputProductGetDTO,
     ProductGetUseCase,
 )
+from src.domain.use_cases.product_get_version import ProductGetVersionUseCase
+from src.domain.use_cases.product_inventory_shards import (
+    InputProductInventoryShardsDTO,
+    OutputProductInventoryShardsDTO,
+    ProductInventoryShardsUseCase,
+)
+from src.domain.use_cases.product_lookup import (
+    InputProductLookupDTO,
+    OutputProductLookupDTO,
+    ProductLookupUseCase,
+)
+from src.domain.use_cases.product_search import (
+    MAX_SEARCH_PAGE_SIZE,
+    InputProductSearchDTO,
+    OutputProductSearchDTO,
+    ProductSearchUseCase,
+)
 from src.domain.use_cases.product_send_inventory import (
     ProductSendInventoryUseCase,
     OutputProductSendInventoryDTO,
     InputProductSendInventoryDTO,
 )
+from src.domain.use_cases.product_send_inventory_batch import (
+    InputProductSendInventoryBatchDTO,
+    OutputProductSendInventoryBatchDTO,
+    ProductSendInventoryBatchUseCase,
+)
+from src.domain.use_cases.product_supplier_valuation import (
+    InputProductSupplierValuationDTO,
+    OutputProductSupplierValuationDTO,
+    ProductSupplierValuationUseCase,
+)
 from src.domain.use_cases.product_update import (
     InputProductUpdateDTO,
     OutputProductUpdateDTO,
     ProductUpdateUseCase,
 )
-from src.infra.amqp.connection import SingletonAMQPConnection
-from src.infra.amqp.repositories.inventory_repository import AmqpInventoryRepository
+from src.infra.amqp.inventory_consumer import (
+    INVENTORY_TOPIC,
+    publishes_through_buffer,
+    setup_inventory_publisher,
+)
+from src.infra.http.conditional import (
+    is_conditional,
+    is_not_modified,
+    validator_headers,
+    version_of,
+)
+from src.infra.search.product_index import (
+    IndexedProductRepository,
+    product_search_index,
+)
+from src.infra.single_flight import SingleFlightProductRepository
+from src.infra.supplier_valuation import SupplierValuationCache
 from src.infra.sqlalchemy.connection import SingletonSqlAlchemyConnection
 from src.infra.sqlalchemy.repositories.product_repository import (
     SQLAlchemyProductRepository,
 )
 
-
 router = APIRouter(prefix="/api/product", tags=["Product"])
 
 
@@ -46,36 +93,103 @@ class BaseSingletonUseCase:
         if cls._instance is None:
             connection_instance = SingletonSqlAlchemyConnection.get_instance()
             repo = SQLAlchemyProductRepository(connection_instance)
-            cls._instance = cls(repo)
+            cls._instance = cls(IndexedProductRepository(repo, product_search_index))
 
         return cls._instance
 
 
 class InventorySingletonUseCase:
     _instance = None
-    TOPIC_NAME = "inventory"
+    TOPIC_NAME = INVENTORY_TOPIC
+    success_status_code = 200
 
     def __init__(self, repo, broker_repo):
         self.repo = repo
         self.broker_repo = broker_repo
         self.use_case = ProductSendInventoryUseCase(self.broker_repo, self.repo)
+        self.batch_use_case = ProductSendInventoryBatchUseCase(
+            self.broker_repo, self.repo
+        )
 
     @classmethod
     async def factory_instance(cls) -> Self:
         if cls._instance is None:
             connection_instance = SingletonSqlAlchemyConnection.get_instance()
-            repo = SQLAlchemyProductRepository(connection_instance)
-            con = await SingletonAMQPConnection.get_instance()
-            broker_repository = AmqpInventoryRepository(con, cls.TOPIC_NAME)
+            repo = SQLAlchemyProductRepository(
+                connection_instance, read_from_replicas=True
+            )
+            broker_repository = await setup_inventory_publisher(cls.TOPIC_NAME)
+            cls.success_status_code = 202 if publishes_through_buffer() else 200
             cls._instance = cls(repo, broker_repository)
 
         return cls._instance
 
+    @classmethod
+    async def flush(cls, timeout: float) -> int:
+        if cls._instance is None:
+            return 0
+        return await cls._instance.broker_repo.flush(timeout)
+
 
 class AdaptCreateUseCase(ProductCreateUseCase, BaseSingletonUseCase): ...
 
 
-class AdaptGetUseCase(ProductGetUseCase, BaseSingletonUseCase): ...
+class AdaptGetUseCase(ProductGetUseCase, BaseSingletonUseCase):
+    @classmethod
+    def factory_instance(cls) -> Self:
+        if cls._instance is None:
+            connection_instance = SingletonSqlAlchemyConnection.get_instance()
+            repo = SQLAlchemyProductRepository(
+                connection_instance, read_from_replicas=True
+            )
+            cls._instance = cls(SingleFlightProductRepository(repo))
+
+        return cls._instance
+
+
+class AdaptGetVersionUseCase(ProductGetVersionUseCase, BaseSingletonUseCase):
+    @classmethod
+    def factory_instance(cls) -> Self:
+        if cls._instance is None:
+            connection_instance = SingletonSqlAlchemyConnection.get_instance()
+            cls._instance = cls(
+                SQLAlchemyProductRepository(
+                    connection_instance, read_from_replicas=True
+                )
+            )
+
+        return cls._instance
+
+
+class AdaptLookupUseCase(ProductLookupUseCase, BaseSingletonUseCase):
+    @classmethod
+    def factory_instance(cls) -> Self:
+        if cls._instance is None:
+            cls._instance = cls(AdaptGetUseCase.factory_instance().repository)
+
+        return cls._instance
+
+
+class AdaptSearchUseCase(ProductSearchUseCase):
+    _instance = None
+
+    @classmethod
+    def factory_instance(cls) -> Self:
+        if cls._instance is None:
+            cls._instance = cls(product_search_index)
+
+        return cls._instance
+
+
+class AdaptSupplierValuationUseCase(ProductSupplierValuationUseCase):
+    _instance = None
+
+    @classmethod
+    def factory_instance(cls) -> Self:
+        if cls._instance is None:
+            cls._instance = cls(SupplierValuationCache.get_instance())
+
+        return cls._instance
 
 
 class AdaptUpdateUseCase(ProductUpdateUseCase, BaseSingletonUseCase): ...
@@ -84,6 +198,27 @@ class AdaptUpdateUseCase(ProductUpdateUseCase, BaseSingletonUseCase): ...
 class AdaptDeleteUseCase(ProductDeleteUseCase, BaseSingletonUseCase): ...
 
 
+class AdaptBulkDeleteUseCase(ProductBulkDeleteUseCase, BaseSingletonUseCase):
+    @classmethod
+    def factory_instance(cls) -> Self:
+        if cls._instance is None:
+            connection_instance = SingletonSqlAlchemyConnection.get_instance()
+            repo = SQLAlchemyProductRepository(connection_instance)
+            cls._instance = cls(
+                IndexedProductRepository(repo, product_search_index),
+                chunk_size=config(
+                    "PRODUCT_BULK_DELETE_CHUNK_SIZE", default=500, cast=int
+                ),
+            )
+
+        return cls._instance
+
+
+class AdaptInventoryShardsUseCase(
+    ProductInventoryShardsUseCase, BaseSingletonUseCase
+): ...
+
+
 def factory_singleton_product_create_use_case() -> ProductCreateUseCase:
     return AdaptCreateUseCase.factory_instance()
 
@@ -92,6 +227,24 @@ def factory_singleton_product_get_use_case() -> ProductGetUseCase:
     return AdaptGetUseCase.factory_instance()
 
 
+def factory_singleton_product_get_version_use_case() -> ProductGetVersionUseCase:
+    return AdaptGetVersionUseCase.factory_instance()
+
+
+def factory_singleton_product_lookup_use_case() -> ProductLookupUseCase:
+    return AdaptLookupUseCase.factory_instance()
+
+
+def factory_singleton_product_search_use_case() -> ProductSearchUseCase:
+    return AdaptSearchUseCase.factory_instance()
+
+
+def factory_singleton_product_supplier_valuation_use_case() -> (
+    ProductSupplierValuationUseCase
+):
+    return AdaptSupplierValuationUseCase.factory_instance()
+
+
 def factory_singleton_product_update_use_case() -> ProductUpdateUseCase:
     return AdaptUpdateUseCase.factory_instance()
 
@@ -100,19 +253,38 @@ def factory_singleton_product_delete_use_case() -> ProductDeleteUseCase:
     return AdaptDeleteUseCase.factory_instance()
 
 
+def factory_singleton_product_bulk_delete_use_case() -> ProductBulkDeleteUseCase:
+    return AdaptBulkDeleteUseCase.factory_instance()
+
+
+def factory_singleton_product_inventory_shards_use_case() -> (
+    ProductInventoryShardsUseCase
+):
+    return AdaptInventoryShardsUseCase.factory_instance()
+
+
 async def factory_singleton_inventory_use_case() -> ProductSendInventoryUseCase:
     singleton_instance = await InventorySingletonUseCase.factory_instance()
     return singleton_instance.use_case
 
 
+async def factory_singleton_inventory_batch_use_case() -> (
+    ProductSendInventoryBatchUseCase
+):
+    singleton_instance = await InventorySingletonUseCase.factory_instance()
+    return singleton_instance.batch_use_case
+
+
 def return_200_if_success(res):
     return 200 if res.success else 400
 
 
+def return_accepted_if_success(res):
+    return InventorySingletonUseCase.success_status_code if res.success else 400
+
+
 @router.post(
-    "/",
-    response_model=OutputProductCreateDTO,
-    summary="Criar um novo produto"
+    "/", response_model=OutputProductCreateDTO, summary="Criar um novo produto"
 )
 async def create_product(
     input_dto: InputProductCreateDTO,
@@ -192,7 +364,11 @@ async def get_product(
     code: str,
     supplier: str,
     expiration_date: datetime,
+    request: Request,
     use_case: ProductGetUseCase = Depends(factory_singleton_product_get_use_case),
+    version_use_case: ProductGetVersionUseCase = Depends(
+        factory_singleton_product_get_version_use_case
+    ),
 ) -> ORJSONResponse:
     """
     Obtém informações sobre um produto com base no código, fornecedor e data de validade fornecidos.
@@ -202,8 +378,16 @@ async def get_product(
     - **supplier**: Fornecedor do produto.
     - **expiration_date**: Data de validade do produto.
 
+    ## Cabeçalhos Condicionais:
+    - **If-None-Match**: ETag recebido em uma resposta anterior. Tem prioridade sobre `If-Modified-Since`.
+    - **If-Modified-Since**: Valor de `Last-Modified` recebido em uma resposta anterior.
+
+    Quando um desses cabeçalhos é enviado, a API consulta apenas a versão do produto (id, data de
+    atualização e estoque) e responde **304** sem corpo se o produto não mudou.
+
     ## Respostas:
-    - **200 OK**: Produto encontrado com sucesso. Retorna um objeto `OutputProductGetDTO` com detalhes do produto.
+    - **200 OK**: Produto encontrado com sucesso. Retorna um objeto `OutputProductGetDTO` com detalhes do produto e os cabeçalhos `ETag` e `Last-Modified`.
+    - **304 Not Modified**: O produto não mudou desde a versão informada nos cabeçalhos condicionais.
     - **404 Not Found**: Produto não encontrado com os critérios fornecidos.
     - **500 Internal Server Error**: Ocorreu um erro interno ao tentar obter informações do produto.
 
@@ -249,8 +433,220 @@ async def get_product(
     input_dto = InputProductGetDTO(
         code=code, supplier=supplier, expiration_date=expiration_date
     )
+    if is_conditional(request.headers):
+        version = await version_use_case.execute(input_dto)
+        if version.success and is_not_modified(request.headers, version.version):
+            return Response(status_code=304, headers=validator_headers(version.version))
+
     res = await use_case.execute(input_dto)
-    return ORJSONResponse(content=res.json(), status_code=return_200_if_success(res))
+    headers = validator_headers(version_of(res.product)) if res.success else None
+    return ORJSONResponse(
+        content=res.json(), status_code=return_200_if_success(res), headers=headers
+    )
+
+
+@router.get(
+    "/search",
+    response_model=OutputProductSearchDTO,
+    summary="Buscar produtos por título e descrição",
+)
+async def search_products(
+    query: str = Query(min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=MAX_SEARCH_PAGE_SIZE),
+    use_case: ProductSearchUseCase = Depends(factory_singleton_product_search_use_case),
+) -> ORJSONResponse:
+    """
+    Busca produtos pelas palavras do título e da descrição, usando um índice invertido mantido em memória.
+
+    A busca ignora acentos e maiúsculas ("cafe" encontra "Café"), e cada palavra da consulta também
+    encontra palavras que começam com ela ("choc" encontra "Chocolate"). Todas as palavras da consulta
+    precisam aparecer no produto. Palavras do título pesam mais que as da descrição, e correspondências
+    exatas pesam mais que correspondências por prefixo.
+
+    ## Parâmetros:
+    - **query**: Texto da busca.
+    - **page**: Página desejada, começando em 1.
+    - **page_size**: Quantidade de produtos por página (máximo 100).
+
+    ## Respostas:
+    - **200 OK**: Busca realizada. Retorna um objeto `OutputProductSearchDTO` com os produtos da página e o total encontrado.
+    - **422 Unprocessable Entity**: Parâmetros inválidos.
+
+    ## Modelo de Dados de Saída:
+    - **OutputProductSearchDTO**: Contém os produtos encontrados, ordenados por relevância.
+
+    ### Exemplo de Dados de Entrada:
+    - **query**: "cafe torr"
+    - **page**: 1
+    - **page_size**: 20
+
+    ### Exemplo de Dados de Saída:
+    ```json
+    {
+        "success": true,
+        "products": [
+            {
+                "title": "Café Torrado",
+                "description": "Café torrado e moído",
+                "code": "123456",
+                "supplier": "Fornecedor A",
+                "inventory_quantity": 100,
+                "buy_price": 10.5,
+                "sell_price": 15.0,
+                "weight_in_kilograms": 0.5,
+                "expiration_date": "2024-12-31T23:59:59"
+            }
+        ],
+        "total": 1,
+        "page": 1,
+        "page_size": 20,
+        "msg": null
+    }
+    ```
+    """
+    input_dto = InputProductSearchDTO(query=query, page=page, page_size=page_size)
+    res = await use_case.execute(input_dto)
+    return ORJSONResponse(
+        content=res.model_dump_json(), status_code=return_200_if_success(res)
+    )
+
+
+@router.post(
+    "/lookup",
+    response_model=OutputProductLookupDTO,
+    summary="Consultar vários produtos de uma vez",
+)
+async def lookup_products(
+    input_dto: InputProductLookupDTO,
+    use_case: ProductLookupUseCase = Depends(factory_singleton_product_lookup_use_case),
+) -> ORJSONResponse:
+    """
+    Consulta vários produtos em uma única requisição, com uma única consulta ao banco.
+
+    Indicada para carrinhos e páginas de pedido, que precisariam de uma chamada `GET /api/product/` por
+    produto. Chaves que já estão sendo consultadas por outra requisição aproveitam essa consulta, e as
+    demais são buscadas juntas. A leitura pode ser feita em uma réplica, e os produtos não encontrados
+    nela são confirmados no primário.
+
+    ## Corpo da Requisição (JSON):
+    - **keys**: Lista (até 200) de chaves `code`, `supplier` e `expiration_date`.
+
+    ## Respostas:
+    - **200 OK**: Consulta realizada. Retorna um objeto `OutputProductLookupDTO` com um resultado por chave,
+      na mesma ordem da requisição. Produtos inexistentes vêm com `found` igual a `false` e `product` nulo.
+    - **422 Unprocessable Entity**: Lista vazia, acima do limite ou com chaves inválidas.
+
+    ### Exemplo de Corpo da Requisição:
+    ```json
+    {
+        "keys": [
+            {"code": "123456", "supplier": "Fornecedor A", "expiration_date": "2024-12-31T23:59:59"},
+            {"code": "999999", "supplier": "Fornecedor A", "expiration_date": "2024-12-31T23:59:59"}
+        ]
+    }
+    ```
+
+    ### Exemplo de Resposta:
+    ```json
+    {
+        "success": true,
+        "results": [
+            {
+                "code": "123456",
+                "supplier": "Fornecedor A",
+                "expiration_date": "2024-12-31T23:59:59",
+                "found": true,
+                "product": {
+                    "title": "Café Torrado",
+                    "description": "Café torrado e moído",
+                    "code": "123456",
+                    "supplier": "Fornecedor A",
+                    "inventory_quantity": 100,
+                    "buy_price": 10.5,
+                    "sell_price": 15.0,
+                    "weight_in_kilograms": 0.5,
+                    "expiration_date": "2024-12-31T23:59:59"
+                }
+            },
+            {
+                "code": "999999",
+                "supplier": "Fornecedor A",
+                "expiration_date": "2024-12-31T23:59:59",
+                "found": false,
+                "product": null
+            }
+        ],
+        "msg": null
+    }
+    ```
+    """
+    res = await use_case.execute(input_dto)
+    return ORJSONResponse(
+        content=res.model_dump_json(), status_code=return_200_if_success(res)
+    )
+
+
+@router.get(
+    "/valuation",
+    response_model=OutputProductSupplierValuationDTO,
+    summary="Valor do estoque por fornecedor",
+)
+async def supplier_valuation(
+    supplier: Optional[str] = Query(None, min_length=1),
+    use_case: ProductSupplierValuationUseCase = Depends(
+        factory_singleton_product_supplier_valuation_use_case
+    ),
+) -> ORJSONResponse:
+    """
+    Retorna o valor do estoque de cada fornecedor, calculado no banco com `GROUP BY`.
+
+    O resultado fica em cache em cada processo da API. Uma tarefa periódica
+    (**`SUPPLIER_VALUATION_POLL_INTERVAL`**, padrão `1` segundo) procura produtos alterados (inventário,
+    preços, cadastro) e marca apenas os fornecedores afetados para recálculo. Remoções não aparecem
+    nessa busca, então o cache inteiro é recalculado a cada **`SUPPLIER_VALUATION_TTL`** segundos
+    (padrão `60`).
+
+    ## Parâmetros:
+    - **supplier**: (Opcional) Retorna apenas este fornecedor.
+
+    ## Respostas:
+    - **200 OK**: Retorna um objeto `OutputProductSupplierValuationDTO` com um item por fornecedor,
+      ordenados pelo nome.
+    - **400 Bad Request**: O fornecedor informado não tem produtos.
+
+    ## Campos de cada fornecedor:
+    - **products**: Quantidade de produtos cadastrados.
+    - **inventory_quantity**: Unidades em estoque.
+    - **stock_value**: Soma de `inventory_quantity * buy_price`.
+    - **potential_revenue**: Soma de `inventory_quantity * sell_price`.
+    - **margin**: `potential_revenue - stock_value`.
+    - **weight_in_kilograms**: Peso total do estoque.
+
+    ### Exemplo de Resposta:
+    ```json
+    {
+        "success": true,
+        "valuations": [
+            {
+                "supplier": "Fornecedor A",
+                "products": 2,
+                "inventory_quantity": 150,
+                "stock_value": 1575.0,
+                "potential_revenue": 2250.0,
+                "margin": 675.0,
+                "weight_in_kilograms": 75.0
+            }
+        ],
+        "msg": null
+    }
+    ```
+    """
+    input_dto = InputProductSupplierValuationDTO(supplier=supplier)
+    res = await use_case.execute(input_dto)
+    return ORJSONResponse(
+        content=res.model_dump_json(), status_code=return_200_if_success(res)
+    )
 
 
 @router.put(
@@ -258,6 +654,11 @@ async def get_product(
     response_model=OutputProductUpdateDTO,
     summary="Atualizar informações de um produto",
 )
+@router.patch(
+    "/",
+    response_model=OutputProductUpdateDTO,
+    summary="Atualizar parcialmente as informações de um produto",
+)
 async def update_product(
     input_dto: InputProductUpdateDTO,
     use_case: ProductUpdateUseCase = Depends(factory_singleton_product_update_use_case),
@@ -275,11 +676,17 @@ async def update_product(
         - **buy_price**: Preço de compra do produto.
         - **sell_price**: Preço de venda do produto.
         - **weight_in_kilograms**: Peso em quilogramas do produto.
+    - **version** (opcional): Versão do produto lida pelo cliente. Se o produto estiver em outra versão, a atualização é recusada com **409**.
+
+    Apenas os campos enviados em `update` são alterados, em um único `UPDATE ... RETURNING`. Campos
+    enviados com `0` ou `""` são gravados; campos ausentes ou `null` são mantidos. `PUT` e `PATCH` têm o
+    mesmo comportamento.
 
     ## Respostas:
     - **200 OK**: Informações do produto atualizadas com sucesso. Retorna um objeto `OutputProductUpdateDTO` com detalhes do produto atualizado.
     - **404 Not Found**: Produto não encontrado com os critérios fornecidos.
     - **400 Bad Request**: Solicitação inválida. Retorna uma mensagem informando que a solicitação não contém informações para atualização ou nenhum campo válido para atualização foi fornecido.
+    - **409 Conflict**: O produto foi alterado por outra requisição. Leia o produto novamente e repita a atualização.
     - **500 Internal Server Error**: Ocorreu um erro interno ao tentar atualizar as informações do produto.
 
     ## Modelo de Dados de Entrada:
@@ -334,11 +741,7 @@ async def update_product(
     return ORJSONResponse(content=res.json(), status_code=return_200_if_success(res))
 
 
-@router.delete(
-    "/",
-    response_model=OutputProductDeleteDTO,
-    summary="Remover um produto"
-)
+@router.delete("/", response_model=OutputProductDeleteDTO, summary="Remover um produto")
 async def delete_product(
     input_dto: InputProductDeleteDTO,
     use_case: ProductDeleteUseCase = Depends(factory_singleton_product_delete_use_case),
@@ -390,15 +793,56 @@ async def delete_product(
     }
     ```
 
-    ### Exemplo de Resposta (Erro - Produto Não Removido):
+    """
+    res = await use_case.execute(input_dto)
+    return ORJSONResponse(content=res.json(), status_code=return_200_if_success(res))
+
+
+@router.post(
+    "/delete/batch",
+    response_model=OutputProductBulkDeleteDTO,
+    summary="Remover vários produtos",
+)
+async def bulk_delete_products(
+    input_dto: InputProductBulkDeleteDTO,
+    use_case: ProductBulkDeleteUseCase = Depends(
+        factory_singleton_product_bulk_delete_use_case
+    ),
+) -> ORJSONResponse:
+    """
+    Remove vários produtos de uma vez, por uma lista de chaves ou por um filtro.
+
+    A remoção é feita em lotes de **`PRODUCT_BULK_DELETE_CHUNK_SIZE`** produtos (padrão `500`), cada lote
+    na sua própria transação, para que limpezas grandes não segurem locks por muito tempo. Produtos com
+    compras registradas não são removidos, e produtos bloqueados por outra transação são ignorados.
+
+    ## Corpo da Requisição (JSON):
+    - **keys**: Lista (até 1000) de chaves `code`, `supplier` e `expiration_date` dos produtos a remover.
+    - **supplier**: Remove os produtos deste fornecedor.
+    - **expired_before**: Remove os produtos com data de validade anterior a esta data.
+
+    Envie `keys` **ou** um filtro (`supplier` e/ou `expired_before`), nunca os dois.
+
+    ## Respostas:
+    - **200 OK**: Remoção concluída. Retorna um objeto `OutputProductBulkDeleteDTO` com a quantidade de produtos removidos.
+    - **422 Unprocessable Entity**: Nenhum critério, ou chaves e filtro ao mesmo tempo.
+
+    ### Exemplo de Corpo da Requisição:
     ```json
     {
-        "success": false,
-        "product_id": null,
-        "msg": "product not deleted"
+        "supplier": "Fornecedor A",
+        "expired_before": "2024-01-01T00:00:00"
     }
     ```
 
+    ### Exemplo de Resposta:
+    ```json
+    {
+        "success": true,
+        "deleted": 1520,
+        "msg": null
+    }
+    ```
     """
     res = await use_case.execute(input_dto)
     return ORJSONResponse(content=res.json(), status_code=return_200_if_success(res))
@@ -426,11 +870,16 @@ async def delete_product(
     - **supplier**: Fornecedor do produto.
     - **expiration_date**: Data de validade do produto.
     - **action**: Ação a ser executada no inventário (pode ser 'add' ou 'remove').
+    - **quantity**: Quantidade de unidades da ação (padrão 1). Sem `action`, o sinal da quantidade define a operação.
+    - **lines**: Lista opcional (até 1000) de itens (`code`, `supplier`, `expiration_date`, `quantity` com sinal) para movimentar vários produtos em um único evento.
+    - **event_id**: Identificador opcional (até 64 caracteres) do evento. Reenvios com o mesmo identificador são aplicados uma única vez; sem ele, um identificador é gerado na publicação.
 
     ## Respostas:
     - **200 OK**: Informações de inventário enviadas com sucesso para processamento.
+    - **202 Accepted**: Com `INVENTORY_PUBLISH_MODE=buffered`, o evento foi aceito e será publicado em segundo plano.
     - **404 Not Found**: Produto não encontrado com os critérios fornecidos.
     - **400 Bad Request**: Solicitação inválida. Retorna uma mensagem informando que o produto não existe.
+    - **503 Service Unavailable**: O buffer de publicação está cheio (política `reject`). Tente novamente após o tempo indicado em `Retry-After`.
     - **500 Internal Server Error**: Ocorreu um erro interno ao tentar enviar as informações de inventário para processamento.
 
     ## Modelo de Dados de Entrada:
@@ -445,7 +894,18 @@ async def delete_product(
         "code": "123456",
         "supplier": "Fornecedor A",
         "expiration_date": "2024-12-31T23:59:59",
-        "action": "add"
+        "action": "add",
+        "quantity": 500
+    }
+    ```
+
+    ### Exemplo de Corpo da Requisição (Vários Produtos):
+    ```json
+    {
+        "lines": [
+            {"code": "123456", "supplier": "Fornecedor A", "expiration_date": "2024-12-31T23:59:59", "quantity": 500},
+            {"code": "654321", "supplier": "Fornecedor A", "expiration_date": "2024-12-31T23:59:59", "quantity": -20}
+        ]
     }
     ```
 
@@ -465,6 +925,125 @@ async def delete_product(
     }
     ```
 
+    """
+    res = await use_case.execute(input_dto)
+    return ORJSONResponse(
+        content=res.json(), status_code=return_accepted_if_success(res)
+    )
+
+
+@router.post(
+    "/send/inventory/batch",
+    response_model=OutputProductSendInventoryBatchDTO,
+    summary="Enviar informações de inventário de vários produtos para processamento",
+)
+async def send_inventory_batch(
+    input_dto: InputProductSendInventoryBatchDTO,
+    use_case: ProductSendInventoryBatchUseCase = Depends(
+        factory_singleton_inventory_batch_use_case
+    ),
+) -> ORJSONResponse:
+    """
+    Envia em lote informações de inventário para processamento em uma fila de mensagens.
+
+    A existência de todos os produtos é validada em uma única consulta, evitando uma requisição HTTP por
+    produto. Os itens válidos são agrupados, na ordem da requisição, em poucas mensagens; dentro de cada
+    mensagem, cada item é um evento com seu próprio `event_id` e é aplicado de forma independente: um item
+    sem estoque suficiente não impede a aplicação dos demais.
+
+    Envie um `event_id` único em cada item para poder repetir a requisição com segurança depois de uma
+    falha: os itens que já foram publicados são reconhecidos pelo id e não são aplicados de novo.
+
+    ## Corpo da Requisição (JSON):
+    - **items**: Lista (de 1 a 1000) com os mesmos campos aceitos por `/send/inventory`. Os `event_id`
+      informados não podem se repetir dentro do lote.
+
+    ## Respostas:
+    - **200 OK**: Ao menos um item foi enviado para processamento. O resultado de cada item está em `results`, na mesma ordem da requisição.
+    - **202 Accepted**: Com `INVENTORY_PUBLISH_MODE=buffered`, os itens válidos foram aceitos e serão publicados em segundo plano.
+    - **400 Bad Request**: Nenhum item foi enviado.
+    - **503 Service Unavailable**: O buffer de publicação está cheio (política `reject`). Tente novamente após o tempo indicado em `Retry-After`.
+
+    ## Modelo de Dados de Entrada:
+    - **InputProductSendInventoryBatchDTO**: Contém a lista de itens de inventário.
+
+    ## Modelo de Dados de Saída:
+    - **OutputProductSendInventoryBatchDTO**: Contém o resultado de cada item.
+
+    ### Exemplo de Corpo da Requisição:
+    ```json
+    {
+        "items": [
+            {"code": "123456", "supplier": "Fornecedor A", "expiration_date": "2024-12-31T23:59:59", "action": "a", "quantity": 3},
+            {"code": "999999", "supplier": "Fornecedor A", "expiration_date": "2024-12-31T23:59:59", "action": "r"}
+        ]
+    }
+    ```
+
+    ### Exemplo de Resposta:
+    ```json
+    {
+        "success": true,
+        "results": [
+            {"success": true, "message": "sent event"},
+            {"success": false, "message": "product not exists"}
+        ]
+    }
+    ```
+    """
+    res = await use_case.execute(input_dto)
+    return ORJSONResponse(
+        content=res.json(), status_code=return_accepted_if_success(res)
+    )
+
+
+@router.put(
+    "/inventory/shards",
+    response_model=OutputProductInventoryShardsDTO,
+    summary="Distribuir o inventário de um produto em contadores",
+)
+async def set_inventory_shards(
+    input_dto: InputProductInventoryShardsDTO,
+    use_case: ProductInventoryShardsUseCase = Depends(
+        factory_singleton_product_inventory_shards_use_case
+    ),
+) -> ORJSONResponse:
+    """
+    Ativa (ou desativa) o modo de contadores distribuídos para o inventário de um produto.
+
+    Produtos com muitas atualizações simultâneas (por exemplo, em promoções) disputam o mesmo
+    lock da linha do produto. Com `shards` maior que zero, as entradas de inventário passam a ser
+    gravadas em um de `shards` contadores escolhido aleatoriamente e as saídas são retiradas de um
+    contador com saldo suficiente que não esteja em uso. A leitura do produto soma os contadores e uma
+    tarefa periódica redistribui o saldo igualmente entre eles.
+
+    ## Corpo da Requisição (JSON):
+    - **code**: Código do produto.
+    - **supplier**: Fornecedor do produto.
+    - **expiration_date**: Data de validade do produto.
+    - **shards**: Quantidade de contadores (de 0 a 64). `0` desativa o modo e consolida os contadores existentes.
+
+    ## Respostas:
+    - **200 OK**: Modo de contadores atualizado.
+    - **400 Bad Request**: Produto não encontrado.
+
+    ### Exemplo de Corpo da Requisição:
+    ```json
+    {
+        "code": "123456",
+        "supplier": "Fornecedor A",
+        "expiration_date": "2024-12-31T23:59:59",
+        "shards": 8
+    }
+    ```
+
+    ### Exemplo de Resposta (Sucesso):
+    ```json
+    {
+        "success": true,
+        "msg": null
+    }
+    ```
     """
     res = await use_case.execute(input_dto)
     return ORJSONResponse(content=res.json(), status_code=return_200_if_success(res))
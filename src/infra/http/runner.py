@@ -0,0 +1,32 @@
+import os
+
+import uvicorn
+from decouple import config
+
+from src.infra.resources import resources_per_process
+
+
+def main():
+    workers = config("WEB_CONCURRENCY", default=os.cpu_count() or 1, cast=int)
+    resources_per_process(
+        postgres_connection_budget=config(
+            "POSTGRES_CONNECTION_BUDGET", default=5 * workers, cast=int
+        ),
+        broker_channel_budget=config(
+            "BROKER_CHANNEL_BUDGET", default=10 * workers, cast=int
+        ),
+        processes=workers,
+    ).export()
+
+    uvicorn.run(
+        "main:app",
+        host=config("HTTP_HOST", default="0.0.0.0"),
+        port=config("HTTP_PORT", default=8080, cast=int),
+        workers=workers,
+        loop=config("UVICORN_LOOP", default="uvloop"),
+        http=config("UVICORN_HTTP", default="httptools"),
+        proxy_headers=True,
+        timeout_graceful_shutdown=config(
+            "HTTP_GRACEFUL_SHUTDOWN_TIMEOUT", default=15, cast=int
+        ),
+    )
@@ -1,23 +1,43 @@
-import asyncio
-from typing import List
+import logging
+from typing import List, Optional
 
-from fastapi import FastAPI
+from decouple import config
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from src.domain.use_cases.product_inventory_processor import (
-    InputInventoryProcessorDTO,
-    InventoryProcessorUseCase,
-)
+from src.domain.exceptions import ConcurrentUpdateError, PublishBufferFullError
 from src.infra.amqp.connection import SingletonAMQPConnection
 from src.infra.amqp.consumer import AmqpConsumer
+from src.infra.amqp.inventory_consumer import (
+    setup_inventory_consumer,
+    setup_inventory_maintenance,
+)
+from src.infra.http.admission import (
+    AdmissionControlMiddleware,
+    AimdLimit,
+    ConcurrencyLimiter,
+)
 
 from src.infra.http.routers.health_check_router import router as health_check_router
-from src.infra.http.routers.product_router import router as product_routers
+from src.infra.http.routers.metrics_router import router as metrics_router
+from src.infra.http.routers.product_router import (
+    InventorySingletonUseCase,
+    router as product_routers,
+)
+from src.infra.search.product_index import setup_product_search
 from src.infra.sqlalchemy import models
+from src.infra.scheduler import PeriodicTask
+from src.infra.supplier_valuation import setup_supplier_valuation
 from src.infra.sqlalchemy.connection import SingletonSqlAlchemyConnection
-from src.infra.sqlalchemy.repositories.product_repository import (
-    SQLAlchemyProductRepository,
-)
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_ROUTES = [
+    ("/api/product/send/inventory", "inventory"),
+    ("/api/product", "product"),
+]
+ADMISSION_BYPASS_PREFIXES = ["/api/health", "/api/metrics"]
 
 ALLOWED_HOSTS = [
     "http://localhost",
@@ -27,49 +47,125 @@ ALLOWED_HOSTS = [
 ]
 
 
-def setup_and_get_app():
+def build_admission_limiters():
+    limiters = {}
+    for group in ("inventory", "product", "default"):
+        prefix = f"ADMISSION_{group.upper()}"
+        limiters[group] = ConcurrencyLimiter(
+            AimdLimit(
+                initial=config(f"{prefix}_INITIAL_LIMIT", default=20, cast=float),
+                min_limit=config("ADMISSION_MIN_LIMIT", default=2, cast=float),
+                max_limit=config(f"{prefix}_MAX_LIMIT", default=200, cast=float),
+            ),
+            queue_timeout=config("ADMISSION_QUEUE_TIMEOUT", default=0.05, cast=float),
+            max_queue=config("ADMISSION_MAX_QUEUE", default=100, cast=int),
+        )
+    return limiters
+
+
+def setup_and_get_app(consume_inventory: Optional[bool] = None):
+    if consume_inventory is None:
+        consume_inventory = config("HTTP_CONSUME_INVENTORY", default=True, cast=bool)
+
     app = FastAPI(
         title="Maitha Test",
     )
 
     app.include_router(health_check_router)
     app.include_router(product_routers)
+    app.include_router(metrics_router)
+
+    @app.exception_handler(PublishBufferFullError)
+    async def publish_buffer_full(request: Request, error: PublishBufferFullError):
+        return ORJSONResponse(
+            content={"success": False, "message": "inventory publish buffer full"},
+            status_code=503,
+            headers={
+                "Retry-After": config("INVENTORY_BUFFER_RETRY_AFTER", default="1")
+            },
+        )
+
+    @app.exception_handler(ConcurrentUpdateError)
+    async def concurrent_update(request: Request, error: ConcurrentUpdateError):
+        return ORJSONResponse(
+            content={
+                "success": False,
+                "message": "product was updated concurrently, read it and retry",
+            },
+            status_code=409,
+        )
+
+    if config("ADMISSION_CONTROL", default=True, cast=bool):
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            limiters=build_admission_limiters(),
+            routes=ADMISSION_ROUTES,
+            default_group="default",
+            bypass_prefixes=ADMISSION_BYPASS_PREFIXES,
+            retry_after=config("ADMISSION_RETRY_AFTER", default=1, cast=int),
+        )
 
     app.add_middleware(
         CORSMiddleware,
         allow_origins=ALLOWED_HOSTS,
         allow_credentials=True,
-        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
         allow_headers=["Authorization", "Content-Type"],
     )
 
-    features_to_stop_in_graceful_shutdown: List[asyncio.Future] = []
+    consumers_to_drain: List[AmqpConsumer] = []
+    periodic_tasks: List[PeriodicTask] = []
 
     @app.on_event("startup")
     async def setup_models():
         instance = SingletonSqlAlchemyConnection.get_instance()
-        async with instance.engine.begin() as conn:
-            await conn.run_sync(models.Base.metadata.create_all)
-
-        connection_instance = SingletonSqlAlchemyConnection.get_instance()
-        product_repository = SQLAlchemyProductRepository(connection_instance)
-        broker_connection = await SingletonAMQPConnection.get_instance()
-        consumer = AmqpConsumer(broker_connection)
-        consumer.subscribe_from_topic(
-            "inventory",
-            InventoryProcessorUseCase(product_repository),
-            InputInventoryProcessorDTO,
-        )
-        consumer = asyncio.ensure_future(consumer.run())
-        features_to_stop_in_graceful_shutdown.append(consumer)
-
-        @app.on_event("shutdown")
-        async def graceful_shutdown():
-            broker_connection = await SingletonAMQPConnection.get_instance()
-            await broker_connection.close()
-            map(
-                lambda feature: feature.cancel(),
-                features_to_stop_in_graceful_shutdown,
+        await models.create_all(instance.engine)
+
+        if instance.replicas.engines:
+            await instance.replicas.check_lag()
+            periodic_tasks.append(
+                PeriodicTask(
+                    "postgres-replica-lag",
+                    config(
+                        "POSTGRES_REPLICA_LAG_CHECK_INTERVAL", default=1.0, cast=float
+                    ),
+                    instance.replicas.check_lag,
+                )
             )
+            periodic_tasks[-1].start()
+
+        for task in await setup_product_search():
+            task.start()
+            periodic_tasks.append(task)
+
+        for task in await setup_supplier_valuation():
+            task.start()
+            periodic_tasks.append(task)
+
+        if not consume_inventory:
+            return
+
+        consumer = await setup_inventory_consumer()
+        await consumer.run()
+        consumers_to_drain.append(consumer)
+
+        for task in await setup_inventory_maintenance():
+            task.start()
+            periodic_tasks.append(task)
+
+    @app.on_event("shutdown")
+    async def graceful_shutdown():
+        drain_timeout = config("SHUTDOWN_DRAIN_TIMEOUT", default=20.0, cast=float)
+        for consumer in consumers_to_drain:
+            await consumer.stop(drain_timeout)
+        for task in periodic_tasks:
+            await task.stop()
+
+        not_flushed = await InventorySingletonUseCase.flush(drain_timeout)
+        if not_flushed:
+            logger.warning("%s inventory events were not published", not_flushed)
+
+        await SingletonAMQPConnection.close()
+        await SingletonSqlAlchemyConnection.get_instance().dispose()
 
     return app
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Dict, Tuple
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class Gauge:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._families: Dict[str, Tuple[str, str]] = {}
+        self._metrics: Dict[Tuple[str, Tuple], object] = {}
+
+    def counter(self, name: str, description: str, **labels) -> Counter:
+        return self._get_or_create(Counter, "counter", name, description, labels)
+
+    def gauge(self, name: str, description: str, **labels) -> Gauge:
+        return self._get_or_create(Gauge, "gauge", name, description, labels)
+
+    def _get_or_create(self, metric_class, kind, name, description, labels):
+        self._families.setdefault(name, (kind, description))
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            metric = self._metrics[key] = metric_class()
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for name, (kind, description) in self._families.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (metric_name, labels), metric in self._metrics.items():
+                if metric_name != name:
+                    continue
+                rendered_labels = ",".join(f'{key}="{value}"' for key, value in labels)
+                suffix = f"{{{rendered_labels}}}" if rendered_labels else ""
+                lines.append(f"{name}{suffix} {metric.value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+async def serve_metrics(host: str, port: int) -> asyncio.AbstractServer:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await reader.readuntil(b"\r\n\r\n")
+        body = registry.render().encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/plain; version=0.0.4\r\n"
+            + f"Content-Length: {len(body)}\r\n".encode()
+            + b"Connection: close\r\n\r\n"
+            + body
+        )
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, host, port)
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.infra.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+
+class ProductArchiver:
+    def __init__(
+        self,
+        repository,
+        retention: timedelta,
+        chunk_size: int = 500,
+        pause: float = 0.1,
+    ):
+        self.repository = repository
+        self.retention = retention
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self._products = registry.counter(
+            "products_archived_total", "Expired products moved to product_archive"
+        )
+        self._purchases = registry.counter(
+            "purchases_archived_total", "Purchases moved to purchase_archive"
+        )
+        self._chunks = registry.counter(
+            "product_archive_chunks_total", "Archival chunks committed"
+        )
+        self._throughput = registry.gauge(
+            "product_archive_products_per_second",
+            "Products archived per second during the last archival run",
+        )
+        self._last_run = registry.gauge(
+            "product_archive_last_run_seconds", "Duration of the last archival run"
+        )
+
+    async def run(self) -> int:
+        expired_before = datetime.now(timezone.utc) - self.retention
+        started = time.monotonic()
+        archived = 0
+        while True:
+            products, purchases = await self.repository.archive_expired(
+                expired_before, self.chunk_size
+            )
+            archived += products
+            self._products.inc(products)
+            self._purchases.inc(purchases)
+            self._chunks.inc()
+            if products < self.chunk_size:
+                break
+            await asyncio.sleep(self.pause)
+
+        elapsed = time.monotonic() - started
+        self._last_run.set(elapsed)
+        self._throughput.set(archived / elapsed if elapsed else 0)
+        if archived:
+            logger.info(
+                "archived %s products expired before %s in %.1fs",
+                archived,
+                expired_before.isoformat(),
+                elapsed,
+            )
+        return archived
@@ -0,0 +1,28 @@
+import os
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class ProcessResources:
+    postgres_pool_size: int
+    postgres_max_overflow: int
+    broker_channel_pool_size: int
+
+    def export(self):
+        os.environ["POSTGRES_POOL_SIZE"] = str(self.postgres_pool_size)
+        os.environ["POSTGRES_MAX_OVERFLOW"] = str(self.postgres_max_overflow)
+        os.environ["BROKER_CHANNEL_POOL_SIZE"] = str(self.broker_channel_pool_size)
+
+
+def split_budget(budget: int, processes: int) -> int:
+    return max(1, budget // max(1, processes))
+
+
+def resources_per_process(
+    postgres_connection_budget: int, broker_channel_budget: int, processes: int
+) -> ProcessResources:
+    return ProcessResources(
+        postgres_pool_size=split_budget(postgres_connection_budget, processes),
+        postgres_max_overflow=0,
+        broker_channel_pool_size=split_budget(broker_channel_budget, processes),
+    )
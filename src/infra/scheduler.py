@@ -0,0 +1,37 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    def __init__(
+        self, name: str, interval: float, callback: Callable[[], Awaitable[object]]
+    ):
+        self.name = name
+        self.interval = interval
+        self.callback = callback
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.callback()
+            except Exception:
+                logger.exception("periodic task %s failed", self.name)
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,315 @@
+import bisect
+import datetime
+import heapq
+import math
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from decouple import config
+
+from src.domain.contracts.repositories.product_search_repository import (
+    IProductSearchRepository,
+)
+from src.domain.entities.product import Product, ProductKey, ProductSearchPage
+from src.infra.metrics import registry
+from src.infra.scheduler import PeriodicTask
+from src.infra.sqlalchemy.connection import SingletonSqlAlchemyConnection
+from src.infra.sqlalchemy.models import make_product_id_from, make_product_id_from_base
+from src.infra.sqlalchemy.repositories.product_repository import (
+    SQLAlchemyProductRepository,
+)
+
+TITLE_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+PREFIX_MATCH_FACTOR = 0.5
+MIN_PREFIX_LENGTH = 2
+
+_WORD = re.compile(r"\w+")
+
+
+def fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    ).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD.findall(fold(text))
+
+
+def _modified_at(product: Product) -> datetime.datetime:
+    return product.updated_at or product.created_at
+
+
+class ProductSearchIndex(IProductSearchRepository):
+    def __init__(self):
+        self._products: Dict[str, Product] = {}
+        self._weights: Dict[str, Dict[str, float]] = {}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._vocabulary: List[str] = []
+        self._documents = registry.gauge(
+            "product_search_index_documents", "Products in the search index"
+        )
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    @staticmethod
+    def _weights_of(product: Product) -> Dict[str, float]:
+        weights: Dict[str, float] = {}
+        for token in tokenize(product.title):
+            weights[token] = weights.get(token, 0) + TITLE_WEIGHT
+        for token in tokenize(product.description):
+            weights[token] = weights.get(token, 0) + DESCRIPTION_WEIGHT
+        return weights
+
+    def upsert(self, product: Product):
+        product_id = make_product_id_from(product)
+        self._products[product_id] = product
+        weights = self._weights_of(product)
+        if self._weights.get(product_id) != weights:
+            self._unlink(product_id)
+            self._link(product_id, weights)
+        self._documents.set(len(self._products))
+
+    def remove(self, product_id: str):
+        self._products.pop(product_id, None)
+        self._unlink(product_id)
+        self._documents.set(len(self._products))
+
+    def replace_all(self, products: Iterable[Product]):
+        products_by_id: Dict[str, Product] = {}
+        weights_by_id: Dict[str, Dict[str, float]] = {}
+        postings: Dict[str, Dict[str, float]] = {}
+        for product in products:
+            product_id = make_product_id_from(product)
+            products_by_id[product_id] = product
+            weights_by_id[product_id] = weights = self._weights_of(product)
+            for token, weight in weights.items():
+                postings.setdefault(token, {})[product_id] = weight
+
+        self._products = products_by_id
+        self._weights = weights_by_id
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+        self._documents.set(len(self._products))
+
+    def _link(self, product_id: str, weights: Dict[str, float]):
+        self._weights[product_id] = weights
+        for token, weight in weights.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                bisect.insort(self._vocabulary, token)
+            posting[product_id] = weight
+
+    def _unlink(self, product_id: str):
+        for token in self._weights.pop(product_id, {}):
+            posting = self._postings[token]
+            del posting[product_id]
+            if not posting:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+
+    def _expand(self, token: str) -> Iterable[Tuple[str, float]]:
+        if token in self._postings:
+            yield token, 1.0
+        if len(token) < MIN_PREFIX_LENGTH:
+            return
+        position = bisect.bisect_right(self._vocabulary, token)
+        while position < len(self._vocabulary):
+            candidate = self._vocabulary[position]
+            if not candidate.startswith(token):
+                break
+            yield candidate, PREFIX_MATCH_FACTOR
+            position += 1
+
+    def _terms_for(self, token: str) -> List[Tuple[Dict[str, float], float]]:
+        return [
+            (
+                self._postings[term],
+                factor * math.log(1 + len(self._products) / len(self._postings[term])),
+            )
+            for term, factor in self._expand(token)
+        ]
+
+    async def search(self, query: str, offset: int, limit: int) -> ProductSearchPage:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return ProductSearchPage(products=[], total=0)
+
+        per_token = sorted(
+            (self._terms_for(token) for token in tokens),
+            key=lambda terms: sum(len(posting) for posting, _ in terms),
+        )
+
+        scores: Dict[str, float] = {}
+        for posting, boost in per_token[0]:
+            for product_id, weight in posting.items():
+                if weight * boost > scores.get(product_id, 0):
+                    scores[product_id] = weight * boost
+
+        for terms in per_token[1:]:
+            narrowed: Dict[str, float] = {}
+            for product_id, score in scores.items():
+                best = max(
+                    (posting.get(product_id, 0) * boost for posting, boost in terms),
+                    default=0,
+                )
+                if best:
+                    narrowed[product_id] = score + best
+            scores = narrowed
+
+        ranked = heapq.nsmallest(
+            offset + limit,
+            scores.items(),
+            key=lambda item: (-item[1], self._products[item[0]].title, item[0]),
+        )
+        return ProductSearchPage(
+            products=[self._products[product_id] for product_id, _ in ranked[offset:]],
+            total=len(scores),
+        )
+
+
+class ProductSearchFeed:
+    def __init__(
+        self,
+        index: ProductSearchIndex,
+        repository,
+        overlap: datetime.timedelta = datetime.timedelta(seconds=5),
+    ):
+        self.index = index
+        self.repository = repository
+        self.overlap = overlap
+        self.watermark: Optional[datetime.datetime] = None
+
+    def _advance(self, products: List[Product]):
+        for product in products:
+            modified_at = _modified_at(product)
+            if self.watermark is None or modified_at > self.watermark:
+                self.watermark = modified_at
+
+    async def rebuild(self):
+        products = await self.repository.list_modified_since(None)
+        self.index.replace_all(products)
+        self._advance(products)
+
+    async def poll(self) -> int:
+        if self.watermark is None:
+            await self.rebuild()
+            return len(self.index)
+
+        products = await self.repository.list_modified_since(
+            self.watermark - self.overlap
+        )
+        for product in products:
+            self.index.upsert(product)
+        self._advance(products)
+        return len(products)
+
+
+class IndexedProductRepository:
+    def __init__(self, repository, index: ProductSearchIndex):
+        self.repository = repository
+        self.index = index
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+    def _index(self, product: Optional[Product]) -> Optional[Product]:
+        if product is not None:
+            self.index.upsert(product)
+        return product
+
+    async def create(self, product: Product) -> Product | None:
+        return self._index(await self.repository.create(product))
+
+    async def update(self, product: Product) -> Product | None:
+        return self._index(await self.repository.update(product))
+
+    async def patch(
+        self,
+        code: str,
+        supplier: str,
+        expiration_date: datetime.datetime,
+        changes: Dict[str, Any],
+        version: Optional[int] = None,
+    ) -> Product | None:
+        return self._index(
+            await self.repository.patch(
+                code, supplier, expiration_date, changes, version=version
+            )
+        )
+
+    async def remove(
+        self, code: str, supplier: str, expiration_date: datetime.datetime
+    ) -> str | None:
+        removed = await self.repository.remove(code, supplier, expiration_date)
+        self.index.remove(make_product_id_from_base(code, supplier, expiration_date))
+        return removed
+
+    async def remove_many(
+        self, keys: List[ProductKey], chunk_size: int = 500
+    ) -> List[str]:
+        removed_ids = await self.repository.remove_many(keys, chunk_size)
+        for product_id in removed_ids:
+            self.index.remove(product_id)
+        return removed_ids
+
+    async def remove_matching(
+        self,
+        supplier: Optional[str] = None,
+        expired_before: Optional[datetime.datetime] = None,
+        chunk_size: int = 500,
+    ) -> List[str]:
+        removed_ids = await self.repository.remove_matching(
+            supplier, expired_before, chunk_size
+        )
+        for product_id in removed_ids:
+            self.index.remove(product_id)
+        return removed_ids
+
+    async def add_inventory_to(
+        self, code: str, supplier: str, expiration_date: datetime.datetime
+    ) -> Product | None:
+        return self._index(
+            await self.repository.add_inventory_to(code, supplier, expiration_date)
+        )
+
+    async def remove_inventory_from(
+        self, code: str, supplier: str, expiration_date: datetime.datetime
+    ) -> Product | None:
+        return self._index(
+            await self.repository.remove_inventory_from(code, supplier, expiration_date)
+        )
+
+
+product_search_index = ProductSearchIndex()
+
+
+async def setup_product_search() -> List[PeriodicTask]:
+    repository = SQLAlchemyProductRepository(
+        SingletonSqlAlchemyConnection.get_instance()
+    )
+    feed = ProductSearchFeed(
+        product_search_index,
+        repository,
+        overlap=datetime.timedelta(
+            seconds=config("PRODUCT_SEARCH_POLL_OVERLAP", default=5.0, cast=float)
+        ),
+    )
+    await feed.rebuild()
+    return [
+        PeriodicTask(
+            "product-search-poll",
+            config("PRODUCT_SEARCH_POLL_INTERVAL", default=1.0, cast=float),
+            feed.poll,
+        ),
+        PeriodicTask(
+            "product-search-rebuild",
+            config("PRODUCT_SEARCH_REBUILD_INTERVAL", default=300.0, cast=float),
+            feed.rebuild,
+        ),
+    ]
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional
+
+from src.domain.entities.product import Product, ProductKey
+from src.infra.metrics import registry
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._calls = registry.counter(
+            "single_flight_calls_total", "Calls made through single-flight", flight=name
+        )
+        self._coalesced = registry.counter(
+            "single_flight_coalesced_total",
+            "Calls that joined an in-flight call instead of starting one",
+            flight=name,
+        )
+        self._wait_seconds = registry.counter(
+            "single_flight_wait_seconds_total",
+            "Time spent waiting for in-flight calls",
+            flight=name,
+        )
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable]):
+        self._calls.inc()
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self._coalesced.inc()
+
+        started = time.monotonic()
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._wait_seconds.inc(time.monotonic() - started)
+
+    async def do_many(
+        self,
+        keys: List[Hashable],
+        call: Callable[[List[Hashable]], Awaitable[List]],
+    ) -> List:
+        self._calls.inc(len(keys))
+        tasks: Dict[Hashable, asyncio.Future] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            task = self._in_flight.get(key)
+            if task is None:
+                missing.append(key)
+            else:
+                self._coalesced.inc()
+                tasks[key] = task
+
+        if missing:
+            batch = asyncio.ensure_future(call(missing))
+            for position, key in enumerate(missing):
+                task = asyncio.ensure_future(self._pick(batch, position))
+                self._in_flight[key] = task
+                task.add_done_callback(lambda done, key=key: self._forget(key, done))
+                tasks[key] = task
+
+        started = time.monotonic()
+        try:
+            results = await asyncio.shield(asyncio.gather(*tasks.values()))
+        finally:
+            self._wait_seconds.inc(time.monotonic() - started)
+        results_by_key = dict(zip(tasks, results))
+        return [results_by_key[key] for key in keys]
+
+    @staticmethod
+    async def _pick(batch: asyncio.Future, position: int):
+        return (await batch)[position]
+
+    def _forget(self, key: Hashable, task: asyncio.Future):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()
+
+
+def _get_flight_key(key: ProductKey) -> Hashable:
+    return ("get_by_code_supplier_expiration", key)
+
+
+class SingleFlightProductRepository:
+    def __init__(self, repository, single_flight: Optional[SingleFlight] = None):
+        self.repository = repository
+        self.single_flight = single_flight or SingleFlight("product_get")
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+    async def get_by_code_supplier_expiration(
+        self, code: str, supplier: str, expiration_date: datetime
+    ) -> Optional[Product]:
+        return await self.single_flight.do(
+            _get_flight_key(ProductKey(code, supplier, expiration_date)),
+            lambda: self.repository.get_by_code_supplier_expiration(
+                code, supplier, expiration_date
+            ),
+        )
+
+    async def get_many(self, keys: List[ProductKey]) -> List[Optional[Product]]:
+        return await self.single_flight.do_many(
+            [_get_flight_key(key) for key in keys],
+            lambda flight_keys: self.repository.get_many(
+                [product_key for _, product_key in flight_keys]
+            ),
+        )
@@ -1,11 +1,24 @@
-from typing import Self
+import logging
+import os
+from typing import List, Optional, Self
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from decouple import config
+from decouple import Csv, config
 
+from src.infra.metrics import registry
 
-def _build_postgres_url_from_environments():
-    postgres_host = config("POSTGRES_HOST")
+logger = logging.getLogger(__name__)
+
+_REPLICA_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+def _build_postgres_url_from_environments(postgres_host: Optional[str] = None):
+    postgres_host = postgres_host or config("POSTGRES_HOST")
     postgres_user = config("POSTGRES_USER")
     postgres_password = config("POSTGRES_PASSWORD")
     postgres_db = config("POSTGRES_DB")
@@ -13,6 +26,69 @@ def _build_postgres_url_from_environments():
     return f"postgresql+asyncpg://{postgres_user}:{postgres_password}@{postgres_host}/{postgres_db}"
 
 
+def _create_engine(url: str):
+    return create_async_engine(
+        url,
+        echo=True,
+        future=True,
+        pool_size=config("POSTGRES_POOL_SIZE", default=5, cast=int),
+        max_overflow=config("POSTGRES_MAX_OVERFLOW", default=10, cast=int),
+    )
+
+
+def _create_session_factory(engine):
+    return sessionmaker(
+        autocommit=False, autoflush=False, bind=engine, class_=AsyncSession
+    )
+
+
+class ReplicaPool:
+    def __init__(self, engines: List, max_lag: float):
+        self.engines = engines
+        self.session_factories = [_create_session_factory(engine) for engine in engines]
+        self.max_lag = max_lag
+        self.lags: List[Optional[float]] = [None] * len(engines)
+        self._next = 0
+        self._lag_gauges = [
+            registry.gauge(
+                "postgres_replica_lag_seconds",
+                "Replay lag of each read replica, -1 when unreachable",
+                replica=str(index),
+            )
+            for index in range(len(engines))
+        ]
+
+    def healthy(self) -> List[int]:
+        return [
+            index
+            for index, lag in enumerate(self.lags)
+            if lag is not None and lag <= self.max_lag
+        ]
+
+    def next_session_factory(self) -> Optional[sessionmaker]:
+        healthy = self.healthy()
+        if not healthy:
+            return None
+        index = healthy[self._next % len(healthy)]
+        self._next += 1
+        return self.session_factories[index]
+
+    async def check_lag(self):
+        for index, engine in enumerate(self.engines):
+            try:
+                async with engine.connect() as connection:
+                    lag = float((await connection.execute(_REPLICA_LAG)).scalar_one())
+            except Exception:
+                logger.warning("read replica %s is unreachable", index, exc_info=True)
+                lag = None
+            self.lags[index] = lag
+            self._lag_gauges[index].set(-1 if lag is None else lag)
+
+    async def dispose(self):
+        for engine in self.engines:
+            await engine.dispose()
+
+
 class SingletonSqlAlchemyConnection:
     _instance = None
 
@@ -24,7 +100,40 @@ class SingletonSqlAlchemyConnection:
 
     def __init__(self):
         self.url = _build_postgres_url_from_environments()
-        self.engine = create_async_engine(self.url, echo=True, future=True)
-        self.async_session = sessionmaker(
-            autocommit=False, autoflush=False, bind=self.engine, class_=AsyncSession
+        self.engine = _create_engine(self.url)
+        self.async_session = _create_session_factory(self.engine)
+        self.replicas = ReplicaPool(
+            [
+                _create_engine(_build_postgres_url_from_environments(host))
+                for host in config("POSTGRES_REPLICA_HOSTS", default="", cast=Csv())
+            ],
+            max_lag=config("POSTGRES_REPLICA_MAX_LAG", default=1.0, cast=float),
         )
+        self._reads = {
+            target: registry.counter(
+                "postgres_reads_total", "Read sessions opened", target=target
+            )
+            for target in ("replica", "primary")
+        }
+
+    def read_session(self) -> sessionmaker:
+        session_factory = self.replicas.next_session_factory()
+        if session_factory is None:
+            self._reads["primary"].inc()
+            return self.async_session
+        self._reads["replica"].inc()
+        return session_factory
+
+    async def dispose(self):
+        await self.engine.dispose()
+        await self.replicas.dispose()
+
+
+def _dispose_inherited_pool():
+    if SingletonSqlAlchemyConnection._instance is not None:
+        instance = SingletonSqlAlchemyConnection._instance
+        for engine in [instance.engine, *instance.replicas.engines]:
+            engine.sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_dispose_inherited_pool)
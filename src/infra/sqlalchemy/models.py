@@ -1,7 +1,9 @@
 import datetime
 from typing import Self
 from sqlalchemy import (
+    BigInteger,
     Column,
+    LargeBinary,
     ForeignKey,
     Integer,
     String,
@@ -9,8 +11,12 @@ from sqlalchemy import (
     Numeric,
     Float,
     DateTime,
+    Index,
+    func,
+    select,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import column_property, relationship
+from sqlalchemy.schema import CreateColumn, CreateIndex
 from sqlalchemy.ext.declarative import declarative_base
 from src.domain.entities.product import Product
 from src.domain.entities.purchase import CustomerType, PaymentMethod, Purchase
@@ -33,8 +39,72 @@ def utc_now() -> datetime:
     return datetime.datetime.now(datetime.UTC)
 
 
+def latest_update(
+    updated_at: datetime.datetime | None, sharded_updated_at: datetime.datetime | None
+) -> datetime.datetime | None:
+    # Inventory shards are written without touching the product row, so a
+    # sharded product changes when either of them does.
+    if updated_at is None or sharded_updated_at is None:
+        return updated_at or sharded_updated_at
+    return max(updated_at, sharded_updated_at)
+
+
+_added_columns = {
+    "product": ["inventory_shards", "version"],
+    "product_inventory_shard": ["updated_at"],
+    "inventory_outbox": ["routing_key"],
+}
+_tables_with_added_indexes = ["product", "product_inventory_shard", "purchase"]
+# Every inventory update rewrote the entries of these covering indexes, so
+# the updates could not be HOT.
+_dropped_indexes = ["ix_product_version", "ix_product_supplier_valuation"]
+
+
+async def create_all(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_existing_tables)
+
+
+def upgrade_existing_tables(connection):
+    # ``create_all`` skips tables that already exist, so columns and indexes
+    # added to them after the first deploy are created here.
+    for table_name, column_names in _added_columns.items():
+        table = Base.metadata.tables[table_name]
+        for column_name in column_names:
+            column = CreateColumn(table.c[column_name]).compile(
+                dialect=connection.dialect
+            )
+            connection.exec_driver_sql(
+                f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {column}"
+            )
+    for table_name in _tables_with_added_indexes:
+        for index in Base.metadata.tables[table_name].indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+    for index_name in _dropped_indexes:
+        connection.exec_driver_sql(f"DROP INDEX IF EXISTS {index_name}")
+
+
+class ProductInventoryShardModel(Base):
+    __tablename__ = "product_inventory_shard"
+
+    product_id = Column(
+        String(255), ForeignKey("product.id", ondelete="CASCADE"), primary_key=True
+    )
+    shard = Column(Integer, primary_key=True)
+    quantity = Column(Integer, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=utc_now, index=True)
+
+    def __repr__(self):
+        return f"<ProductInventoryShard(product_id={self.product_id}, shard={self.shard}, quantity={self.quantity})>"
+
+
 class ProductModel(Base):
     __tablename__ = "product"
+    __table_args__ = (
+        Index("ix_product_supplier_expiration_date", "supplier", "expiration_date"),
+        Index("ix_product_expiration_date", "expiration_date"),
+    )
 
     id = Column(String(255), primary_key=True, index=True)
     title = Column(String(100), nullable=False)
@@ -42,12 +112,24 @@ class ProductModel(Base):
     code = Column(String(50), nullable=False, unique=True)
     supplier = Column(String(100), nullable=False)
     inventory_quantity = Column(Integer, nullable=False)
+    inventory_shards = Column(Integer, nullable=False, default=0, server_default="0")
     buy_price = Column(Float, nullable=False)
     sell_price = Column(Float, nullable=False)
     weight_in_kilograms = Column(Float, nullable=False)
     expiration_date = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), default=utc_now)
     updated_at = Column(DateTime(timezone=True), onupdate=utc_now)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    sharded_inventory_quantity = column_property(
+        select(func.coalesce(func.sum(ProductInventoryShardModel.quantity), 0))
+        .where(ProductInventoryShardModel.product_id == id)
+        .scalar_subquery()
+    )
+    sharded_updated_at = column_property(
+        select(func.max(ProductInventoryShardModel.updated_at))
+        .where(ProductInventoryShardModel.product_id == id)
+        .scalar_subquery()
+    )
 
     def __repr__(self):
         return f"<Product(id={self.id}, title={self.title}, code={self.code}, inventory_quantity={self.inventory_quantity})>"
@@ -70,26 +152,62 @@ class ProductModel(Base):
         )
 
     def to_entity(self) -> Product:
-        return Product(
+        return Product.from_trusted(
             title=self.title,
             description=self.description,
             code=self.code,
             supplier=self.supplier,
-            inventory_quantity=self.inventory_quantity,
+            inventory_quantity=self.inventory_quantity
+            + (self.sharded_inventory_quantity or 0),
             buy_price=self.buy_price,
             sell_price=self.sell_price,
             weight_in_kilograms=self.weight_in_kilograms,
             expiration_date=self.expiration_date,
             created_at=self.created_at,
-            updated_at=self.updated_at,
+            updated_at=latest_update(self.updated_at, self.sharded_updated_at),
+            version=self.version,
         )
 
 
+Index(
+    "ix_product_modified_at",
+    func.coalesce(ProductModel.updated_at, ProductModel.created_at),
+)
+
+
+class InventoryEventModel(Base):
+    __tablename__ = "inventory_event"
+
+    id = Column(String(64), primary_key=True)
+    processed_at = Column(
+        DateTime(timezone=True), nullable=False, default=utc_now, index=True
+    )
+
+    def __repr__(self):
+        return f"<InventoryEvent(id={self.id}, processed_at={self.processed_at})>"
+
+
+class InventoryOutboxModel(Base):
+    __tablename__ = "inventory_outbox"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    message_id = Column(String(64), nullable=False)
+    routing_key = Column(String(255))
+    content_type = Column(String(100), nullable=False)
+    body = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utc_now)
+
+    def __repr__(self):
+        return f"<InventoryOutbox(id={self.id}, message_id={self.message_id}, content_type={self.content_type})>"
+
+
 class PurchaseModel(Base):
     __tablename__ = "purchase"
 
     id = Column(Integer, primary_key=True)
-    product_id = Column(String(255), ForeignKey("product.id"), nullable=False)
+    product_id = Column(
+        String(255), ForeignKey("product.id"), nullable=False, index=True
+    )
     quantity = Column(Integer, nullable=False)
     purchase_date = Column(DateTime(timezone=True), default=utc_now)
     identification = Column(String(18), nullable=False)
@@ -125,3 +243,45 @@ class PurchaseModel(Base):
             payment_method=self.payment_method,
             total_amount=self.total_amount,
         )
+
+
+class ProductArchiveModel(Base):
+    __tablename__ = "product_archive"
+
+    archive_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(String(255), nullable=False, index=True)
+    title = Column(String(100), nullable=False)
+    description = Column(String(255), nullable=False)
+    code = Column(String(50), nullable=False)
+    supplier = Column(String(100), nullable=False)
+    inventory_quantity = Column(Integer, nullable=False)
+    buy_price = Column(Float, nullable=False)
+    sell_price = Column(Float, nullable=False)
+    weight_in_kilograms = Column(Float, nullable=False)
+    expiration_date = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    version = Column(Integer, nullable=False)
+    archived_at = Column(
+        DateTime(timezone=True), nullable=False, default=utc_now, index=True
+    )
+
+    def __repr__(self):
+        return f"<ProductArchive(id={self.id}, code={self.code}, archived_at={self.archived_at})>"
+
+
+class PurchaseArchiveModel(Base):
+    __tablename__ = "purchase_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    product_id = Column(String(255), nullable=False, index=True)
+    quantity = Column(Integer, nullable=False)
+    purchase_date = Column(DateTime(timezone=True))
+    identification = Column(String(18), nullable=False)
+    identification_type = Column(Enum(CustomerType), nullable=False)
+    payment_method = Column(Enum(PaymentMethod), nullable=False)
+    total_amount = Column(Numeric(10, 2))
+    archived_at = Column(DateTime(timezone=True), nullable=False, default=utc_now)
+
+    def __repr__(self):
+        return f"<PurchaseArchive(id={self.id}, product_id={self.product_id}, archived_at={self.archived_at})>"
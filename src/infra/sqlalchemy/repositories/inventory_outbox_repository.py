@@ -0,0 +1,37 @@
+import uuid
+
+from sqlalchemy import insert
+
+from src.domain.contracts.repositories.inventory_repository import IInventoryRepository
+from src.domain.use_cases.product_inventory_processor import InputInventoryProcessorDTO
+from src.infra.sqlalchemy.models import InventoryOutboxModel
+
+_insert_outbox_message = insert(InventoryOutboxModel)
+
+
+class SQLAlchemyOutboxInventoryRepository(IInventoryRepository):
+    def __init__(self, sqlalchemy_instance, codec, router=None):
+        self.sqlalchemy_instance = sqlalchemy_instance
+        self.codec = codec
+        self.router = router
+
+    async def send(self, dto: InputInventoryProcessorDTO):
+        parts = [(None, dto)] if self.router is None else self.router.split(dto)
+        rows = []
+        for routing_key, part in parts:
+            if part.event_id is None:
+                part = part.model_copy(update={"event_id": uuid.uuid4().hex})
+            rows.append(
+                {
+                    "message_id": part.event_id,
+                    "routing_key": routing_key,
+                    "content_type": self.codec.content_type,
+                    "body": self.codec.encode(part),
+                }
+            )
+        async with self.sqlalchemy_instance.async_session() as session:
+            await session.execute(_insert_outbox_message, rows)
+            await session.commit()
+
+    async def flush(self, timeout: float) -> int:
+        return 0
@@ -1,17 +1,512 @@
+import random
+from collections import defaultdict
 from datetime import datetime
-from sqlalchemy import select, delete
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import (
+    Integer,
+    String,
+    bindparam,
+    delete,
+    exists,
+    func,
+    literal_column,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 
 from src.domain.contracts.repositories.product_repository import IProductRepository
-from src.domain.entities.product import Product
+from src.domain.entities.inventory import InventoryChange
+from src.domain.exceptions import ConcurrentUpdateError
+from src.domain.entities.product import (
+    Product,
+    ProductKey,
+    ProductVersion,
+    SupplierValuation,
+)
 from src.infra.sqlalchemy.models import (
+    InventoryEventModel,
+    ProductInventoryShardModel,
+    ProductArchiveModel,
     ProductModel,
+    PurchaseArchiveModel,
+    PurchaseModel,
+    latest_update,
     make_product_id_from_base,
 )
 
+_inventory_deltas = (
+    func.unnest(
+        bindparam("ids", type_=ARRAY(String)),
+        bindparam("deltas", type_=ARRAY(Integer)),
+    )
+    .table_valued("id", "delta")
+    .render_derived(name="deltas")
+)
+
+_apply_inventory_deltas = (
+    update(ProductModel)
+    .where(
+        ProductModel.id == _inventory_deltas.c.id,
+        ProductModel.inventory_shards == 0,
+        ProductModel.inventory_quantity + _inventory_deltas.c.delta >= 0,
+    )
+    .values(
+        inventory_quantity=ProductModel.inventory_quantity + _inventory_deltas.c.delta,
+        updated_at=func.now(),
+    )
+    .returning(ProductModel.id)
+)
+
+_new_inventory_event = (
+    insert(InventoryEventModel)
+    .values(id=bindparam("event_id"), processed_at=func.now())
+    .on_conflict_do_nothing()
+    .returning(InventoryEventModel.id)
+    .cte("new_event")
+)
+_applied_inventory_deltas = _apply_inventory_deltas.where(
+    exists(select(_new_inventory_event.c.id))
+).cte("applied")
+
+_apply_inventory_deltas_once = select(
+    select(func.count())
+    .select_from(_new_inventory_event)
+    .scalar_subquery()
+    .label("fresh"),
+    select(func.array_agg(_applied_inventory_deltas.c.id))
+    .scalar_subquery()
+    .label("ids"),
+)
+
+_expired_inventory_events = (
+    select(InventoryEventModel.id)
+    .where(InventoryEventModel.processed_at < bindparam("processed_before"))
+    .limit(bindparam("chunk_size"))
+    .with_for_update(skip_locked=True)
+    .scalar_subquery()
+)
+_prune_inventory_events = (
+    delete(InventoryEventModel)
+    .where(InventoryEventModel.id.in_(_expired_inventory_events))
+    .returning(InventoryEventModel.id)
+)
+
+_sharded_products = select(ProductModel.id, ProductModel.inventory_shards).where(
+    ProductModel.id.in_(bindparam("sharded_ids", expanding=True)),
+    ProductModel.inventory_shards > 0,
+)
+
+_add_to_shard = insert(ProductInventoryShardModel).values(
+    product_id=bindparam("add_product_id"),
+    shard=bindparam("add_shard"),
+    quantity=bindparam("add"),
+    updated_at=func.now(),
+)
+_add_to_shard = _add_to_shard.on_conflict_do_update(
+    index_elements=[
+        ProductInventoryShardModel.product_id,
+        ProductInventoryShardModel.shard,
+    ],
+    set_={
+        "quantity": ProductInventoryShardModel.quantity
+        + _add_to_shard.excluded.quantity,
+        "updated_at": _add_to_shard.excluded.updated_at,
+    },
+)
+
+_shard_with_stock = (
+    select(ProductInventoryShardModel.shard)
+    .where(
+        ProductInventoryShardModel.product_id == bindparam("take_product_id"),
+        ProductInventoryShardModel.quantity >= bindparam("take"),
+    )
+    .order_by(func.random())
+    .limit(1)
+    .with_for_update(skip_locked=True)
+    .scalar_subquery()
+)
+
+_take_from_shard = (
+    update(ProductInventoryShardModel)
+    .where(
+        ProductInventoryShardModel.product_id == bindparam("take_product_id"),
+        ProductInventoryShardModel.shard == _shard_with_stock,
+    )
+    .values(
+        quantity=ProductInventoryShardModel.quantity - bindparam("take"),
+        updated_at=func.now(),
+    )
+    .returning(ProductInventoryShardModel.shard)
+)
+
+# The product row is always locked before its shards, so folding, resharding
+# and rebalancing can not deadlock with each other.
+_lock_product = (
+    select(ProductModel.id)
+    .where(ProductModel.id == bindparam("lock_product_id"))
+    .with_for_update()
+)
+
+_moved_shards_of_product = (
+    delete(ProductInventoryShardModel)
+    .where(ProductInventoryShardModel.product_id == bindparam("fold_product_id"))
+    .returning(ProductInventoryShardModel.quantity)
+    .cte("moved_shards")
+)
+_folded_quantity = select(
+    func.coalesce(func.sum(_moved_shards_of_product.c.quantity), 0)
+).scalar_subquery()
+
+_stocked_shards = (
+    select(ProductInventoryShardModel.shard, ProductInventoryShardModel.quantity)
+    .where(
+        ProductInventoryShardModel.product_id == bindparam("fold_product_id"),
+        ProductInventoryShardModel.quantity > 0,
+    )
+    .with_for_update()
+    .subquery("stocked_shards")
+)
+_emptied_shards = (
+    update(ProductInventoryShardModel)
+    .where(
+        ProductInventoryShardModel.product_id == bindparam("fold_product_id"),
+        ProductInventoryShardModel.shard == _stocked_shards.c.shard,
+    )
+    .values(quantity=0, updated_at=func.now())
+    .returning(_stocked_shards.c.quantity)
+    .cte("emptied_shards")
+)
+_emptied_quantity = select(
+    func.coalesce(func.sum(_emptied_shards.c.quantity), 0)
+).scalar_subquery()
+
+# Shard rows are emptied rather than deleted so the next compaction refills
+# them in place instead of inserting rows that running decrements cannot see.
+_fold_and_take = (
+    update(ProductModel)
+    .where(
+        ProductModel.id == bindparam("fold_product_id"),
+        ProductModel.inventory_quantity + _emptied_quantity >= bindparam("take"),
+    )
+    .values(
+        inventory_quantity=ProductModel.inventory_quantity
+        + _emptied_quantity
+        - bindparam("take"),
+        updated_at=func.now(),
+    )
+    .returning(ProductModel.id)
+)
+
+_fold_and_set_shards = (
+    update(ProductModel)
+    .where(ProductModel.id == bindparam("fold_product_id"))
+    .values(
+        inventory_quantity=ProductModel.inventory_quantity + _folded_quantity,
+        inventory_shards=bindparam("shards"),
+        updated_at=func.now(),
+    )
+    .returning(ProductModel.id)
+)
+
+_shard_spread = (
+    select(
+        ProductInventoryShardModel.product_id,
+        func.count().label("shards"),
+        func.min(ProductInventoryShardModel.quantity).label("lowest"),
+        func.max(ProductInventoryShardModel.quantity).label("highest"),
+    )
+    .group_by(ProductInventoryShardModel.product_id)
+    .subquery("shard_spread")
+)
+
+_unbalanced_sharded_products = (
+    select(ProductModel.id)
+    .outerjoin(_shard_spread, _shard_spread.c.product_id == ProductModel.id)
+    .where(
+        ProductModel.inventory_shards > 0,
+        (ProductModel.inventory_quantity != 0)
+        | (func.coalesce(_shard_spread.c.shards, 0) != ProductModel.inventory_shards)
+        | (_shard_spread.c.highest - _shard_spread.c.lowest > 1),
+    )
+    .order_by(ProductModel.id)
+)
+
+_lock_sharded_product = (
+    select(ProductModel.inventory_quantity, ProductModel.inventory_shards)
+    .where(
+        ProductModel.id == bindparam("rebalance_product_id"),
+        ProductModel.inventory_shards > 0,
+    )
+    .with_for_update()
+)
+
+_lock_product_shards = (
+    select(ProductInventoryShardModel.quantity)
+    .where(ProductInventoryShardModel.product_id == bindparam("rebalance_product_id"))
+    .with_for_update()
+)
+
+_set_shard = insert(ProductInventoryShardModel).values(
+    product_id=bindparam("rebalance_product_id"),
+    shard=bindparam("rebalance_shard"),
+    quantity=bindparam("rebalance_quantity"),
+    updated_at=func.now(),
+)
+_set_shard = _set_shard.on_conflict_do_update(
+    index_elements=[
+        ProductInventoryShardModel.product_id,
+        ProductInventoryShardModel.shard,
+    ],
+    set_={
+        "quantity": _set_shard.excluded.quantity,
+        "updated_at": _set_shard.excluded.updated_at,
+    },
+)
+
+_move_inventory_to_shards = (
+    update(ProductModel)
+    .where(ProductModel.id == bindparam("rebalance_product_id"))
+    .values(inventory_quantity=0, updated_at=func.now())
+)
+
+_row_modified_at = func.coalesce(ProductModel.updated_at, ProductModel.created_at)
+_modified_at = func.greatest(_row_modified_at, ProductModel.sharded_updated_at)
+
+_modified_since = (_row_modified_at > bindparam("since")) | ProductModel.id.in_(
+    select(ProductInventoryShardModel.product_id).where(
+        ProductInventoryShardModel.updated_at > bindparam("since")
+    )
+)
+
+_product_version = select(
+    ProductModel.id,
+    _modified_at,
+    ProductModel.inventory_quantity + ProductModel.sharded_inventory_quantity,
+).where(ProductModel.id == bindparam("product_id"))
+
+_remove_product = (
+    delete(ProductModel)
+    .where(ProductModel.id == bindparam("product_id"))
+    .returning(ProductModel.id)
+)
+
+_has_purchases = exists().where(PurchaseModel.product_id == ProductModel.id)
+
+_remove_products_by_id = (
+    delete(ProductModel)
+    .where(
+        ProductModel.id == func.any(bindparam("ids", type_=ARRAY(String))),
+        ~_has_purchases,
+    )
+    .returning(ProductModel.id)
+)
+
+_product_columns = (
+    *ProductModel.__table__.c,
+    ProductModel.sharded_inventory_quantity.label("sharded_inventory_quantity"),
+    ProductModel.sharded_updated_at.label("sharded_updated_at"),
+)
+
+PATCHABLE_FIELDS = frozenset(
+    {"title", "description", "buy_price", "sell_price", "weight_in_kilograms"}
+)
+
+
+def _product_from_row(row) -> Product:
+    return Product.from_trusted(
+        title=row.title,
+        description=row.description,
+        code=row.code,
+        supplier=row.supplier,
+        inventory_quantity=row.inventory_quantity + row.sharded_inventory_quantity,
+        buy_price=row.buy_price,
+        sell_price=row.sell_price,
+        weight_in_kilograms=row.weight_in_kilograms,
+        expiration_date=row.expiration_date,
+        created_at=row.created_at,
+        updated_at=latest_update(row.updated_at, row.sharded_updated_at),
+        version=row.version,
+    )
+
+
+_product_table = ProductModel.__table__
+_purchase_table = PurchaseModel.__table__
+
+_select_product = select(*_product_columns).where(
+    _product_table.c.id == bindparam("product_id")
+)
+
+_product_exists = (
+    select(literal_column("1"))
+    .where(_product_table.c.id == bindparam("product_id"))
+    .limit(1)
+)
+
+_existing_product_ids = select(_product_table.c.id).where(
+    _product_table.c.id == func.any(bindparam("ids", type_=ARRAY(String)))
+)
+
+_select_products = select(*_product_columns).where(
+    _product_table.c.id == func.any(bindparam("ids", type_=ARRAY(String)))
+)
+
+_all_products = select(*_product_columns).order_by(_modified_at)
+
+_products_modified_since = _all_products.where(_modified_since)
+
+_shard_quantities = (
+    select(
+        ProductInventoryShardModel.product_id,
+        func.sum(ProductInventoryShardModel.quantity).label("quantity"),
+    )
+    .group_by(ProductInventoryShardModel.product_id)
+    .subquery("shard_quantities")
+)
+_stock = _product_table.c.inventory_quantity + func.coalesce(
+    _shard_quantities.c.quantity, 0
+)
+
+_all_supplier_valuations = (
+    select(
+        _product_table.c.supplier,
+        func.count().label("products"),
+        func.sum(_stock).label("inventory_quantity"),
+        func.sum(_stock * _product_table.c.buy_price).label("stock_value"),
+        func.sum(_stock * _product_table.c.sell_price).label("potential_revenue"),
+        func.sum(_stock * _product_table.c.weight_in_kilograms).label(
+            "weight_in_kilograms"
+        ),
+    )
+    .select_from(
+        _product_table.outerjoin(
+            _shard_quantities, _shard_quantities.c.product_id == _product_table.c.id
+        )
+    )
+    .group_by(_product_table.c.supplier)
+    .order_by(_product_table.c.supplier)
+)
+
+_supplier_valuations = _all_supplier_valuations.where(
+    _product_table.c.supplier == func.any(bindparam("suppliers", type_=ARRAY(String)))
+)
+
+_all_modified_suppliers = select(
+    _product_table.c.supplier, func.max(_modified_at), func.count()
+).group_by(_product_table.c.supplier)
+
+_suppliers_modified_since = _all_modified_suppliers.where(_modified_since)
+
+_expired_products = (
+    select(_product_table.c.id)
+    .where(_product_table.c.expiration_date < bindparam("expired_before"))
+    .order_by(_product_table.c.expiration_date)
+    .limit(bindparam("chunk_size"))
+    .with_for_update(skip_locked=True)
+    .cte("expired_products")
+)
+_moved_purchases = (
+    delete(_purchase_table)
+    .where(_purchase_table.c.product_id.in_(select(_expired_products.c.id)))
+    .returning(*_purchase_table.c)
+    .cte("moved_purchases")
+)
+_archived_purchases = (
+    insert(PurchaseArchiveModel.__table__)
+    .from_select(
+        [*_purchase_table.c.keys(), "archived_at"],
+        select(*_moved_purchases.c, func.now()),
+    )
+    .returning(PurchaseArchiveModel.__table__.c.id)
+    .cte("archived_purchases")
+)
+_moved_products = (
+    delete(_product_table)
+    .where(_product_table.c.id.in_(select(_expired_products.c.id)))
+    .returning(*_product_table.c)
+    .cte("moved_products")
+)
+_archived_columns = [
+    column.name
+    for column in ProductArchiveModel.__table__.c
+    if column.name not in ("archive_id", "archived_at")
+]
+_archived_products = (
+    insert(ProductArchiveModel.__table__)
+    .from_select(
+        [*_archived_columns, "archived_at"],
+        select(
+            *(
+                (
+                    (
+                        _moved_products.c.inventory_quantity
+                        + select(
+                            func.coalesce(
+                                func.sum(ProductInventoryShardModel.quantity), 0
+                            )
+                        )
+                        .where(
+                            ProductInventoryShardModel.product_id
+                            == _moved_products.c.id
+                        )
+                        .scalar_subquery()
+                    )
+                    if name == "inventory_quantity"
+                    else _moved_products.c[name]
+                )
+                for name in _archived_columns
+            ),
+            func.now(),
+        ),
+    )
+    .returning(ProductArchiveModel.__table__.c.archive_id)
+    .cte("archived_products")
+)
+_archive_expired_products = select(
+    select(func.count())
+    .select_from(_archived_products)
+    .scalar_subquery()
+    .label("products"),
+    select(func.count())
+    .select_from(_archived_purchases)
+    .scalar_subquery()
+    .label("purchases"),
+)
+
+
+def _supplier_valuation_from_row(row) -> SupplierValuation:
+    return SupplierValuation(
+        supplier=row.supplier,
+        products=row.products,
+        inventory_quantity=row.inventory_quantity,
+        stock_value=row.stock_value,
+        potential_revenue=row.potential_revenue,
+        margin=row.potential_revenue - row.stock_value,
+        weight_in_kilograms=row.weight_in_kilograms,
+    )
+
+
+def _make_product_id_from_key(key: ProductKey) -> str:
+    return make_product_id_from_base(key.code, key.supplier, key.expiration_date)
+
 
 class SQLAlchemyProductRepository(IProductRepository):
-    def __init__(self, sqlalchemy_instance):
+    def __init__(self, sqlalchemy_instance, read_from_replicas: bool = False):
         self.sqlalchemy_instance = sqlalchemy_instance
+        self.read_from_replicas = read_from_replicas
+
+    def _read_session(self):
+        if self.read_from_replicas:
+            return self.sqlalchemy_instance.read_session()
+        return self.sqlalchemy_instance.async_session
+
+    async def _read_with_primary_fallback(self, read):
+        session_factory = self._read_session()
+        result = await read(session_factory)
+        if result or session_factory is self.sqlalchemy_instance.async_session:
+            return result
+        return await read(self.sqlalchemy_instance.async_session)
 
     async def create(self, product: Product) -> Product | None:
         async with self.sqlalchemy_instance.async_session() as session:
@@ -29,88 +524,445 @@ class SQLAlchemyProductRepository(IProductRepository):
     async def exists_from(
         self, code: str, supplier: str, expiration_date: datetime
     ) -> bool:
-        product_model = await self._get_product_by_code_supplier_expiration(
-            code, supplier, expiration_date
-        )
-        if not product_model:
-            return False
+        product_id = make_product_id_from_base(code, supplier, expiration_date)
 
-        return bool(product_model)
+        async def read(session_factory):
+            async with session_factory() as session:
+                result = await session.execute(
+                    _product_exists, {"product_id": product_id}
+                )
+                return result.scalar() is not None
+
+        return await self._read_with_primary_fallback(read)
+
+    async def missing_from(self, keys: List[ProductKey]) -> List[ProductKey]:
+        session_factory = self._read_session()
+        missing = await self._missing_from(keys, session_factory)
+        if missing and session_factory is not self.sqlalchemy_instance.async_session:
+            missing = await self._missing_from(
+                missing, self.sqlalchemy_instance.async_session
+            )
+        return missing
+
+    async def _missing_from(
+        self, keys: List[ProductKey], session_factory
+    ) -> List[ProductKey]:
+        ids_by_key = {key: _make_product_id_from_key(key) for key in keys}
+        async with session_factory() as session:
+            result = await session.execute(
+                _existing_product_ids, {"ids": list(set(ids_by_key.values()))}
+            )
+            existing_ids = set(result.scalars())
+        return [
+            key
+            for key, product_id in ids_by_key.items()
+            if product_id not in existing_ids
+        ]
 
     async def update(self, product: Product) -> Product | None:
+        return await self.patch(
+            product.code,
+            product.supplier,
+            product.expiration_date,
+            {field: getattr(product, field) for field in PATCHABLE_FIELDS},
+            version=product.version,
+        )
+
+    async def patch(
+        self,
+        code: str,
+        supplier: str,
+        expiration_date: datetime,
+        changes: Dict[str, Any],
+        version: Optional[int] = None,
+    ) -> Product | None:
+        unknown_fields = changes.keys() - PATCHABLE_FIELDS
+        if unknown_fields:
+            raise ValueError(f"fields cannot be patched: {sorted(unknown_fields)}")
+
+        statement = (
+            update(ProductModel)
+            .where(
+                ProductModel.id
+                == make_product_id_from_base(code, supplier, expiration_date)
+            )
+            .values(**changes, version=ProductModel.version + 1)
+            .returning(*_product_columns)
+        )
+        if version is not None:
+            statement = statement.where(ProductModel.version == version)
+
         async with self.sqlalchemy_instance.async_session() as session:
-            product_model = await self._get_product_by_code_supplier_expiration(
-                product.code,
-                product.supplier,
-                product.expiration_date,
+            result = await session.execute(
+                statement, execution_options={"synchronize_session": False}
             )
-            if not product_model:
-                return None
-
-            product_model.title = product.title
-            product_model.description = product.description
-            product_model.buy_price = product.buy_price
-            product_model.sell_price = product.sell_price
-            product_model.weight_in_kilograms = product.weight_in_kilograms
-            session.add(product_model)
+            row = result.one_or_none()
             await session.commit()
-            await session.refresh(product_model)
-            return product_model.to_entity()
+
+        if row is None:
+            if version is not None and await self.exists_from(
+                code, supplier, expiration_date
+            ):
+                raise ConcurrentUpdateError()
+            return None
+
+        return _product_from_row(row)
 
     async def remove(
         self, code: str, supplier: str, expiration_date: datetime
     ) -> str | None:
         async with self.sqlalchemy_instance.async_session() as session:
             product_id = make_product_id_from_base(code, supplier, expiration_date)
-            statement = delete(ProductModel).where(ProductModel.id == product_id)
-            await session.execute(statement)
+            result = await session.execute(
+                _remove_product,
+                {"product_id": product_id},
+                execution_options={"synchronize_session": False},
+            )
+            removed_id = result.scalar_one_or_none()
             await session.commit()
-            return product_id
+            return removed_id
+
+    async def remove_many(
+        self, keys: List[ProductKey], chunk_size: int = 500
+    ) -> List[str]:
+        product_ids = list(dict.fromkeys(map(_make_product_id_from_key, keys)))
+        removed_ids = []
+        for start in range(0, len(product_ids), chunk_size):
+            async with self.sqlalchemy_instance.async_session() as session:
+                result = await session.execute(
+                    _remove_products_by_id,
+                    {"ids": product_ids[start : start + chunk_size]},
+                    execution_options={"synchronize_session": False},
+                )
+                removed_ids.extend(result.scalars())
+                await session.commit()
+        return removed_ids
+
+    async def remove_matching(
+        self,
+        supplier: Optional[str] = None,
+        expired_before: Optional[datetime] = None,
+        chunk_size: int = 500,
+    ) -> List[str]:
+        if supplier is None and expired_before is None:
+            raise ValueError("a supplier or an expiration bound is required")
+
+        candidates = select(ProductModel.id).where(~_has_purchases)
+        if supplier is not None:
+            candidates = candidates.where(ProductModel.supplier == supplier)
+        if expired_before is not None:
+            candidates = candidates.where(ProductModel.expiration_date < expired_before)
+        statement = (
+            delete(ProductModel)
+            .where(
+                ProductModel.id.in_(
+                    candidates.limit(chunk_size)
+                    .with_for_update(skip_locked=True)
+                    .scalar_subquery()
+                )
+            )
+            .returning(ProductModel.id)
+        )
+
+        removed_ids = []
+        while True:
+            async with self.sqlalchemy_instance.async_session() as session:
+                result = await session.execute(
+                    statement, execution_options={"synchronize_session": False}
+                )
+                chunk = result.scalars().all()
+                await session.commit()
+            removed_ids.extend(chunk)
+            if len(chunk) < chunk_size:
+                return removed_ids
 
     async def add_inventory_to(
         self, code: str, supplier: str, expiration_date: datetime
     ) -> Product | None:
-        async with self.sqlalchemy_instance.async_session() as session:
-            product_model = await self._get_product_by_code_supplier_expiration(
-                code, supplier, expiration_date
-            )
-            if not product_model:
-                return None
-
-            product_model.inventory_quantity += 1
-            session.add(product_model)
-            await session.commit()
-            await session.refresh(product_model)
+        return await self._apply_single_inventory_change(
+            ProductKey(code, supplier, expiration_date), 1
+        )
 
     async def remove_inventory_from(
         self, code: str, supplier: str, expiration_date: datetime
     ) -> Product | None:
+        return await self._apply_single_inventory_change(
+            ProductKey(code, supplier, expiration_date), -1
+        )
+
+    async def _apply_single_inventory_change(
+        self, key: ProductKey, quantity: int
+    ) -> Product | None:
+        rejected = await self.apply_inventory_changes([InventoryChange(key, quantity)])
+        if rejected:
+            return None
+        return await self.get_by_code_supplier_expiration(
+            key.code, key.supplier, key.expiration_date
+        )
+
+    async def apply_inventory_changes(
+        self, changes: List[InventoryChange], event_id: Optional[str] = None
+    ) -> List[ProductKey]:
+        keys_by_id = defaultdict(list)
+        deltas_by_id = defaultdict(int)
+        for change in changes:
+            product_id = _make_product_id_from_key(change.product)
+            keys_by_id[product_id].append(change.product)
+            deltas_by_id[product_id] += change.quantity
+
+        ids = sorted(deltas_by_id)
+        params = {
+            "ids": ids,
+            "deltas": [deltas_by_id[product_id] for product_id in ids],
+        }
         async with self.sqlalchemy_instance.async_session() as session:
-            product_model = await self._get_product_by_code_supplier_expiration(
-                code, supplier, expiration_date
+            if event_id is None:
+                result = await session.execute(
+                    _apply_inventory_deltas,
+                    params,
+                    execution_options={"synchronize_session": False},
+                )
+                updated_ids = set(result.scalars())
+            else:
+                result = await session.execute(
+                    _apply_inventory_deltas_once, {**params, "event_id": event_id}
+                )
+                fresh, applied_ids = result.one()
+                if not fresh:
+                    await session.rollback()
+                    return []
+                updated_ids = set(applied_ids or ())
+
+            if len(updated_ids) < len(ids):
+                updated_ids |= await self._apply_sharded_deltas(
+                    session,
+                    {
+                        product_id: deltas_by_id[product_id]
+                        for product_id in ids
+                        if product_id not in updated_ids
+                    },
+                )
+
+            if len(updated_ids) < len(ids):
+                await session.rollback()
+                return [
+                    key
+                    for product_id in ids
+                    if product_id not in updated_ids
+                    for key in keys_by_id[product_id]
+                ]
+
+            await session.commit()
+            return []
+
+    async def _apply_sharded_deltas(self, session, deltas_by_id) -> set:
+        result = await session.execute(
+            _sharded_products, {"sharded_ids": list(deltas_by_id)}
+        )
+        updated_ids = set()
+        for product_id, shards in sorted(result.all()):
+            delta = deltas_by_id[product_id]
+            if delta >= 0:
+                await session.execute(
+                    _add_to_shard,
+                    {
+                        "add_product_id": product_id,
+                        "add_shard": random.randrange(shards),
+                        "add": delta,
+                    },
+                )
+                updated_ids.add(product_id)
+                continue
+
+            taken = await session.execute(
+                _take_from_shard,
+                {"take_product_id": product_id, "take": -delta},
+                execution_options={"synchronize_session": False},
             )
-            if not product_model and not (product_model.inventory_quantity > 0):
-                return None
+            if taken.first() is None:
+                await session.execute(_lock_product, {"lock_product_id": product_id})
+                taken = await session.execute(
+                    _fold_and_take,
+                    {"fold_product_id": product_id, "take": -delta},
+                    execution_options={"synchronize_session": False},
+                )
+                if taken.first() is None:
+                    continue
+            updated_ids.add(product_id)
+        return updated_ids
 
-            product_model.inventory_quantity -= 1
-            session.add(product_model)
+    async def set_inventory_shards(
+        self, code: str, supplier: str, expiration_date: datetime, shards: int
+    ) -> bool:
+        product_id = make_product_id_from_base(code, supplier, expiration_date)
+        async with self.sqlalchemy_instance.async_session() as session:
+            await session.execute(_lock_product, {"lock_product_id": product_id})
+            result = await session.execute(
+                _fold_and_set_shards,
+                {"fold_product_id": product_id, "shards": shards},
+                execution_options={"synchronize_session": False},
+            )
+            updated = result.first() is not None
+            if updated and shards:
+                await self._rebalance_shards(session, product_id)
             await session.commit()
-            await session.refresh(product_model)
-            return product_model.to_entity()
+            return updated
+
+    async def compact_inventory_shards(self) -> int:
+        async with self.sqlalchemy_instance.async_session() as session:
+            result = await session.execute(_unbalanced_sharded_products)
+            product_ids = list(result.scalars())
+            rebalanced = 0
+            for product_id in product_ids:
+                rebalanced += await self._rebalance_shards(session, product_id)
+                await session.commit()
+            return rebalanced
+
+    async def _rebalance_shards(self, session, product_id: str) -> bool:
+        params = {"rebalance_product_id": product_id}
+        result = await session.execute(_lock_sharded_product, params)
+        product = result.first()
+        if product is None:
+            return False
+
+        result = await session.execute(_lock_product_shards, params)
+        total = product.inventory_quantity + sum(result.scalars())
+        share, rest = divmod(total, product.inventory_shards)
+        await session.execute(
+            _set_shard,
+            [
+                {
+                    **params,
+                    "rebalance_shard": shard,
+                    "rebalance_quantity": share + (shard < rest),
+                }
+                for shard in range(product.inventory_shards)
+            ],
+        )
+        await session.execute(
+            _move_inventory_to_shards,
+            params,
+            execution_options={"synchronize_session": False},
+        )
+        return True
+
+    async def prune_inventory_events(
+        self, processed_before: datetime, chunk_size: int = 5000
+    ) -> int:
+        pruned = 0
+        while True:
+            async with self.sqlalchemy_instance.async_session() as session:
+                result = await session.execute(
+                    _prune_inventory_events,
+                    {"processed_before": processed_before, "chunk_size": chunk_size},
+                    execution_options={"synchronize_session": False},
+                )
+                deleted = len(result.all())
+                await session.commit()
+            pruned += deleted
+            if deleted < chunk_size:
+                return pruned
+
+    async def archive_expired(
+        self, expired_before: datetime, chunk_size: int = 500
+    ) -> Tuple[int, int]:
+        async with self.sqlalchemy_instance.async_session() as session:
+            result = await session.execute(
+                _archive_expired_products,
+                {"expired_before": expired_before, "chunk_size": chunk_size},
+            )
+            products, purchases = result.one()
+            await session.commit()
+            return products, purchases
 
     async def get_by_code_supplier_expiration(
         self, code: str, supplier: str, expiration_date: datetime
     ) -> Product | None:
-        product_model = await self._get_product_by_code_supplier_expiration(
-            code, supplier, expiration_date
-        )
-        return None if not product_model else product_model.to_entity()
+        product_id = make_product_id_from_base(code, supplier, expiration_date)
 
-    async def _get_product_by_code_supplier_expiration(
-        self, code: str, supplier: str, expiration_date: datetime
-    ) -> ProductModel | None:
+        async def read(session_factory):
+            async with session_factory() as session:
+                result = await session.execute(
+                    _select_product, {"product_id": product_id}
+                )
+                row = result.one_or_none()
+                return None if row is None else _product_from_row(row)
+
+        return await self._read_with_primary_fallback(read)
+
+    async def get_many(self, keys: List[ProductKey]) -> List[Optional[Product]]:
+        ids = [_make_product_id_from_key(key) for key in keys]
+        session_factory = self._read_session()
+        products_by_id = await self._get_many_by_id(set(ids), session_factory)
+        missing_ids = set(ids) - products_by_id.keys()
+        if (
+            missing_ids
+            and session_factory is not self.sqlalchemy_instance.async_session
+        ):
+            products_by_id.update(
+                await self._get_many_by_id(
+                    missing_ids, self.sqlalchemy_instance.async_session
+                )
+            )
+        return [products_by_id.get(product_id) for product_id in ids]
+
+    async def _get_many_by_id(
+        self, ids: Set[str], session_factory
+    ) -> Dict[str, Product]:
+        async with session_factory() as session:
+            result = await session.execute(_select_products, {"ids": list(ids)})
+            return {row.id: _product_from_row(row) for row in result}
+
+    async def list_modified_since(
+        self, since: Optional[datetime] = None
+    ) -> List[Product]:
         async with self.sqlalchemy_instance.async_session() as session:
-            product_id = make_product_id_from_base(code, supplier, expiration_date)
-            statement = select(ProductModel).where(ProductModel.id == product_id)
-            product_model = await session.execute(statement)
-            return product_model.scalar_one_or_none()
+            if since is None:
+                result = await session.execute(_all_products)
+            else:
+                result = await session.execute(
+                    _products_modified_since, {"since": since}
+                )
+            return [_product_from_row(row) for row in result]
+
+    async def supplier_valuations(
+        self, suppliers: Optional[List[str]] = None
+    ) -> List[SupplierValuation]:
+        async with self.sqlalchemy_instance.async_session() as session:
+            if suppliers is None:
+                result = await session.execute(_all_supplier_valuations)
+            else:
+                result = await session.execute(
+                    _supplier_valuations, {"suppliers": list(suppliers)}
+                )
+            return [_supplier_valuation_from_row(row) for row in result]
+
+    async def suppliers_modified_since(
+        self, since: Optional[datetime] = None
+    ) -> Dict[str, Tuple[datetime, int]]:
+        async with self.sqlalchemy_instance.async_session() as session:
+            if since is None:
+                result = await session.execute(_all_modified_suppliers)
+            else:
+                result = await session.execute(
+                    _suppliers_modified_since, {"since": since}
+                )
+            return {
+                supplier: (modified_at, products)
+                for supplier, modified_at, products in result
+            }
+
+    async def get_version_by_code_supplier_expiration(
+        self, code: str, supplier: str, expiration_date: datetime
+    ) -> ProductVersion | None:
+        product_id = make_product_id_from_base(code, supplier, expiration_date)
+
+        async def read(session_factory):
+            async with session_factory() as session:
+                result = await session.execute(
+                    _product_version, {"product_id": product_id}
+                )
+                row = result.one_or_none()
+                return None if row is None else ProductVersion(*row)
+
+        return await self._read_with_primary_fallback(read)
@@ -0,0 +1,153 @@
+import datetime
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Self, Set, Tuple
+
+from decouple import config
+
+from src.domain.entities.product import SupplierValuation
+from src.infra.metrics import registry
+from src.infra.scheduler import PeriodicTask
+from src.infra.single_flight import SingleFlight
+from src.infra.sqlalchemy.connection import SingletonSqlAlchemyConnection
+from src.infra.sqlalchemy.repositories.product_repository import (
+    SQLAlchemyProductRepository,
+)
+
+
+class SupplierValuationCache:
+    _instance = None
+
+    def __init__(
+        self,
+        repository,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.repository = repository
+        self.ttl = ttl
+        self.clock = clock
+        self._valuations: Dict[str, SupplierValuation] = {}
+        self._loaded_at: Optional[float] = None
+        self._stale: Set[str] = set()
+        self._single_flight = SingleFlight("supplier_valuation")
+        self._reads = {
+            result: registry.counter(
+                "supplier_valuation_reads_total",
+                "Supplier valuation reads by how they were served",
+                result=result,
+            )
+            for result in ("hit", "refresh", "reload")
+        }
+
+    @classmethod
+    def get_instance(cls) -> Self:
+        if cls._instance is None:
+            cls._instance = cls(
+                SQLAlchemyProductRepository(
+                    SingletonSqlAlchemyConnection.get_instance()
+                ),
+                ttl=config("SUPPLIER_VALUATION_TTL", default=60.0, cast=float),
+            )
+        return cls._instance
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+    def invalidate(self, suppliers: Iterable[str]):
+        self._stale.update(suppliers)
+
+    def _expired(self) -> bool:
+        return self._loaded_at is None or self.clock() - self._loaded_at > self.ttl
+
+    async def supplier_valuations(
+        self, suppliers: Optional[List[str]] = None
+    ) -> List[SupplierValuation]:
+        if self._expired() or self._stale:
+            await self._single_flight.do("load", self._load)
+        else:
+            self._reads["hit"].inc()
+
+        if suppliers is None:
+            return list(self._valuations.values())
+        return [
+            self._valuations[supplier]
+            for supplier in suppliers
+            if supplier in self._valuations
+        ]
+
+    async def _load(self):
+        if self._expired():
+            self._reads["reload"].inc()
+            await self._reload()
+        elif self._stale:
+            self._reads["refresh"].inc()
+            await self._refresh()
+
+    async def _reload(self):
+        stale = set(self._stale)
+        self._stale -= stale
+        loaded_at = self.clock()
+        try:
+            valuations = await self.repository.supplier_valuations(None)
+        except BaseException:
+            self._stale |= stale
+            raise
+        self._valuations = {valuation.supplier: valuation for valuation in valuations}
+        self._loaded_at = loaded_at
+
+    async def _refresh(self):
+        stale = set(self._stale)
+        self._stale -= stale
+        try:
+            valuations = await self.repository.supplier_valuations(sorted(stale))
+        except BaseException:
+            self._stale |= stale
+            raise
+        for supplier in stale:
+            self._valuations.pop(supplier, None)
+        self._valuations.update(
+            (valuation.supplier, valuation) for valuation in valuations
+        )
+        self._valuations = dict(sorted(self._valuations.items()))
+
+
+class SupplierValuationFeed:
+    def __init__(
+        self,
+        cache: SupplierValuationCache,
+        repository,
+        overlap: datetime.timedelta = datetime.timedelta(seconds=5),
+    ):
+        self.cache = cache
+        self.repository = repository
+        self.overlap = overlap
+        self.watermark: Optional[datetime.datetime] = None
+        self._seen: Dict[str, Tuple[datetime.datetime, int]] = {}
+
+    async def poll(self) -> int:
+        since = None if self.watermark is None else self.watermark - self.overlap
+        recent = await self.repository.suppliers_modified_since(since)
+        changed = [
+            supplier
+            for supplier, seen in recent.items()
+            if self._seen.get(supplier) != seen
+        ]
+        self._seen = recent
+        self.cache.invalidate(changed)
+        for modified_at, _ in recent.values():
+            if self.watermark is None or modified_at > self.watermark:
+                self.watermark = modified_at
+        return len(changed)
+
+
+async def setup_supplier_valuation() -> List[PeriodicTask]:
+    cache = SupplierValuationCache.get_instance()
+    feed = SupplierValuationFeed(cache, cache.repository)
+    await feed.poll()
+    return [
+        PeriodicTask(
+            "supplier-valuation-poll",
+            config("SUPPLIER_VALUATION_POLL_INTERVAL", default=1.0, cast=float),
+            feed.poll,
+        )
+    ]
@@ -0,0 +1,68 @@
+import datetime
+
+import pydantic
+import pytest
+
+from src.domain.entities.product import ProductKey
+from src.domain.use_cases.product_bulk_delete import InputProductBulkDeleteDTO
+
+EXPIRATION_DATE = datetime.datetime(2024, 12, 31, tzinfo=datetime.UTC)
+
+
+async def test_execute_deletes_by_keys(product_bulk_delete_use_case_fixture):
+    repository = product_bulk_delete_use_case_fixture.repository
+    repository.remove_many.return_value = ["ASupplier20241231"]
+    input_dto = InputProductBulkDeleteDTO(
+        keys=[
+            {"code": "A", "supplier": "Supplier", "expiration_date": EXPIRATION_DATE},
+            {"code": "B", "supplier": "Supplier", "expiration_date": EXPIRATION_DATE},
+        ]
+    )
+
+    result = await product_bulk_delete_use_case_fixture.execute(input_dto)
+
+    assert result.success is True
+    assert result.deleted == 1
+    repository.remove_many.assert_awaited_once_with(
+        [
+            ProductKey("A", "Supplier", EXPIRATION_DATE),
+            ProductKey("B", "Supplier", EXPIRATION_DATE),
+        ],
+        chunk_size=2,
+    )
+    repository.remove_matching.assert_not_awaited()
+
+
+async def test_execute_deletes_by_filter(product_bulk_delete_use_case_fixture):
+    repository = product_bulk_delete_use_case_fixture.repository
+    repository.remove_matching.return_value = ["A", "B", "C"]
+    input_dto = InputProductBulkDeleteDTO(expired_before=EXPIRATION_DATE)
+
+    result = await product_bulk_delete_use_case_fixture.execute(input_dto)
+
+    assert result.deleted == 3
+    repository.remove_matching.assert_awaited_once_with(
+        supplier=None, expired_before=EXPIRATION_DATE, chunk_size=2
+    )
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {},
+        {
+            "supplier": "Supplier",
+            "keys": [
+                {
+                    "code": "A",
+                    "supplier": "Supplier",
+                    "expiration_date": EXPIRATION_DATE,
+                }
+            ],
+        },
+        {"keys": []},
+    ],
+)
+def test_input_requires_either_keys_or_a_filter(payload):
+    with pytest.raises(pydantic.ValidationError):
+        InputProductBulkDeleteDTO(**payload)
@@ -12,7 +12,6 @@ async def test_execute_product_found(
     expected_product_product_id = make_product_id_from_base(
         "test", "test", datetime.now()
     )
-    product_delete_use_case_fixture.repository.exists_from.return_value = True
     product_delete_use_case_fixture.repository.remove.return_value = (
         expected_product_product_id
     )
@@ -22,39 +21,17 @@ async def test_execute_product_found(
     assert result.success is True
     assert result.product_id == expected_product_product_id
     assert result.msg is None
+    product_delete_use_case_fixture.repository.exists_from.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_execute_product_not_found(
     product_delete_use_case_fixture, input_product_delete_dto_fixture
 ):
-    expected_product_product_id = make_product_id_from_base(
-        "test", "test", datetime.now()
-    )
-    product_delete_use_case_fixture.repository.exists_from.return_value = False
-    product_delete_use_case_fixture.repository.remove.return_value = (
-        expected_product_product_id
-    )
+    product_delete_use_case_fixture.repository.remove.return_value = None
     result = await product_delete_use_case_fixture.execute(
         input_product_delete_dto_fixture
     )
     assert result.success is False
     assert result.product_id is None
     assert result.msg == "Product not exists"
-
-
-@pytest.mark.asyncio
-async def test_execute_product_not_found(
-    product_delete_use_case_fixture, input_product_delete_dto_fixture
-):
-    expected_product_product_id = None
-    product_delete_use_case_fixture.repository.exists_from.return_value = True
-    product_delete_use_case_fixture.repository.remove.return_value = (
-        expected_product_product_id
-    )
-    result = await product_delete_use_case_fixture.execute(
-        input_product_delete_dto_fixture
-    )
-    assert result.success is False
-    assert result.product_id is expected_product_product_id
-    assert result.msg == "product not deleted"
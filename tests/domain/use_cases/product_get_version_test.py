@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from src.domain.entities.product import ProductVersion
+from src.domain.use_cases.product_get import InputProductGetDTO
+
+
+async def test_execute_version_found(product_get_version_use_case_fixture):
+    input_dto = InputProductGetDTO(
+        code="123",
+        supplier="Test Supplier",
+        expiration_date=datetime.now(),
+    )
+    version = ProductVersion("123Test Supplier20241231", datetime.now(), 10)
+    product_get_version_use_case_fixture.repository.get_version_by_code_supplier_expiration.return_value = (
+        version
+    )
+    result = await product_get_version_use_case_fixture.execute(input_dto)
+    assert result.success is True
+    assert result.version == version
+    assert result.msg is None
+
+
+async def test_execute_version_not_found(product_get_version_use_case_fixture):
+    input_dto = InputProductGetDTO(
+        code="123",
+        supplier="Test Supplier",
+        expiration_date=datetime.now(),
+    )
+    product_get_version_use_case_fixture.repository.get_version_by_code_supplier_expiration.return_value = (
+        None
+    )
+    result = await product_get_version_use_case_fixture.execute(input_dto)
+    assert result.success is False
+    assert result.version is None
+    assert result.msg == "product does not exists"
@@ -0,0 +1,316 @@
+import datetime
+
+import pydantic
+import pytest
+
+from src.domain.entities.inventory import InventoryChange
+from src.domain.entities.product import ProductKey
+from src.domain.exceptions import (
+    InsufficientInventoryError,
+    InventoryEventsFailedError,
+    ProductNotFoundError,
+)
+from src.domain.use_cases.product_inventory_processor import (
+    InputInventoryProcessorDTO,
+    InventoryAction,
+    InventoryLine,
+    RecentEventIds,
+)
+
+EXPIRATION_DATE = datetime.datetime(2024, 12, 31)
+PRODUCT_KEY = ProductKey("ABC123", "Supplier", EXPIRATION_DATE)
+
+
+def make_input_dto(action: InventoryAction, quantity: int = 1, event_id=None):
+    return InputInventoryProcessorDTO(
+        code="ABC123",
+        supplier="Supplier",
+        expiration_date=EXPIRATION_DATE,
+        action=action,
+        quantity=quantity,
+        event_id=event_id,
+    )
+
+
+@pytest.mark.parametrize(
+    "action, quantity, expected_quantity",
+    [
+        pytest.param(InventoryAction.ADD, 1, 1, id="add_one"),
+        pytest.param(InventoryAction.ADD, 500, 500, id="add_pallet"),
+        pytest.param(InventoryAction.REMOVE, 3, -3, id="remove_many"),
+    ],
+)
+async def test_execute_single_product_change(
+    product_inventory_processor_use_case_fixture, action, quantity, expected_quantity
+):
+    repository = product_inventory_processor_use_case_fixture.repository
+    repository.apply_inventory_changes.return_value = []
+
+    await product_inventory_processor_use_case_fixture.execute(
+        make_input_dto(action, quantity)
+    )
+
+    repository.apply_inventory_changes.assert_awaited_once_with(
+        [InventoryChange(PRODUCT_KEY, expected_quantity)], event_id=None
+    )
+    repository.missing_from.assert_not_awaited()
+
+
+async def test_execute_multiple_lines_in_one_call(
+    product_inventory_processor_use_case_fixture,
+):
+    repository = product_inventory_processor_use_case_fixture.repository
+    repository.apply_inventory_changes.return_value = []
+    input_dto = InputInventoryProcessorDTO(
+        lines=[
+            InventoryLine(
+                code="ABC123",
+                supplier="Supplier",
+                expiration_date=EXPIRATION_DATE,
+                quantity=10,
+            ),
+            InventoryLine(
+                code="XYZ789",
+                supplier="Supplier",
+                expiration_date=EXPIRATION_DATE,
+                quantity=-2,
+            ),
+        ]
+    )
+
+    await product_inventory_processor_use_case_fixture.execute(input_dto)
+
+    repository.apply_inventory_changes.assert_awaited_once_with(
+        [
+            InventoryChange(PRODUCT_KEY, 10),
+            InventoryChange(ProductKey("XYZ789", "Supplier", EXPIRATION_DATE), -2),
+        ],
+        event_id=None,
+    )
+
+
+async def test_execute_product_not_found_is_not_retryable(
+    product_inventory_processor_use_case_fixture,
+):
+    repository = product_inventory_processor_use_case_fixture.repository
+    repository.apply_inventory_changes.return_value = [PRODUCT_KEY]
+    repository.missing_from.return_value = [PRODUCT_KEY]
+
+    with pytest.raises(ProductNotFoundError) as error:
+        await product_inventory_processor_use_case_fixture.execute(
+            make_input_dto(InventoryAction.REMOVE)
+        )
+
+    assert error.value.retryable is False
+
+
+async def test_execute_insufficient_inventory_is_retryable(
+    product_inventory_processor_use_case_fixture,
+):
+    repository = product_inventory_processor_use_case_fixture.repository
+    repository.apply_inventory_changes.return_value = [PRODUCT_KEY]
+    repository.missing_from.return_value = []
+
+    with pytest.raises(InsufficientInventoryError) as error:
+        await product_inventory_processor_use_case_fixture.execute(
+            make_input_dto(InventoryAction.REMOVE)
+        )
+
+    assert error.value.retryable is True
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        pytest.param({}, id="no_product_and_no_lines"),
+        pytest.param(
+            {
+                "code": "ABC123",
+                "action": InventoryAction.ADD,
+                "lines": [
+                    {
+                        "code": "XYZ789",
+                        "supplier": "Supplier",
+                        "expiration_date": EXPIRATION_DATE,
+                        "quantity": 1,
+                    }
+                ],
+            },
+            id="partial_product_with_lines",
+        ),
+        pytest.param(
+            {
+                "code": "ABC123",
+                "supplier": "Supplier",
+                "expiration_date": EXPIRATION_DATE,
+            },
+            id="product_without_action",
+        ),
+        pytest.param(
+            {
+                "code": "ABC123",
+                "supplier": "Supplier",
+                "expiration_date": EXPIRATION_DATE,
+                "action": InventoryAction.ADD,
+                "quantity": 0,
+            },
+            id="non_positive_quantity_with_action",
+        ),
+        pytest.param(
+            {
+                "code": "ABC123",
+                "supplier": "Supplier",
+                "expiration_date": EXPIRATION_DATE,
+                "action": InventoryAction.ADD,
+                "quantity": 3_000_000_000,
+            },
+            id="quantity_above_int32",
+        ),
+        pytest.param(
+            {
+                "lines": [
+                    {
+                        "code": "XYZ789",
+                        "supplier": "Supplier",
+                        "expiration_date": EXPIRATION_DATE,
+                        "quantity": 1,
+                    }
+                ],
+                "events": [{"lines": [], "code": "ABC123"}],
+            },
+            id="events_with_lines",
+        ),
+        pytest.param(
+            {
+                "events": [
+                    {
+                        "events": [
+                            {
+                                "code": "ABC123",
+                                "supplier": "Supplier",
+                                "expiration_date": EXPIRATION_DATE,
+                                "action": InventoryAction.ADD,
+                            }
+                        ]
+                    }
+                ]
+            },
+            id="nested_events",
+        ),
+        pytest.param(
+            {
+                "lines": [
+                    {
+                        "code": "XYZ789",
+                        "supplier": "Supplier",
+                        "expiration_date": EXPIRATION_DATE,
+                        "quantity": -3_000_000_000,
+                    }
+                ]
+            },
+            id="line_quantity_below_int32",
+        ),
+        pytest.param(
+            {
+                "lines": [
+                    {
+                        "code": "XYZ789",
+                        "supplier": "Supplier",
+                        "expiration_date": EXPIRATION_DATE,
+                        "quantity": 1,
+                    }
+                ]
+                * 1001
+            },
+            id="too_many_lines",
+        ),
+        pytest.param(
+            {
+                "code": "A" * 51,
+                "supplier": "Supplier",
+                "expiration_date": EXPIRATION_DATE,
+                "action": InventoryAction.ADD,
+            },
+            id="code_longer_than_the_column",
+        ),
+    ],
+)
+def test_input_dto_rejects(fields):
+    with pytest.raises(pydantic.ValidationError):
+        InputInventoryProcessorDTO(**fields)
+
+
+async def test_execute_applies_each_event_of_a_message_on_its_own(
+    product_inventory_processor_use_case_fixture,
+):
+    repository = product_inventory_processor_use_case_fixture.repository
+    repository.apply_inventory_changes.side_effect = [[], [PRODUCT_KEY], []]
+    repository.missing_from.return_value = []
+    input_dto = InputInventoryProcessorDTO(
+        events=[
+            make_input_dto(InventoryAction.ADD, event_id="scan-1"),
+            make_input_dto(InventoryAction.REMOVE, 5, event_id="scan-2"),
+            make_input_dto(InventoryAction.ADD, event_id="scan-3"),
+        ]
+    )
+
+    with pytest.raises(InventoryEventsFailedError) as error:
+        await product_inventory_processor_use_case_fixture.execute(input_dto)
+
+    assert [
+        call.kwargs["event_id"]
+        for call in repository.apply_inventory_changes.call_args_list
+    ] == ["scan-1", "scan-2", "scan-3"]
+    assert list(error.value.failures) == ["scan-2"]
+    assert error.value.retryable is True
+
+    repository.apply_inventory_changes.side_effect = None
+    repository.apply_inventory_changes.return_value = []
+    await product_inventory_processor_use_case_fixture.execute(input_dto)
+
+    assert repository.apply_inventory_changes.call_args.kwargs["event_id"] == "scan-2"
+    assert repository.apply_inventory_changes.await_count == 4
+
+
+async def test_execute_skips_recently_applied_event(
+    product_inventory_processor_use_case_fixture,
+):
+    repository = product_inventory_processor_use_case_fixture.repository
+    repository.apply_inventory_changes.return_value = []
+    input_dto = make_input_dto(InventoryAction.ADD)
+    input_dto.event_id = "event-1"
+
+    await product_inventory_processor_use_case_fixture.execute(input_dto)
+    await product_inventory_processor_use_case_fixture.execute(input_dto)
+
+    repository.apply_inventory_changes.assert_awaited_once_with(
+        [InventoryChange(PRODUCT_KEY, 1)], event_id="event-1"
+    )
+
+
+async def test_execute_rejected_event_is_not_remembered(
+    product_inventory_processor_use_case_fixture,
+):
+    repository = product_inventory_processor_use_case_fixture.repository
+    repository.apply_inventory_changes.return_value = [PRODUCT_KEY]
+    repository.missing_from.return_value = []
+    input_dto = make_input_dto(InventoryAction.REMOVE)
+    input_dto.event_id = "event-1"
+
+    for _ in range(2):
+        with pytest.raises(InsufficientInventoryError):
+            await product_inventory_processor_use_case_fixture.execute(input_dto)
+
+    assert repository.apply_inventory_changes.await_count == 2
+
+
+def test_recent_event_ids_evicts_least_recently_used():
+    recent = RecentEventIds(max_size=2)
+    recent.add("a")
+    recent.add("b")
+    assert "a" in recent
+    recent.add("c")
+
+    assert "a" in recent
+    assert "b" not in recent
+    assert "c" in recent
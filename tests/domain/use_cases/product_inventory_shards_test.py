@@ -0,0 +1,49 @@
+import datetime
+
+import pydantic
+import pytest
+
+from src.domain.use_cases.product_inventory_shards import (
+    InputProductInventoryShardsDTO,
+)
+
+
+def make_input(shards):
+    return InputProductInventoryShardsDTO(
+        code="ABC123",
+        supplier="Supplier",
+        expiration_date=datetime.datetime(2024, 12, 31),
+        shards=shards,
+    )
+
+
+async def test_execute_sets_inventory_shards(
+    product_inventory_shards_use_case_fixture,
+):
+    repository = product_inventory_shards_use_case_fixture.repository
+    repository.set_inventory_shards.return_value = True
+
+    result = await product_inventory_shards_use_case_fixture.execute(make_input(8))
+
+    assert result.success is True
+    repository.set_inventory_shards.assert_awaited_once_with(
+        code="ABC123",
+        supplier="Supplier",
+        expiration_date=datetime.datetime(2024, 12, 31),
+        shards=8,
+    )
+
+
+async def test_execute_product_not_found(product_inventory_shards_use_case_fixture):
+    repository = product_inventory_shards_use_case_fixture.repository
+    repository.set_inventory_shards.return_value = False
+
+    result = await product_inventory_shards_use_case_fixture.execute(make_input(0))
+
+    assert result.success is False
+    assert result.msg == "product does not exists"
+
+
+def test_input_rejects_negative_shards():
+    with pytest.raises(pydantic.ValidationError):
+        make_input(-1)
@@ -0,0 +1,51 @@
+import pydantic
+import pytest
+
+from src.domain.entities.product import ProductKey
+from src.domain.use_cases.product_get import InputProductGetDTO
+from src.domain.use_cases.product_lookup import (
+    MAX_LOOKUP_KEYS,
+    InputProductLookupDTO,
+)
+
+
+def make_key(code):
+    return InputProductGetDTO(
+        code=code, supplier="Supplier", expiration_date="2024-12-31T23:59:59"
+    )
+
+
+async def test_execute_keeps_request_order_and_marks_missing_products(
+    product_lookup_use_case_fixture, product_fake_fixture
+):
+    product_lookup_use_case_fixture.repository.get_many.return_value = [
+        None,
+        product_fake_fixture,
+        None,
+    ]
+    input_dto = InputProductLookupDTO(
+        keys=[make_key("B"), make_key("A"), make_key("B")]
+    )
+
+    result = await product_lookup_use_case_fixture.execute(input_dto)
+
+    assert result.success == True
+    assert [item.code for item in result.results] == ["B", "A", "B"]
+    assert [item.found for item in result.results] == [False, True, False]
+    assert result.results[0].product == None
+    assert result.results[1].product == product_fake_fixture
+    product_lookup_use_case_fixture.repository.get_many.assert_awaited_once_with(
+        [
+            ProductKey("B", "Supplier", input_dto.keys[0].expiration_date),
+            ProductKey("A", "Supplier", input_dto.keys[0].expiration_date),
+            ProductKey("B", "Supplier", input_dto.keys[0].expiration_date),
+        ]
+    )
+
+
+def test_input_rejects_empty_and_oversized_lookups():
+    with pytest.raises(pydantic.ValidationError):
+        InputProductLookupDTO(keys=[])
+
+    with pytest.raises(pydantic.ValidationError):
+        InputProductLookupDTO(keys=[make_key("A")] * (MAX_LOOKUP_KEYS + 1))
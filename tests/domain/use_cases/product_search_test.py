@@ -0,0 +1,28 @@
+from unittest.mock import AsyncMock
+
+from src.domain.contracts.repositories.product_search_repository import (
+    IProductSearchRepository,
+)
+from src.domain.entities.product import ProductSearchPage
+from src.domain.use_cases.product_search import (
+    InputProductSearchDTO,
+    ProductSearchUseCase,
+)
+
+
+async def test_execute_search_translates_the_page(product_fake_fixture):
+    search_repository = AsyncMock(spec=IProductSearchRepository)
+    search_repository.search.return_value = ProductSearchPage(
+        products=[product_fake_fixture], total=21
+    )
+    use_case = ProductSearchUseCase(search_repository)
+
+    result = await use_case.execute(
+        InputProductSearchDTO(query="test", page=3, page_size=10)
+    )
+
+    search_repository.search.assert_awaited_once_with(query="test", offset=20, limit=10)
+    assert result.success is True
+    assert result.products == [product_fake_fixture]
+    assert result.total == 21
+    assert result.page == 3
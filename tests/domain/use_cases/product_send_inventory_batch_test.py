@@ -0,0 +1,145 @@
+import datetime
+
+import pydantic
+import pytest
+
+from src.domain.contracts.repositories.inventory_repository import IInventoryRepository
+from src.domain.entities.inventory import InventoryChange
+from src.domain.entities.product import ProductKey
+from src.domain.use_cases.product_inventory_processor import (
+    InventoryAction,
+    InventoryProcessorUseCase,
+)
+from src.domain.use_cases.product_send_inventory import InputProductSendInventoryDTO
+from src.domain.use_cases.product_send_inventory_batch import (
+    InputProductSendInventoryBatchDTO,
+    ProductSendInventoryBatchUseCase,
+)
+
+EXPIRATION_DATE = datetime.datetime(2024, 12, 31)
+
+
+def make_item(code: str, quantity: int = 1, event_id=None):
+    return InputProductSendInventoryDTO(
+        code=code,
+        supplier="Supplier",
+        expiration_date=EXPIRATION_DATE,
+        action=InventoryAction.ADD,
+        quantity=quantity,
+        event_id=event_id,
+    )
+
+
+class FlakyBrokerRepository(IInventoryRepository):
+    def __init__(self, processor: InventoryProcessorUseCase, fail_on_call: int):
+        self.processor = processor
+        self.fail_on_call = fail_on_call
+        self.calls = 0
+
+    async def send(self, dto):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise ConnectionError("broker unavailable")
+        await self.processor.execute(dto)
+
+
+async def test_execute_checks_existence_once_and_reports_per_item(
+    product_send_inventory_batch_use_case_fixture,
+):
+    use_case = product_send_inventory_batch_use_case_fixture
+    use_case.product_repository.missing_from.return_value = [
+        ProductKey("MISSING", "Supplier", EXPIRATION_DATE)
+    ]
+    input_dto = InputProductSendInventoryBatchDTO(
+        items=[make_item("A"), make_item("MISSING"), make_item("B", 5)]
+    )
+
+    result = await use_case.execute(input_dto)
+
+    use_case.product_repository.missing_from.assert_awaited_once()
+    assert result.success is True
+    assert [item.success for item in result.results] == [True, False, True]
+    assert result.results[1].message == "product not exists"
+
+
+async def test_execute_packs_items_as_events_of_a_few_messages(
+    product_send_inventory_batch_use_case_fixture,
+):
+    use_case = product_send_inventory_batch_use_case_fixture
+    use_case.events_per_message = 2
+    use_case.product_repository.missing_from.return_value = []
+    input_dto = InputProductSendInventoryBatchDTO(
+        items=[make_item("A"), make_item("B", 5), make_item("C", event_id="scan-3")]
+    )
+
+    await use_case.execute(input_dto)
+
+    sent = [call.args[0] for call in use_case.repository.send.call_args_list]
+    assert [
+        [[(line.code, line.quantity) for line in event.lines] for event in dto.events]
+        for dto in sent
+    ] == [[[("A", 1)], [("B", 5)]], [[("C", 1)]]]
+    event_ids = [event.event_id for dto in sent for event in dto.events]
+    assert all(event_ids) and len(set(event_ids)) == 3
+    assert event_ids[2] == "scan-3"
+
+
+async def test_execute_nothing_sent_when_all_products_are_missing(
+    product_send_inventory_batch_use_case_fixture,
+):
+    use_case = product_send_inventory_batch_use_case_fixture
+    use_case.product_repository.missing_from.return_value = [
+        ProductKey("A", "Supplier", EXPIRATION_DATE)
+    ]
+
+    result = await use_case.execute(
+        InputProductSendInventoryBatchDTO(items=[make_item("A")])
+    )
+
+    assert result.success is False
+    use_case.repository.send.assert_not_awaited()
+
+
+async def test_retried_batch_is_not_applied_twice(product_repository_fixture):
+    product_repository_fixture.missing_from.return_value = []
+    product_repository_fixture.apply_inventory_changes.return_value = []
+    processor = InventoryProcessorUseCase(product_repository_fixture)
+    use_case = ProductSendInventoryBatchUseCase(
+        FlakyBrokerRepository(processor, fail_on_call=2),
+        product_repository_fixture,
+        events_per_message=2,
+    )
+    input_dto = InputProductSendInventoryBatchDTO(
+        items=[
+            make_item("A", event_id="scan-1"),
+            make_item("B", event_id="scan-2"),
+            make_item("C", event_id="scan-3"),
+        ]
+    )
+
+    with pytest.raises(ConnectionError):
+        await use_case.execute(input_dto)
+    result = await use_case.execute(input_dto)
+
+    assert [item.success for item in result.results] == [True, True, True]
+    applied = [
+        (call.args[0], call.kwargs["event_id"])
+        for call in product_repository_fixture.apply_inventory_changes.call_args_list
+    ]
+    assert applied == [
+        ([InventoryChange(ProductKey("A", "Supplier", EXPIRATION_DATE), 1)], "scan-1"),
+        ([InventoryChange(ProductKey("B", "Supplier", EXPIRATION_DATE), 1)], "scan-2"),
+        ([InventoryChange(ProductKey("C", "Supplier", EXPIRATION_DATE), 1)], "scan-3"),
+    ]
+
+
+def test_input_rejects_repeated_event_ids():
+    with pytest.raises(pydantic.ValidationError):
+        InputProductSendInventoryBatchDTO(
+            items=[make_item("A", event_id="scan-1"), make_item("B", event_id="scan-1")]
+        )
+
+
+def test_input_rejects_events_from_clients():
+    with pytest.raises(pydantic.ValidationError):
+        InputProductSendInventoryDTO(events=[make_item("A")])
@@ -0,0 +1,52 @@
+import datetime
+
+from src.domain.entities.product import ProductKey
+from src.domain.use_cases.product_inventory_processor import InventoryLine
+from src.domain.use_cases.product_send_inventory import InputProductSendInventoryDTO
+
+EXPIRATION_DATE = datetime.datetime(2024, 12, 31)
+
+
+def make_input_dto():
+    return InputProductSendInventoryDTO(
+        lines=[
+            InventoryLine(
+                code="ABC123",
+                supplier="Supplier",
+                expiration_date=EXPIRATION_DATE,
+                quantity=500,
+            ),
+            InventoryLine(
+                code="XYZ789",
+                supplier="Supplier",
+                expiration_date=EXPIRATION_DATE,
+                quantity=250,
+            ),
+        ]
+    )
+
+
+async def test_execute_sends_all_lines_in_one_event(
+    product_send_inventory_use_case_fixture,
+):
+    product_send_inventory_use_case_fixture.product_repository.missing_from.return_value = (
+        []
+    )
+
+    result = await product_send_inventory_use_case_fixture.execute(make_input_dto())
+
+    assert result.success is True
+    sent_dto = product_send_inventory_use_case_fixture.repository.send.call_args.args[0]
+    assert [line.quantity for line in sent_dto.lines] == [500, 250]
+
+
+async def test_execute_product_not_exists(product_send_inventory_use_case_fixture):
+    product_send_inventory_use_case_fixture.product_repository.missing_from.return_value = [
+        ProductKey("XYZ789", "Supplier", EXPIRATION_DATE)
+    ]
+
+    result = await product_send_inventory_use_case_fixture.execute(make_input_dto())
+
+    assert result.success is False
+    assert result.message == "product not exists"
+    product_send_inventory_use_case_fixture.repository.send.assert_not_awaited()
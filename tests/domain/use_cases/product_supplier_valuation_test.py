@@ -0,0 +1,57 @@
+from src.domain.entities.product import SupplierValuation
+from src.domain.use_cases.product_supplier_valuation import (
+    InputProductSupplierValuationDTO,
+)
+
+VALUATION = SupplierValuation(
+    supplier="Supplier",
+    products=2,
+    inventory_quantity=10,
+    stock_value=100.0,
+    potential_revenue=150.0,
+    margin=50.0,
+    weight_in_kilograms=5.0,
+)
+
+
+async def test_execute_returns_every_supplier(
+    product_supplier_valuation_use_case_fixture,
+):
+    repository = product_supplier_valuation_use_case_fixture.repository
+    repository.supplier_valuations.return_value = [VALUATION]
+
+    result = await product_supplier_valuation_use_case_fixture.execute(
+        InputProductSupplierValuationDTO()
+    )
+
+    assert result.success == True
+    assert result.valuations == [VALUATION]
+    repository.supplier_valuations.assert_awaited_once_with()
+
+
+async def test_execute_filters_by_supplier(
+    product_supplier_valuation_use_case_fixture,
+):
+    repository = product_supplier_valuation_use_case_fixture.repository
+    repository.supplier_valuations.return_value = [VALUATION]
+
+    result = await product_supplier_valuation_use_case_fixture.execute(
+        InputProductSupplierValuationDTO(supplier="Supplier")
+    )
+
+    assert result.success == True
+    assert result.valuations == [VALUATION]
+    repository.supplier_valuations.assert_awaited_once_with(["Supplier"])
+
+
+async def test_execute_unknown_supplier(product_supplier_valuation_use_case_fixture):
+    repository = product_supplier_valuation_use_case_fixture.repository
+    repository.supplier_valuations.return_value = []
+
+    result = await product_supplier_valuation_use_case_fixture.execute(
+        InputProductSupplierValuationDTO(supplier="Nobody")
+    )
+
+    assert result.success == False
+    assert result.msg == "supplier has no products"
+    assert result.valuations == []
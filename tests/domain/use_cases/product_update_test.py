@@ -1,7 +1,6 @@
-from src.domain.entities.product import Product
-from src.domain.contracts.repositories.product_repository import IProductRepository
-from unittest.mock import MagicMock, AsyncMock
+import pytest
 
+from src.domain.exceptions import ConcurrentUpdateError
 from src.domain.use_cases.product_update import (
     InputProductUpdateDTO,
     UpdatableInformation,
@@ -9,9 +8,24 @@ from src.domain.use_cases.product_update import (
 
 
 async def test_execute_product_not_found(product_update_use_case_fixture):
-    product_update_use_case_fixture.repository.get_by_code_supplier_expiration.return_value = (
-        None
+    product_update_use_case_fixture.repository.patch.return_value = None
+    input_dto = InputProductUpdateDTO(
+        code="123",
+        supplier="Supplier",
+        expiration_date="2024-12-31T23:59:59",
+        update=UpdatableInformation(title="New Title"),
     )
+
+    result = await product_update_use_case_fixture.execute(input_dto)
+    assert result.success == False
+    assert result.msg == "Product not found"
+    assert result.product == None
+
+
+async def test_execute_product_not_found_without_information(
+    product_update_use_case_fixture,
+):
+    product_update_use_case_fixture.repository.exists_from.return_value = False
     input_dto = InputProductUpdateDTO(
         code="123",
         supplier="Supplier",
@@ -29,11 +43,11 @@ async def test_execute_product_not_found(product_update_use_case_fixture):
     assert result.success == False
     assert result.msg == "Product not found"
     assert result.product == None
+    product_update_use_case_fixture.repository.patch.assert_not_awaited()
 
 
-async def test_execute_no_information_to_update(
-    product_update_use_case_fixture, product_fake_fixture
-):
+async def test_execute_no_information_to_update(product_update_use_case_fixture):
+    product_update_use_case_fixture.repository.exists_from.return_value = True
     input_dto = InputProductUpdateDTO(
         code="123",
         supplier="Supplier",
@@ -46,24 +60,17 @@ async def test_execute_no_information_to_update(
             sell_price=None,
         ),
     )
-    product_update_use_case_fixture.repository.get_by_code_supplier_expiration.return_value = (
-        product_fake_fixture
-    )
 
     result = await product_update_use_case_fixture.execute(input_dto)
     assert result.success == False
     assert result.msg == "This request no contains information to update"
+    product_update_use_case_fixture.repository.patch.assert_not_awaited()
 
 
 async def test_execute_update_successfully(
     product_update_use_case_fixture, product_fake_fixture
 ):
-    product_update_use_case_fixture.repository.get_by_code_supplier_expiration.return_value = (
-        product_fake_fixture
-    )
-    product_update_use_case_fixture.repository.update.return_value = (
-        product_fake_fixture
-    )
+    product_update_use_case_fixture.repository.patch.return_value = product_fake_fixture
     input_dto = InputProductUpdateDTO(
         code="123",
         supplier="Supplier",
@@ -80,6 +87,50 @@ async def test_execute_update_successfully(
     result = await product_update_use_case_fixture.execute(input_dto)
     assert result.success == True
     assert result.msg == None
-    assert result.product.title == "New Title"
-    assert result.product.buy_price == 15.0
-    assert result.product.weight_in_kilograms == 2.0
+    assert result.product == product_fake_fixture
+    product_update_use_case_fixture.repository.patch.assert_awaited_once_with(
+        "123",
+        "Supplier",
+        input_dto.expiration_date,
+        {"title": "New Title", "buy_price": 15.0, "weight_in_kilograms": 2.0},
+        version=None,
+    )
+
+
+async def test_execute_sends_zero_and_empty_values(
+    product_update_use_case_fixture, product_fake_fixture
+):
+    product_update_use_case_fixture.repository.patch.return_value = product_fake_fixture
+    input_dto = InputProductUpdateDTO(
+        code="123",
+        supplier="Supplier",
+        expiration_date="2024-12-31T23:59:59",
+        update=UpdatableInformation(description="", buy_price=0),
+        version=7,
+    )
+
+    result = await product_update_use_case_fixture.execute(input_dto)
+    assert result.success == True
+    product_update_use_case_fixture.repository.patch.assert_awaited_once_with(
+        "123",
+        "Supplier",
+        input_dto.expiration_date,
+        {"description": "", "buy_price": 0},
+        version=7,
+    )
+
+
+async def test_execute_propagates_version_conflicts(product_update_use_case_fixture):
+    product_update_use_case_fixture.repository.patch.side_effect = (
+        ConcurrentUpdateError()
+    )
+    input_dto = InputProductUpdateDTO(
+        code="123",
+        supplier="Supplier",
+        expiration_date="2024-12-31T23:59:59",
+        update=UpdatableInformation(title="New Title"),
+        version=4,
+    )
+
+    with pytest.raises(ConcurrentUpdateError):
+        await product_update_use_case_fixture.execute(input_dto)
@@ -5,8 +5,10 @@ import pytest
 from src.domain.contracts.repositories.health_check_repository import (
     IHealthCheckRepository,
 )
+from src.domain.contracts.repositories.inventory_repository import IInventoryRepository
 from src.domain.contracts.repositories.product_repository import IProductRepository
 from src.domain.entities.product import Product
+from src.domain.use_cases.product_bulk_delete import ProductBulkDeleteUseCase
 from src.domain.use_cases.product_create import (
     ProductCreateUseCase,
     InputProductCreateDTO,
@@ -16,6 +18,21 @@ from src.domain.use_cases.product_delete import (
     ProductDeleteUseCase,
 )
 from src.domain.use_cases.product_get import ProductGetUseCase
+from src.domain.use_cases.product_get_version import ProductGetVersionUseCase
+from src.domain.use_cases.product_inventory_processor import (
+    InventoryProcessorUseCase,
+)
+from src.domain.use_cases.product_inventory_shards import (
+    ProductInventoryShardsUseCase,
+)
+from src.domain.use_cases.product_lookup import ProductLookupUseCase
+from src.domain.use_cases.product_send_inventory import ProductSendInventoryUseCase
+from src.domain.use_cases.product_send_inventory_batch import (
+    ProductSendInventoryBatchUseCase,
+)
+from src.domain.use_cases.product_supplier_valuation import (
+    ProductSupplierValuationUseCase,
+)
 from src.domain.use_cases.product_update import ProductUpdateUseCase
 
 
@@ -29,6 +46,11 @@ def product_repository_fixture():
     return AsyncMock(spec=IProductRepository)
 
 
+@pytest.fixture
+def inventory_repository_fixture():
+    return AsyncMock(spec=IInventoryRepository)
+
+
 @pytest.fixture
 def product_use_case_fixture(product_repository_fixture):
     return ProductCreateUseCase(product_repository_fixture)
@@ -39,6 +61,11 @@ def product_delete_use_case_fixture(product_repository_fixture):
     return ProductDeleteUseCase(repository=product_repository_fixture)
 
 
+@pytest.fixture
+def product_bulk_delete_use_case_fixture(product_repository_fixture):
+    return ProductBulkDeleteUseCase(repository=product_repository_fixture, chunk_size=2)
+
+
 @pytest.fixture
 def product_update_use_case_fixture(product_repository_fixture):
     return ProductUpdateUseCase(repository=product_repository_fixture)
@@ -49,6 +76,49 @@ def product_get_use_case_fixture(product_repository_fixture):
     return ProductGetUseCase(product_repository_fixture)
 
 
+@pytest.fixture
+def product_get_version_use_case_fixture(product_repository_fixture):
+    return ProductGetVersionUseCase(product_repository_fixture)
+
+
+@pytest.fixture
+def product_lookup_use_case_fixture(product_repository_fixture):
+    return ProductLookupUseCase(product_repository_fixture)
+
+
+@pytest.fixture
+def product_supplier_valuation_use_case_fixture(product_repository_fixture):
+    return ProductSupplierValuationUseCase(product_repository_fixture)
+
+
+@pytest.fixture
+def product_inventory_processor_use_case_fixture(product_repository_fixture):
+    return InventoryProcessorUseCase(product_repository_fixture)
+
+
+@pytest.fixture
+def product_inventory_shards_use_case_fixture(product_repository_fixture):
+    return ProductInventoryShardsUseCase(product_repository_fixture)
+
+
+@pytest.fixture
+def product_send_inventory_use_case_fixture(
+    inventory_repository_fixture, product_repository_fixture
+):
+    return ProductSendInventoryUseCase(
+        inventory_repository_fixture, product_repository_fixture
+    )
+
+
+@pytest.fixture
+def product_send_inventory_batch_use_case_fixture(
+    inventory_repository_fixture, product_repository_fixture
+):
+    return ProductSendInventoryBatchUseCase(
+        inventory_repository_fixture, product_repository_fixture
+    )
+
+
 @pytest.fixture
 def input_product_delete_dto_fixture():
     return InputProductDeleteDTO(
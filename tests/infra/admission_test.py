@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.infra.http.admission import (
+    AdmissionControlMiddleware,
+    AimdLimit,
+    ConcurrencyLimiter,
+)
+
+
+def test_aimd_limit_backs_off_on_slow_or_failed_requests():
+    limit = AimdLimit(initial=10, min_limit=2)
+    limit.update(latency=0.01, in_flight=10, failed=False)
+    grown = limit.value
+
+    limit.update(latency=0.5, in_flight=10, failed=False)
+    slowed = limit.value
+    limit.update(latency=0.01, in_flight=10, failed=True)
+
+    assert grown > 10
+    assert slowed == pytest.approx(grown * 0.9)
+    assert limit.value == pytest.approx(slowed * 0.9)
+
+
+def test_aimd_limit_respects_bounds():
+    limit = AimdLimit(initial=3, min_limit=2, max_limit=3)
+    for _ in range(10):
+        limit.update(latency=0.01, in_flight=3, failed=True)
+    assert limit.value == 2
+
+    for _ in range(100):
+        limit.update(latency=0.01, in_flight=3, failed=False)
+    assert limit.value == 3
+
+
+async def test_limiter_queues_until_a_slot_is_released():
+    limiter = ConcurrencyLimiter(AimdLimit(initial=1), queue_timeout=1, max_queue=1)
+    assert await limiter.acquire()
+
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not await limiter.acquire()
+
+    limiter.release(latency=0.01, failed=False)
+
+    assert await waiting
+    assert limiter.in_flight == 1
+
+
+async def test_limiter_sheds_after_queue_timeout():
+    limiter = ConcurrencyLimiter(AimdLimit(initial=1), queue_timeout=0.01, max_queue=10)
+    assert await limiter.acquire()
+
+    assert not await limiter.acquire()
+    assert limiter.in_flight == 1
+
+
+def make_client(limit):
+    app = FastAPI()
+
+    @app.get("/api/product/")
+    async def product():
+        return {"ok": True}
+
+    @app.get("/api/health/")
+    async def health():
+        return {"ok": True}
+
+    limiter = ConcurrencyLimiter(AimdLimit(initial=limit), queue_timeout=0, max_queue=0)
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        limiters={"product": limiter, "default": limiter},
+        routes=[("/api/product", "product")],
+        default_group="default",
+        bypass_prefixes=["/api/health"],
+        retry_after=2,
+    )
+    return TestClient(app)
+
+
+def test_middleware_sheds_with_retry_after_and_bypasses_health():
+    client = make_client(limit=0)
+
+    shed = client.get("/api/product/")
+    health = client.get("/api/health/")
+
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "2"
+    assert health.status_code == 200
+
+
+def test_middleware_admits_within_limit():
+    client = make_client(limit=5)
+
+    assert client.get("/api/product/").status_code == 200
@@ -0,0 +1,179 @@
+import asyncio
+import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.domain.exceptions import PublishBufferFullError
+from src.domain.use_cases.product_inventory_processor import (
+    InputInventoryProcessorDTO,
+    InventoryAction,
+)
+from src.infra.amqp.codecs import CodecError
+from src.infra.amqp.repositories.buffered_inventory_repository import (
+    BufferedInventoryRepository,
+    OverflowPolicy,
+)
+
+
+class GatedRepository:
+    def __init__(self):
+        self.sent = []
+        self.open = asyncio.Event()
+        self.flush = AsyncMock(return_value=0)
+
+    async def send_many(self, dtos):
+        await self.open.wait()
+        self.sent.extend(dtos)
+
+
+def make_dto(quantity=1):
+    return InputInventoryProcessorDTO(
+        code="ABC123",
+        supplier="Supplier",
+        expiration_date=datetime.datetime(2024, 12, 31),
+        action=InventoryAction.ADD,
+        quantity=quantity,
+    )
+
+
+async def test_send_returns_before_publish_and_flush_drains():
+    inner = GatedRepository()
+    repository = BufferedInventoryRepository(inner, max_size=10)
+
+    await repository.send(make_dto(1))
+    await repository.send(make_dto(2))
+    assert inner.sent == []
+
+    inner.open.set()
+    not_flushed = await repository.flush(timeout=1)
+
+    assert not_flushed == 0
+    assert [dto.quantity for dto in inner.sent] == [1, 2]
+    assert all(dto.event_id for dto in inner.sent)
+
+
+class UnavailableBroker:
+    def __init__(self):
+        self.attempts = 0
+        self.flush = AsyncMock(return_value=0)
+
+    async def send_many(self, dtos):
+        self.attempts += 1
+        raise ConnectionError()
+
+
+async def test_age_gauge_keeps_growing_while_publish_retries():
+    inner = UnavailableBroker()
+    repository = BufferedInventoryRepository(inner, retry_delay=0.01)
+
+    await repository.send(make_dto())
+    while inner.attempts < 2:
+        await asyncio.sleep(0.005)
+    first_age = repository._age.value
+    while inner.attempts < 4:
+        await asyncio.sleep(0.005)
+
+    assert repository._depth.value == 1
+    assert repository._age.value > first_age > 0
+    await repository.flush(timeout=0)
+
+
+class FlakyBroker:
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = []
+        self.sent = []
+        self.flush = AsyncMock(return_value=0)
+
+    async def send_many(self, dtos):
+        self.calls.append([dto.quantity for dto in dtos])
+        if self.failures:
+            raise self.failures.pop(0)
+        for dto in dtos:
+            if dto.quantity == 2:
+                raise CodecError()
+        self.sent.extend(dtos)
+
+
+async def test_failed_batch_is_sent_again_in_order():
+    inner = FlakyBroker([ConnectionError()])
+    repository = BufferedInventoryRepository(inner, retry_delay=0.01)
+
+    for quantity in (1, 3, 4):
+        await repository.send(make_dto(quantity))
+    await repository.flush(timeout=1)
+
+    assert inner.calls == [[1, 3, 4], [1, 3, 4]]
+    assert [dto.quantity for dto in inner.sent] == [1, 3, 4]
+
+
+async def test_event_that_can_not_be_encoded_is_dropped():
+    inner = FlakyBroker([])
+    repository = BufferedInventoryRepository(inner, retry_delay=0.01)
+
+    for quantity in (1, 2, 3, 4):
+        await repository.send(make_dto(quantity))
+    not_flushed = await repository.flush(timeout=1)
+
+    assert not_flushed == 0
+    assert [dto.quantity for dto in inner.sent] == [1, 3, 4]
+    assert repository._dropped.value == 1
+
+
+async def test_reject_policy_raises_when_full():
+    inner = GatedRepository()
+    repository = BufferedInventoryRepository(
+        inner, max_size=1, batch_size=1, overflow_policy=OverflowPolicy.REJECT
+    )
+
+    await repository.send(make_dto(1))
+    await asyncio.sleep(0)
+    await repository.send(make_dto(2))
+
+    with pytest.raises(PublishBufferFullError):
+        await repository.send(make_dto(3))
+    await repository.flush(timeout=0)
+
+
+async def test_spill_policy_publishes_spilled_events_in_order(tmp_path):
+    inner = GatedRepository()
+    repository = BufferedInventoryRepository(
+        inner,
+        max_size=1,
+        batch_size=1,
+        overflow_policy=OverflowPolicy.SPILL,
+        spill_directory=str(tmp_path),
+    )
+
+    for quantity in range(1, 5):
+        await repository.send(make_dto(quantity))
+        await asyncio.sleep(0)
+    assert list(tmp_path.iterdir())
+
+    inner.open.set()
+    not_flushed = await repository.flush(timeout=1)
+
+    assert not_flushed == 0
+    assert [dto.quantity for dto in inner.sent] == [1, 2, 3, 4]
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_flush_spills_unpublished_events(tmp_path):
+    inner = GatedRepository()
+    repository = BufferedInventoryRepository(
+        inner, max_size=10, spill_directory=str(tmp_path)
+    )
+    await repository.send(make_dto(1))
+    await repository.send(make_dto(2))
+
+    not_flushed = await repository.flush(timeout=0.01)
+
+    assert not_flushed == 0
+    resumed = BufferedInventoryRepository(
+        inner, max_size=10, spill_directory=str(tmp_path)
+    )
+    inner.open.set()
+    await resumed.send(make_dto(3))
+    await resumed.flush(timeout=1)
+    assert sorted(dto.quantity for dto in inner.sent) == [1, 2, 3]
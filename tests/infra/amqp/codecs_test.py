@@ -0,0 +1,165 @@
+import datetime
+
+import pytest
+
+from src.domain.use_cases.product_inventory_processor import (
+    InputInventoryProcessorDTO,
+    InventoryAction,
+    InventoryLine,
+)
+from src.infra.amqp.codecs import (
+    _BINARY_VERSION_WITH_EVENT_ID,
+    _EVENT_ID_SIZE,
+    _HEADER,
+    INVENTORY_BINARY_CONTENT_TYPE,
+    CodecError,
+    InventoryBinaryCodec,
+    inventory_codecs,
+)
+
+SAO_PAULO = datetime.timezone(datetime.timedelta(hours=-3))
+
+
+@pytest.mark.parametrize(
+    "expiration_date",
+    [
+        pytest.param(datetime.datetime(2024, 12, 31, 23, 59, 59), id="naive"),
+        pytest.param(
+            datetime.datetime(2024, 12, 31, 23, 59, 59, 123456, tzinfo=SAO_PAULO),
+            id="aware",
+        ),
+        pytest.param(datetime.datetime(1960, 1, 1), id="before_epoch"),
+    ],
+)
+def test_binary_codec_round_trip_keeps_lines(expiration_date):
+    codec = InventoryBinaryCodec()
+    dto = InputInventoryProcessorDTO(
+        code="ABC123",
+        supplier="Fornecedor São João",
+        expiration_date=expiration_date,
+        action=InventoryAction.REMOVE,
+        quantity=3,
+        lines=[
+            InventoryLine(
+                code="XYZ",
+                supplier="Supplier",
+                expiration_date=expiration_date,
+                quantity=500,
+            )
+        ],
+    )
+
+    decoded = codec.decode(codec.encode(dto))
+
+    assert decoded.to_lines() == dto.to_lines()
+    assert decoded.lines[1].expiration_date.utcoffset() == expiration_date.utcoffset()
+
+
+@pytest.mark.parametrize("lines", [[], [None]], ids=["single_product", "lines"])
+def test_binary_codec_round_trip_keeps_event_id(lines):
+    codec = InventoryBinaryCodec()
+    expiration_date = datetime.datetime(2024, 12, 31)
+    dto = InputInventoryProcessorDTO(
+        code="ABC123",
+        supplier="Supplier",
+        expiration_date=expiration_date,
+        action=InventoryAction.ADD,
+        lines=[
+            InventoryLine(
+                code="XYZ",
+                supplier="Supplier",
+                expiration_date=expiration_date,
+                quantity=1,
+            )
+            for _ in lines
+        ],
+        event_id="0f8fad5bd9cb469fa16570867728950e",
+    )
+
+    decoded = codec.decode(codec.encode(dto))
+
+    assert decoded.event_id == dto.event_id
+    assert decoded.to_lines() == dto.to_lines()
+
+
+def test_binary_codec_round_trip_keeps_events():
+    codec = InventoryBinaryCodec()
+    expiration_date = datetime.datetime(2024, 12, 31)
+    dto = InputInventoryProcessorDTO(
+        events=[
+            InputInventoryProcessorDTO(
+                code=code,
+                supplier="Supplier",
+                expiration_date=expiration_date,
+                action=InventoryAction.REMOVE,
+                quantity=2,
+                event_id=f"scan-{code}",
+            )
+            for code in ("A", "B")
+        ],
+        event_id="message-1",
+    )
+
+    decoded = codec.decode(codec.encode(dto))
+
+    assert decoded.event_id == "message-1"
+    assert [event.event_id for event in decoded.events] == ["scan-A", "scan-B"]
+    assert decoded.to_lines() == dto.to_lines()
+
+
+def test_json_producers_are_still_accepted():
+    body = (
+        b'{"code": "ABC123", "supplier": "Supplier",'
+        b' "expiration_date": "2024-12-31T23:59:59", "action": "a"}'
+    )
+
+    decoded = inventory_codecs.decode(body, None)
+
+    assert decoded.action == InventoryAction.ADD
+    assert decoded.quantity == 1
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        pytest.param(b"", id="empty"),
+        pytest.param(b"\x03\x00\x01\x00", id="unknown_version"),
+        pytest.param(b"\x01\x01\x00\x00", id="truncated"),
+        pytest.param(b"\x01\x00\x00", id="no_lines"),
+    ],
+)
+def test_binary_codec_rejects_malformed_body(body):
+    with pytest.raises(CodecError):
+        inventory_codecs.decode(body, INVENTORY_BINARY_CONTENT_TYPE)
+
+
+def test_binary_codec_rejects_event_id_longer_than_the_dto_allows():
+    event_id = b"e" * 65
+    body = (
+        _HEADER.pack(_BINARY_VERSION_WITH_EVENT_ID, 0, 1)
+        + _EVENT_ID_SIZE.pack(len(event_id))
+        + event_id
+    )
+
+    with pytest.raises(CodecError):
+        inventory_codecs.decode(body, INVENTORY_BINARY_CONTENT_TYPE)
+
+
+def test_binary_codec_wraps_encode_errors():
+    dto = InputInventoryProcessorDTO.model_construct(
+        code="ABC123",
+        supplier="Supplier",
+        expiration_date=datetime.datetime(2024, 12, 31),
+        action=InventoryAction.ADD,
+        quantity=3_000_000_000,
+        lines=[],
+        event_id=None,
+    )
+
+    with pytest.raises(CodecError):
+        InventoryBinaryCodec().encode(dto)
+
+
+def test_unknown_content_type_is_rejected():
+    with pytest.raises(CodecError):
+        inventory_codecs.decode(b"", "application/xml")
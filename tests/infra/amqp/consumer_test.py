@@ -0,0 +1,353 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pydantic
+import pytest
+
+from src.infra.amqp.codecs import CodecRegistry, JsonCodec
+from src.infra.amqp.consumer import AmqpConsumer, RetryPolicy, partition_of
+
+
+class FakeDTO(pydantic.BaseModel):
+    value: int
+
+
+fake_codecs = CodecRegistry(JsonCodec(FakeDTO))
+
+
+class FakeMessage:
+    def __init__(self, body: bytes, headers=None):
+        self.body = body
+        self.headers = headers
+        self.content_type = None
+        self.message_id = "message-id"
+        self.nack = AsyncMock()
+
+    @asynccontextmanager
+    async def process(self, requeue=False):
+        yield
+
+
+@pytest.fixture
+def fake_queue():
+    queue = MagicMock()
+    queue.consume = AsyncMock(return_value="consumer-tag")
+    queue.cancel = AsyncMock()
+    return queue
+
+
+@pytest.fixture
+def fake_channel(fake_queue):
+    channel = MagicMock()
+    channel.set_qos = AsyncMock()
+    channel.declare_queue = AsyncMock(return_value=fake_queue)
+    channel.close = AsyncMock()
+    channel.default_exchange.publish = AsyncMock()
+    return channel
+
+
+@pytest.fixture
+def fake_connection(fake_channel):
+    connection = MagicMock()
+    connection.channel = AsyncMock(return_value=fake_channel)
+    return connection
+
+
+class BlockingProcessor:
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.received = []
+
+    async def execute(self, dto):
+        self.started.set()
+        await self.release.wait()
+        self.received.append(dto)
+
+
+async def start_consumer(fake_connection, fake_queue, processor):
+    consumer = AmqpConsumer(fake_connection, prefetch_count=5)
+    consumer.subscribe_from_topic("inventory", processor, fake_codecs)
+    await consumer.run()
+    callback = fake_queue.consume.call_args.args[0]
+    return consumer, callback
+
+
+async def test_stop_waits_for_in_flight_messages(fake_connection, fake_queue):
+    processor = BlockingProcessor()
+    consumer, callback = await start_consumer(fake_connection, fake_queue, processor)
+
+    handler = asyncio.create_task(callback(FakeMessage(b'{"value": 1}')))
+    await processor.started.wait()
+    stopping = asyncio.create_task(consumer.stop(timeout=1))
+    await asyncio.sleep(0)
+    processor.release.set()
+    report = await stopping
+    await handler
+
+    fake_queue.cancel.assert_awaited_once_with("consumer-tag")
+    assert processor.received == [FakeDTO(value=1)]
+    assert report.drained == 1
+    assert report.requeued == 0
+
+
+async def test_stop_reports_unfinished_messages_as_requeued(
+    fake_connection, fake_queue
+):
+    processor = BlockingProcessor()
+    consumer, callback = await start_consumer(fake_connection, fake_queue, processor)
+
+    handler = asyncio.create_task(callback(FakeMessage(b'{"value": 1}')))
+    await processor.started.wait()
+    report = await consumer.stop(timeout=0.01)
+    handler.cancel()
+
+    assert report.drained == 0
+    assert report.requeued == 1
+
+
+async def test_messages_delivered_while_draining_are_requeued(
+    fake_connection, fake_queue
+):
+    processor = BlockingProcessor()
+    consumer, callback = await start_consumer(fake_connection, fake_queue, processor)
+    await consumer.stop(timeout=0.01)
+
+    message = FakeMessage(b'{"value": 1}')
+    await callback(message)
+
+    message.nack.assert_awaited_once_with(requeue=True)
+    assert processor.received == []
+
+
+class FailingProcessor:
+    def __init__(self, error: Exception):
+        self.error = error
+
+    async def execute(self, dto):
+        raise self.error
+
+
+class PermanentError(Exception):
+    retryable = False
+
+
+def published_routing_key_and_attempt(fake_channel):
+    call = fake_channel.default_exchange.publish.call_args
+    return call.kwargs["routing_key"], call.args[0].headers["x-attempt"]
+
+
+async def test_run_declares_retry_and_dead_letter_queues(fake_connection, fake_channel):
+    consumer = AmqpConsumer(
+        fake_connection, retry_policy=RetryPolicy(max_attempts=3, base_delay_ms=100)
+    )
+    consumer.subscribe_from_topic(
+        "inventory", FailingProcessor(Exception()), fake_codecs
+    )
+    await consumer.run()
+
+    declared = {
+        call.args[0]: call.kwargs.get("arguments")
+        for call in fake_channel.declare_queue.call_args_list
+    }
+    assert declared["inventory.retry.1"]["x-message-ttl"] == 100
+    assert declared["inventory.retry.2"]["x-message-ttl"] == 200
+    assert declared["inventory.retry.2"]["x-dead-letter-routing-key"] == "inventory"
+    assert "inventory.retry.3" not in declared
+    assert "inventory.dead-letter" in declared
+
+
+@pytest.mark.parametrize(
+    "error, headers, expected_routing_key, expected_attempt",
+    [
+        pytest.param(Exception(), None, "inventory.retry.1", 2, id="first_failure"),
+        pytest.param(
+            Exception(), {"x-attempt": 2}, "inventory.retry.2", 3, id="second_failure"
+        ),
+        pytest.param(
+            Exception(), {"x-attempt": 3}, "inventory.dead-letter", 3, id="exhausted"
+        ),
+        pytest.param(
+            PermanentError(), None, "inventory.dead-letter", 1, id="not_retryable"
+        ),
+    ],
+)
+async def test_failed_message_is_retried_or_dead_lettered(
+    fake_connection,
+    fake_queue,
+    fake_channel,
+    error,
+    headers,
+    expected_routing_key,
+    expected_attempt,
+):
+    consumer = AmqpConsumer(fake_connection, retry_policy=RetryPolicy(max_attempts=3))
+    consumer.subscribe_from_topic("inventory", FailingProcessor(error), fake_codecs)
+    await consumer.run()
+    callback = fake_queue.consume.call_args.args[0]
+
+    await callback(FakeMessage(b'{"value": 1}', headers=headers))
+
+    assert published_routing_key_and_attempt(fake_channel) == (
+        expected_routing_key,
+        expected_attempt,
+    )
+
+
+async def test_unparseable_message_is_dead_lettered(
+    fake_connection, fake_queue, fake_channel
+):
+    processor = BlockingProcessor()
+    consumer, callback = await start_consumer(fake_connection, fake_queue, processor)
+
+    await callback(FakeMessage(b"not json"))
+
+    assert published_routing_key_and_attempt(fake_channel) == (
+        "inventory.dead-letter",
+        1,
+    )
+    assert processor.received == []
+
+
+class KeyedDTO(pydantic.BaseModel):
+    keys: list[str]
+    seq: int
+
+
+keyed_codecs = CodecRegistry(JsonCodec(KeyedDTO))
+
+
+def keyed_message(seq, *keys):
+    return FakeMessage(KeyedDTO(keys=list(keys), seq=seq).model_dump_json().encode())
+
+
+class RecordingProcessor:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.received = []
+
+    async def execute(self, dto):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01 if dto.seq % 2 == 0 else 0)
+        self.received.append(dto.seq)
+        self.running -= 1
+
+
+async def start_partitioned_consumer(fake_connection, fake_queue, processor):
+    consumer = AmqpConsumer(fake_connection, prefetch_count=20, partitions=4)
+    consumer.subscribe_from_topic(
+        "inventory", processor, keyed_codecs, partition_keys=lambda dto: dto.keys
+    )
+    await consumer.run()
+    return consumer, fake_queue.consume.call_args.args[0]
+
+
+async def test_partition_queues_allow_a_single_active_consumer(
+    fake_connection, fake_channel
+):
+    consumer = AmqpConsumer(fake_connection)
+    consumer.subscribe_from_topic(
+        "inventory", RecordingProcessor(), keyed_codecs, partition_queues=2
+    )
+    await consumer.run()
+
+    declared = {
+        call.args[0]: call.kwargs.get("arguments")
+        for call in fake_channel.declare_queue.call_args_list
+    }
+    assert declared["inventory"] is None
+    assert declared["inventory.partition.0"] == {"x-single-active-consumer": True}
+    assert declared["inventory.partition.1"] == {"x-single-active-consumer": True}
+    await consumer.stop(timeout=0)
+
+
+async def test_partitions_owned_by_other_processes_are_subscribed_late(
+    fake_connection, fake_queue
+):
+    consumer = AmqpConsumer(fake_connection, owner=(1, 2), standby_delay=0.01)
+    consumer.subscribe_from_topic(
+        "inventory", RecordingProcessor(), keyed_codecs, partition_queues=4
+    )
+    await consumer.run()
+
+    owned = fake_queue.consume.await_count
+    await asyncio.sleep(0.05)
+
+    assert owned == 3
+    assert fake_queue.consume.await_count == 5
+    await consumer.stop(timeout=0)
+
+
+async def test_partition_queue_messages_are_processed_in_order(
+    fake_connection, fake_queue
+):
+    processor = RecordingProcessor()
+    consumer = AmqpConsumer(fake_connection)
+    consumer.subscribe_from_topic(
+        "inventory", processor, keyed_codecs, partition_queues=1
+    )
+    await consumer.run()
+    callback = fake_queue.consume.call_args.args[0]
+
+    for seq in range(6):
+        await callback(keyed_message(seq, f"product-{seq}"))
+    await consumer.stop(timeout=1)
+
+    assert processor.received == list(range(6))
+    assert processor.max_running == 1
+
+
+async def test_partitioned_messages_for_same_key_stay_ordered(
+    fake_connection, fake_queue
+):
+    processor = RecordingProcessor()
+    consumer, callback = await start_partitioned_consumer(
+        fake_connection, fake_queue, processor
+    )
+
+    for seq in range(6):
+        await callback(keyed_message(seq, "same-product"))
+    report = await consumer.stop(timeout=1)
+
+    assert processor.received == list(range(6))
+    assert processor.max_running == 1
+    assert report.drained == 6
+
+
+async def test_partitioned_messages_for_different_keys_run_in_parallel(
+    fake_connection, fake_queue
+):
+    processor = RecordingProcessor()
+    consumer, callback = await start_partitioned_consumer(
+        fake_connection, fake_queue, processor
+    )
+    keys = ["product-a", "product-b"]
+    assert partition_of(keys[0], 4) != partition_of(keys[1], 4)
+
+    for seq, key in enumerate(keys):
+        await callback(keyed_message(seq * 2, key))
+    await consumer.stop(timeout=1)
+
+    assert processor.max_running == 2
+
+
+async def test_message_spanning_partitions_waits_for_earlier_messages(
+    fake_connection, fake_queue
+):
+    processor = RecordingProcessor()
+    consumer, callback = await start_partitioned_consumer(
+        fake_connection, fake_queue, processor
+    )
+
+    await callback(keyed_message(0, "product-a"))
+    await callback(keyed_message(1, "product-b"))
+    await callback(keyed_message(3, "product-a", "product-b"))
+    await callback(keyed_message(5, "product-b"))
+    await consumer.stop(timeout=1)
+
+    assert processor.received.index(3) > processor.received.index(0)
+    assert processor.received.index(3) > processor.received.index(1)
+    assert processor.received.index(5) > processor.received.index(3)
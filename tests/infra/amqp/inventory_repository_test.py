@@ -0,0 +1,97 @@
+import datetime
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+from src.domain.use_cases.product_inventory_processor import (
+    InputInventoryProcessorDTO,
+    InventoryAction,
+)
+from src.infra.amqp.codecs import JsonCodec
+from src.infra.amqp.inventory_routing import InventoryRouter
+from src.infra.amqp.repositories.inventory_repository import AmqpInventoryRepository
+
+
+class FakeChannelPool:
+    def __init__(self):
+        self.channel = MagicMock()
+        self.channel.default_exchange.publish = AsyncMock()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.channel
+
+
+def make_dto(**kwargs):
+    return InputInventoryProcessorDTO(
+        code="ABC123",
+        supplier="Supplier",
+        expiration_date=datetime.datetime(2024, 12, 31),
+        action=InventoryAction.ADD,
+        **kwargs,
+    )
+
+
+def published_messages(channel_pool):
+    return [
+        call.args[0]
+        for call in channel_pool.channel.default_exchange.publish.call_args_list
+    ]
+
+
+async def test_send_stamps_a_new_event_id_per_event():
+    channel_pool = FakeChannelPool()
+    codec = JsonCodec(InputInventoryProcessorDTO)
+    repository = AmqpInventoryRepository(channel_pool, "inventory", codec)
+
+    await repository.send(make_dto())
+    await repository.send(make_dto())
+
+    first, second = published_messages(channel_pool)
+    assert first.message_id and second.message_id
+    assert first.message_id != second.message_id
+    assert codec.decode(first.body).event_id == first.message_id
+
+
+async def test_send_keeps_the_informed_event_id():
+    channel_pool = FakeChannelPool()
+    codec = JsonCodec(InputInventoryProcessorDTO)
+    repository = AmqpInventoryRepository(channel_pool, "inventory", codec)
+
+    await repository.send(make_dto(event_id="client-event"))
+
+    (message,) = published_messages(channel_pool)
+    assert message.message_id == "client-event"
+    assert codec.decode(message.body).event_id == "client-event"
+
+
+async def test_send_routes_each_product_to_its_partition_queue():
+    channel_pool = FakeChannelPool()
+    codec = JsonCodec(InputInventoryProcessorDTO)
+    repository = AmqpInventoryRepository(
+        channel_pool, "inventory", codec, InventoryRouter("inventory", 4)
+    )
+
+    await repository.send(make_dto())
+    await repository.send(make_dto(quantity=2))
+
+    routing_keys = [
+        call.kwargs["routing_key"]
+        for call in channel_pool.channel.default_exchange.publish.call_args_list
+    ]
+    assert routing_keys[0] == routing_keys[1]
+    assert routing_keys[0].startswith("inventory.partition.")
+
+
+async def test_send_many_publishes_events_in_order_on_one_channel():
+    channel_pool = FakeChannelPool()
+    channel_pool.acquire = MagicMock(wraps=channel_pool.acquire)
+    codec = JsonCodec(InputInventoryProcessorDTO)
+    repository = AmqpInventoryRepository(channel_pool, "inventory", codec)
+
+    await repository.send_many([make_dto(quantity=q) for q in (1, 2, 3)])
+
+    assert channel_pool.acquire.call_count == 1
+    assert [
+        codec.decode(message.body).quantity
+        for message in published_messages(channel_pool)
+    ] == [1, 2, 3]
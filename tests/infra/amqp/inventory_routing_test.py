@@ -0,0 +1,53 @@
+import datetime
+
+from src.domain.use_cases.product_inventory_processor import (
+    InputInventoryProcessorDTO,
+    InventoryLine,
+)
+from src.infra.amqp.consumer import partition_of
+from src.infra.amqp.inventory_routing import InventoryRouter
+
+EXPIRATION_DATE = datetime.datetime(2024, 12, 31)
+
+
+def make_line(code):
+    return InventoryLine(
+        code=code, supplier="Supplier", expiration_date=EXPIRATION_DATE, quantity=1
+    )
+
+
+def test_router_uses_the_partition_of_the_first_product():
+    router = InventoryRouter("inventory", 8)
+    dto = InputInventoryProcessorDTO(lines=[make_line("A"), make_line("B")])
+
+    assert router.routing_key_for(dto) == (
+        f"inventory.partition.{partition_of('ASupplier20241231', 8)}"
+    )
+
+
+def test_router_without_partitions_uses_the_topic_queue():
+    router = InventoryRouter("inventory", 0)
+    dto = InputInventoryProcessorDTO(lines=[make_line("A")])
+
+    assert router.routing_key_for(dto) == "inventory"
+
+
+def test_split_groups_events_by_partition_queue():
+    router = InventoryRouter("inventory", 4)
+    codes = [f"P{index}" for index in range(8)]
+    dto = InputInventoryProcessorDTO(
+        events=[
+            InputInventoryProcessorDTO(lines=[make_line(code)], event_id=code)
+            for code in codes
+        ],
+        event_id="message-1",
+    )
+
+    parts = router.split(dto)
+
+    assert sorted(event.event_id for _, part in parts for event in part.events) == (
+        sorted(codes)
+    )
+    for routing_key, part in parts:
+        assert part.event_id is None
+        assert {router.routing_key_for(event) for event in part.events} == {routing_key}
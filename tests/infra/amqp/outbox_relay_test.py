@@ -0,0 +1,123 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.infra.amqp.outbox_relay import OutboxRelay
+
+
+class FakeSession:
+    def __init__(self, rows, locked=True):
+        self.rows = rows
+        self.locked = locked
+        self.executed = []
+        self.commit = AsyncMock()
+
+    async def execute(self, statement, params=None, **kwargs):
+        self.executed.append(params)
+        result = MagicMock()
+        result.scalar.return_value = self.locked
+        result.all.return_value = self.rows if len(self.executed) == 2 else []
+        return result
+
+
+class FakeSqlAlchemy:
+    def __init__(self, *batches, locked=True):
+        self.sessions = [FakeSession(rows, locked) for rows in batches]
+        self._next = iter(self.sessions)
+
+    @asynccontextmanager
+    async def async_session(self):
+        yield next(self._next)
+
+
+class FakeChannelPool:
+    def __init__(self):
+        self.channel = MagicMock()
+        self.channel.default_exchange.publish = AsyncMock()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.channel
+
+
+def make_rows(*ids):
+    return [
+        SimpleNamespace(
+            id=row_id,
+            message_id=f"event-{row_id}",
+            routing_key=f"inventory.partition.{row_id % 2}",
+            content_type="application/json",
+            body=b"{}",
+        )
+        for row_id in ids
+    ]
+
+
+async def test_relay_publishes_batch_and_deletes_rows():
+    sqlalchemy_instance = FakeSqlAlchemy(make_rows(1, 2), [])
+    channel_pool = FakeChannelPool()
+    relay = OutboxRelay(sqlalchemy_instance, channel_pool, "inventory", batch_size=2)
+
+    relayed = await relay.relay_pending()
+
+    published = [
+        (call.args[0].message_id, call.kwargs["routing_key"])
+        for call in channel_pool.channel.default_exchange.publish.call_args_list
+    ]
+    session = sqlalchemy_instance.sessions[0]
+    assert relayed == 2
+    assert published == [
+        ("event-1", "inventory.partition.1"),
+        ("event-2", "inventory.partition.0"),
+    ]
+    assert session.executed[2] == {"ids": [1, 2]}
+    session.commit.assert_awaited_once()
+
+
+async def test_relay_keeps_rows_when_publish_fails():
+    sqlalchemy_instance = FakeSqlAlchemy(make_rows(1))
+    channel_pool = FakeChannelPool()
+    channel_pool.channel.default_exchange.publish.side_effect = ConnectionError()
+    relay = OutboxRelay(sqlalchemy_instance, channel_pool, "inventory")
+
+    with pytest.raises(ConnectionError):
+        await relay.relay_pending()
+
+    session = sqlalchemy_instance.sessions[0]
+    assert len(session.executed) == 2
+    session.commit.assert_not_awaited()
+
+
+async def test_relay_skips_when_another_process_holds_the_lock():
+    sqlalchemy_instance = FakeSqlAlchemy(make_rows(1), locked=False)
+    channel_pool = FakeChannelPool()
+    relay = OutboxRelay(sqlalchemy_instance, channel_pool, "inventory")
+
+    relayed = await relay.relay_pending()
+
+    session = sqlalchemy_instance.sessions[0]
+    assert relayed == 0
+    assert len(session.executed) == 1
+    channel_pool.channel.default_exchange.publish.assert_not_awaited()
+
+
+async def test_relay_starts_every_publish_before_awaiting_confirms():
+    sqlalchemy_instance = FakeSqlAlchemy(make_rows(1, 2, 3))
+    channel_pool = FakeChannelPool()
+    started = []
+    confirmed = asyncio.Event()
+
+    async def publish(message, routing_key):
+        started.append(message.message_id)
+        if len(started) == 3:
+            confirmed.set()
+        await confirmed.wait()
+
+    channel_pool.channel.default_exchange.publish.side_effect = publish
+    relay = OutboxRelay(sqlalchemy_instance, channel_pool, "inventory", batch_size=5)
+
+    assert await asyncio.wait_for(relay.relay_pending(), timeout=1) == 3
+    assert started == ["event-1", "event-2", "event-3"]
@@ -0,0 +1,65 @@
+import datetime
+from email.utils import format_datetime
+
+from src.domain.entities.product import ProductVersion
+from src.infra.http.conditional import (
+    etag_of,
+    is_conditional,
+    is_not_modified,
+    validator_headers,
+    version_of,
+)
+
+MODIFIED_AT = datetime.datetime(2024, 5, 10, 12, 30, 15, 250000, tzinfo=datetime.UTC)
+VERSION = ProductVersion("ABC123Supplier20241231", MODIFIED_AT, 10)
+
+
+def test_etag_is_strong_and_changes_with_inventory_and_time():
+    etag = etag_of(VERSION)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == etag_of(ProductVersion(VERSION.product_id, MODIFIED_AT, 10))
+    assert etag != etag_of(ProductVersion(VERSION.product_id, MODIFIED_AT, 11))
+    later = MODIFIED_AT + datetime.timedelta(microseconds=1)
+    assert etag != etag_of(ProductVersion(VERSION.product_id, later, 10))
+
+
+def test_version_of_product_matches_the_stored_version(product_fake_fixture):
+    version = version_of(product_fake_fixture)
+    assert version.product_id == "ABC123Supplier20241231"
+    assert version.modified_at == product_fake_fixture.updated_at
+    assert version.inventory_quantity == product_fake_fixture.inventory_quantity
+
+    never_updated = product_fake_fixture.model_copy(update={"updated_at": None})
+    assert version_of(never_updated).modified_at == product_fake_fixture.created_at
+
+
+def test_validator_headers():
+    headers = validator_headers(VERSION)
+    assert headers["ETag"] == etag_of(VERSION)
+    assert headers["Last-Modified"] == "Fri, 10 May 2024 12:30:15 GMT"
+
+
+def test_if_none_match():
+    etag = etag_of(VERSION)
+    assert is_conditional({"if-none-match": etag})
+    assert is_not_modified({"if-none-match": etag}, VERSION)
+    assert is_not_modified({"if-none-match": f'"other", W/{etag}'}, VERSION)
+    assert is_not_modified({"if-none-match": "*"}, VERSION)
+    assert not is_not_modified({"if-none-match": '"other"'}, VERSION)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    headers = {
+        "if-none-match": '"other"',
+        "if-modified-since": format_datetime(MODIFIED_AT, usegmt=True),
+    }
+    assert not is_not_modified(headers, VERSION)
+
+
+def test_if_modified_since():
+    last_modified = validator_headers(VERSION)["Last-Modified"]
+    earlier = format_datetime(MODIFIED_AT - datetime.timedelta(seconds=1), usegmt=True)
+    assert is_not_modified({"if-modified-since": last_modified}, VERSION)
+    assert not is_not_modified({"if-modified-since": earlier}, VERSION)
+    assert not is_not_modified({"if-modified-since": "not a date"}, VERSION)
+    assert not is_conditional({})
@@ -0,0 +1,29 @@
+from src.infra.metrics import MetricsRegistry
+
+
+def test_render_groups_labelled_metrics_by_family():
+    registry = MetricsRegistry()
+    registry.counter("messages_total", "Messages", topic="a").inc()
+    registry.counter("messages_total", "Messages", topic="b").inc(2)
+    registry.gauge("depth", "Depth").set(5)
+
+    rendered = registry.render()
+
+    assert rendered == (
+        "# HELP messages_total Messages\n"
+        "# TYPE messages_total counter\n"
+        'messages_total{topic="a"} 1\n'
+        'messages_total{topic="b"} 2\n'
+        "# HELP depth Depth\n"
+        "# TYPE depth gauge\n"
+        "depth 5\n"
+    )
+
+
+def test_counter_is_shared_for_same_name_and_labels():
+    registry = MetricsRegistry()
+
+    first = registry.counter("messages_total", "Messages", topic="a")
+    second = registry.counter("messages_total", "Messages", topic="a")
+
+    assert first is second
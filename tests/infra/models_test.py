@@ -0,0 +1,37 @@
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from src.infra.sqlalchemy.models import upgrade_existing_tables
+
+
+def test_upgrade_adds_new_columns_and_indexes_to_existing_tables():
+    connection = MagicMock()
+    connection.dialect = postgresql.asyncpg.dialect()
+
+    upgrade_existing_tables(connection)
+
+    altered = [call.args[0] for call in connection.exec_driver_sql.call_args_list]
+    indexes = [
+        str(call.args[0].compile(dialect=connection.dialect))
+        for call in connection.execute.call_args_list
+    ]
+    assert altered == [
+        "ALTER TABLE product ADD COLUMN IF NOT EXISTS "
+        "inventory_shards INTEGER DEFAULT '0' NOT NULL",
+        "ALTER TABLE product ADD COLUMN IF NOT EXISTS "
+        "version INTEGER DEFAULT '1' NOT NULL",
+        "ALTER TABLE product_inventory_shard ADD COLUMN IF NOT EXISTS "
+        "updated_at TIMESTAMP WITH TIME ZONE",
+        "ALTER TABLE inventory_outbox ADD COLUMN IF NOT EXISTS "
+        "routing_key VARCHAR(255)",
+        "DROP INDEX IF EXISTS ix_product_version",
+        "DROP INDEX IF EXISTS ix_product_supplier_valuation",
+    ]
+    assert all(index.startswith("CREATE INDEX IF NOT EXISTS") for index in indexes)
+    assert not any("ix_product_version" in index for index in indexes)
+    assert any(
+        "ix_product_inventory_shard_updated_at ON product_inventory_shard" in index
+        for index in indexes
+    )
+    assert any("ix_purchase_product_id ON purchase" in index for index in indexes)
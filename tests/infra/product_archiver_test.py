@@ -0,0 +1,35 @@
+import datetime
+
+from src.infra.product_archiver import ProductArchiver
+
+
+class ChunkedRepository:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.calls = []
+
+    async def archive_expired(self, expired_before, chunk_size):
+        self.calls.append((expired_before, chunk_size))
+        return self.chunks.pop(0) if self.chunks else (0, 0)
+
+
+async def test_run_archives_chunks_until_a_short_one():
+    repository = ChunkedRepository([(2, 5), (2, 0), (1, 1)])
+    archiver = ProductArchiver(
+        repository, datetime.timedelta(days=30), chunk_size=2, pause=0
+    )
+
+    assert await archiver.run() == 5
+    assert len(repository.calls) == 3
+    assert all(chunk_size == 2 for _, chunk_size in repository.calls)
+    assert len({expired_before for expired_before, _ in repository.calls}) == 1
+
+
+async def test_run_uses_the_retention_period():
+    repository = ChunkedRepository([])
+    archiver = ProductArchiver(repository, datetime.timedelta(days=30), chunk_size=2)
+
+    assert await archiver.run() == 0
+    expired_before, _ = repository.calls[0]
+    expected = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=30)
+    assert abs(expired_before - expected) < datetime.timedelta(seconds=5)
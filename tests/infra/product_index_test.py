@@ -0,0 +1,138 @@
+import datetime
+
+from src.domain.entities.product import Product
+from src.infra.search.product_index import (
+    IndexedProductRepository,
+    ProductSearchFeed,
+    ProductSearchIndex,
+    fold,
+    tokenize,
+)
+
+EXPIRATION_DATE = datetime.datetime(2024, 12, 31, tzinfo=datetime.UTC)
+CREATED_AT = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+
+
+def make_product(code, title, description="", updated_at=CREATED_AT):
+    return Product(
+        title=title,
+        description=description,
+        code=code,
+        supplier="Supplier",
+        inventory_quantity=10,
+        buy_price=1.0,
+        sell_price=2.0,
+        weight_in_kilograms=1.0,
+        expiration_date=EXPIRATION_DATE,
+        created_at=CREATED_AT,
+        updated_at=updated_at,
+    )
+
+
+async def codes(index, query, offset=0, limit=10):
+    page = await index.search(query, offset, limit)
+    return [product.code for product in page.products], page.total
+
+
+def test_tokenize_folds_accents_and_case():
+    assert fold("Pão de AÇÚCAR") == "pao de acucar"
+    assert tokenize("Café-torrado, 500g!") == ["cafe", "torrado", "500g"]
+
+
+async def test_search_matches_prefixes_and_requires_every_token():
+    index = ProductSearchIndex()
+    index.upsert(make_product("A", "Café Torrado", "Moído na hora"))
+    index.upsert(make_product("B", "Cafeteira Elétrica"))
+    index.upsert(make_product("C", "Chocolate", "Com café"))
+
+    assert await codes(index, "CAFE") == (["A", "B", "C"], 3)
+    assert await codes(index, "caf torr") == (["A"], 1)
+    assert await codes(index, "moido") == (["A"], 1)
+    assert await codes(index, "cafe chá") == ([], 0)
+    assert await codes(index, "c") == ([], 0)
+    assert await codes(index, "!!!") == ([], 0)
+
+
+async def test_title_matches_rank_above_description_matches():
+    index = ProductSearchIndex()
+    index.upsert(make_product("A", "Biscoito", "Sabor limão"))
+    index.upsert(make_product("B", "Limão Taiti"))
+
+    assert await codes(index, "limao") == (["B", "A"], 2)
+
+
+async def test_search_paginates():
+    index = ProductSearchIndex()
+    for number in range(5):
+        index.upsert(make_product(f"P{number}", f"Arroz {number}"))
+
+    assert await codes(index, "arroz", offset=0, limit=2) == (["P0", "P1"], 5)
+    assert await codes(index, "arroz", offset=4, limit=2) == (["P4"], 5)
+
+
+async def test_upsert_and_remove_update_the_postings():
+    index = ProductSearchIndex()
+    index.upsert(make_product("A", "Feijão Preto"))
+    index.upsert(make_product("A", "Feijão Carioca"))
+
+    assert await codes(index, "preto") == ([], 0)
+    assert await codes(index, "carioca") == (["A"], 1)
+
+    index.remove("ASupplier20241231")
+    assert await codes(index, "feijao") == ([], 0)
+    assert len(index) == 0
+
+
+class FakeRepository:
+    def __init__(self, products):
+        self.products = products
+        self.since = []
+
+    async def list_modified_since(self, since=None):
+        self.since.append(since)
+        return [
+            product
+            for product in self.products
+            if since is None or (product.updated_at or product.created_at) > since
+        ]
+
+    async def create(self, product):
+        return product
+
+    async def remove(self, code, supplier, expiration_date):
+        return code
+
+    async def exists_from(self, code, supplier, expiration_date):
+        return True
+
+
+async def test_feed_rebuilds_then_polls_changes_with_overlap():
+    repository = FakeRepository([make_product("A", "Leite")])
+    index = ProductSearchIndex()
+    feed = ProductSearchFeed(index, repository, datetime.timedelta(seconds=5))
+
+    assert await feed.poll() == 1
+    assert feed.watermark == CREATED_AT
+
+    updated_at = CREATED_AT + datetime.timedelta(minutes=1)
+    repository.products = [make_product("A", "Leite Integral", updated_at=updated_at)]
+    assert await feed.poll() == 1
+    assert repository.since[-1] == CREATED_AT - datetime.timedelta(seconds=5)
+    assert feed.watermark == updated_at
+    assert await codes(index, "integral") == (["A"], 1)
+
+    repository.products = []
+    await feed.rebuild()
+    assert await codes(index, "leite") == ([], 0)
+
+
+async def test_indexed_repository_keeps_the_index_in_sync():
+    index = ProductSearchIndex()
+    repository = IndexedProductRepository(FakeRepository([]), index)
+
+    await repository.create(make_product("A", "Azeite"))
+    assert await codes(index, "azei") == (["A"], 1)
+    assert await repository.exists_from("A", "Supplier", EXPIRATION_DATE)
+
+    await repository.remove("A", "Supplier", EXPIRATION_DATE)
+    assert await codes(index, "azeite") == ([], 0)
@@ -0,0 +1,74 @@
+import datetime
+
+from src.domain.entities.product import Product
+from src.domain.use_cases.product_get import OutputProductGetDTO
+from src.infra.sqlalchemy.models import ProductModel
+
+NOW = datetime.datetime(2024, 6, 1, tzinfo=datetime.UTC)
+
+
+def make_model(**overrides):
+    fields = dict(
+        id="SKU1",
+        title="Product",
+        description="Description",
+        code="SKU1",
+        supplier="Supplier",
+        inventory_quantity=10,
+        sharded_inventory_quantity=5,
+        buy_price=10.0,
+        sell_price=15.0,
+        weight_in_kilograms=1.5,
+        expiration_date=NOW,
+        created_at=NOW,
+        updated_at=None,
+        version=2,
+    )
+    fields.update(overrides)
+    return ProductModel(**fields)
+
+
+def test_to_entity_matches_a_validated_product():
+    product = make_model().to_entity()
+
+    assert product == Product(
+        title="Product",
+        description="Description",
+        code="SKU1",
+        supplier="Supplier",
+        inventory_quantity=15,
+        buy_price=10.0,
+        sell_price=15.0,
+        weight_in_kilograms=1.5,
+        expiration_date=NOW,
+        created_at=NOW,
+        version=2,
+    )
+    assert product.updated_at is None
+
+
+def test_trusted_product_serializes_like_a_validated_one():
+    trusted = make_model(updated_at=NOW).to_entity()
+    validated = Product(**trusted.model_dump())
+
+    assert trusted.model_dump_json() == validated.model_dump_json()
+    assert trusted.model_dump(exclude_unset=True) == validated.model_dump(
+        exclude_unset=True
+    )
+
+
+def test_output_dto_keeps_the_trusted_product():
+    product = make_model().to_entity()
+
+    output = OutputProductGetDTO(success=True, msg=None, product=product)
+
+    assert output.product is product
+
+
+def test_trusted_product_stays_mutable():
+    product = make_model().to_entity()
+
+    product.title = "Renamed"
+
+    assert product.title == "Renamed"
+    assert make_model().to_entity().title == "Product"
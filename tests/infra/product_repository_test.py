@@ -0,0 +1,243 @@
+import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from src.domain.entities.product import Product, ProductKey
+from src.infra.sqlalchemy.repositories.product_repository import (
+    SQLAlchemyProductRepository,
+    _fold_and_set_shards,
+    _lock_product,
+    _lock_product_shards,
+    _lock_sharded_product,
+    _move_inventory_to_shards,
+    _product_exists,
+    _products_modified_since,
+    _select_product,
+    _set_shard,
+    _unbalanced_sharded_products,
+)
+
+EXPIRATION_DATE = datetime.datetime(2024, 12, 31, tzinfo=datetime.UTC)
+
+
+def make_row(**overrides):
+    fields = dict(
+        id="ASupplier20241231",
+        title="Product",
+        description="Description",
+        code="A",
+        supplier="Supplier",
+        inventory_quantity=10,
+        inventory_shards=0,
+        sharded_inventory_quantity=3,
+        sharded_updated_at=None,
+        buy_price=10.0,
+        sell_price=15.0,
+        weight_in_kilograms=1.5,
+        expiration_date=EXPIRATION_DATE,
+        created_at=EXPIRATION_DATE,
+        updated_at=EXPIRATION_DATE,
+        version=4,
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def execute(self, statement, params=None):
+        self.statements.append((statement, params))
+        if "ids" in params:
+            return [self.rows[key] for key in params["ids"] if key in self.rows]
+        row = self.rows.get(params["product_id"])
+        result = MagicMock()
+        result.one_or_none.return_value = row
+        result.scalar.return_value = None if row is None else 1
+        return result
+
+
+def make_repository(rows):
+    session = FakeSession(rows)
+    instance = MagicMock()
+    instance.async_session = lambda: session
+    return SQLAlchemyProductRepository(instance), session
+
+
+async def test_get_maps_core_rows_to_products():
+    repository, session = make_repository({"ASupplier20241231": make_row()})
+
+    product = await repository.get_by_code_supplier_expiration(
+        "A", "Supplier", EXPIRATION_DATE
+    )
+
+    assert product == Product(
+        title="Product",
+        description="Description",
+        code="A",
+        supplier="Supplier",
+        inventory_quantity=13,
+        buy_price=10.0,
+        sell_price=15.0,
+        weight_in_kilograms=1.5,
+        expiration_date=EXPIRATION_DATE,
+        created_at=EXPIRATION_DATE,
+        updated_at=EXPIRATION_DATE,
+        version=4,
+    )
+    assert session.statements == [
+        (_select_product, {"product_id": "ASupplier20241231"})
+    ]
+
+
+async def test_get_reports_the_latest_shard_update_as_the_product_update():
+    shard_updated_at = EXPIRATION_DATE + datetime.timedelta(days=1)
+    repository, _ = make_repository(
+        {"ASupplier20241231": make_row(sharded_updated_at=shard_updated_at)}
+    )
+
+    product = await repository.get_by_code_supplier_expiration(
+        "A", "Supplier", EXPIRATION_DATE
+    )
+
+    assert product.updated_at == shard_updated_at
+
+
+def test_modified_since_also_finds_products_with_updated_shards():
+    sql = str(_products_modified_since.compile(dialect=postgresql.asyncpg.dialect()))
+
+    assert "product_inventory_shard.updated_at >" in sql
+
+
+async def test_get_returns_none_for_missing_products():
+    repository, _ = make_repository({})
+
+    assert (
+        await repository.get_by_code_supplier_expiration(
+            "A", "Supplier", EXPIRATION_DATE
+        )
+        is None
+    )
+
+
+async def test_exists_only_selects_a_constant():
+    repository, session = make_repository({"ASupplier20241231": make_row()})
+
+    assert await repository.exists_from("A", "Supplier", EXPIRATION_DATE)
+    assert not await repository.exists_from("B", "Supplier", EXPIRATION_DATE)
+    assert [statement for statement, _ in session.statements] == [
+        _product_exists,
+        _product_exists,
+    ]
+
+
+async def test_get_many_runs_one_query_and_keeps_the_request_order():
+    repository, session = make_repository(
+        {
+            "ASupplier20241231": make_row(),
+            "BSupplier20241231": make_row(id="BSupplier20241231", code="B"),
+        }
+    )
+    keys = [
+        ProductKey("B", "Supplier", EXPIRATION_DATE),
+        ProductKey("C", "Supplier", EXPIRATION_DATE),
+        ProductKey("A", "Supplier", EXPIRATION_DATE),
+        ProductKey("B", "Supplier", EXPIRATION_DATE),
+    ]
+
+    products = await repository.get_many(keys)
+
+    assert [product and product.code for product in products] == [
+        "B",
+        None,
+        "A",
+        "B",
+    ]
+    assert len(session.statements) == 1
+    assert sorted(session.statements[0][1]["ids"]) == [
+        "ASupplier20241231",
+        "BSupplier20241231",
+        "CSupplier20241231",
+    ]
+
+
+class FakeShardSession:
+    def __init__(self, products, shards):
+        self.products = products
+        self.shards = shards
+        self.rows_set = []
+        self.moved = []
+        self.statements = []
+        self.commit = AsyncMock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def execute(self, statement, params=None, **kwargs):
+        self.statements.append(statement)
+        result = MagicMock()
+        if statement is _unbalanced_sharded_products:
+            result.scalars.return_value = list(self.products)
+        elif statement is _lock_sharded_product:
+            result.first.return_value = self.products.get(
+                params["rebalance_product_id"]
+            )
+        elif statement is _lock_product_shards:
+            result.scalars.return_value = self.shards[params["rebalance_product_id"]]
+        elif statement is _set_shard:
+            self.rows_set.extend(
+                (row["rebalance_shard"], row["rebalance_quantity"]) for row in params
+            )
+        elif statement is _move_inventory_to_shards:
+            self.moved.append(params["rebalance_product_id"])
+        return result
+
+
+async def test_compaction_spreads_stock_evenly_across_shards():
+    session = FakeShardSession(
+        {
+            "ASupplier20241231": SimpleNamespace(
+                inventory_quantity=5, inventory_shards=4
+            )
+        },
+        {"ASupplier20241231": [0, 0, 6]},
+    )
+    instance = MagicMock()
+    instance.async_session = lambda: session
+    repository = SQLAlchemyProductRepository(instance)
+
+    assert await repository.compact_inventory_shards() == 1
+    assert session.rows_set == [(0, 3), (1, 3), (2, 3), (3, 2)]
+    assert session.moved == ["ASupplier20241231"]
+    session.commit.assert_awaited_once()
+
+
+async def test_resharding_locks_the_product_before_its_shards():
+    session = FakeShardSession(
+        {
+            "ASupplier20241231": SimpleNamespace(
+                inventory_quantity=4, inventory_shards=2
+            )
+        },
+        {"ASupplier20241231": []},
+    )
+    instance = MagicMock()
+    instance.async_session = lambda: session
+    repository = SQLAlchemyProductRepository(instance)
+
+    assert await repository.set_inventory_shards("A", "Supplier", EXPIRATION_DATE, 2)
+    assert session.statements[:2] == [_lock_product, _fold_and_set_shards]
+    assert session.rows_set == [(0, 2), (1, 2)]
@@ -0,0 +1,103 @@
+import datetime
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+from src.domain.entities.product import ProductKey
+from src.infra.sqlalchemy.connection import ReplicaPool
+from src.infra.sqlalchemy.repositories.product_repository import (
+    SQLAlchemyProductRepository,
+)
+
+EXPIRATION_DATE = datetime.datetime(2024, 12, 31, tzinfo=datetime.UTC)
+
+
+class FakeEngine:
+    def __init__(self, lag=0.0, error=None):
+        self.lag = lag
+        self.error = error
+
+    @asynccontextmanager
+    async def connect(self):
+        if self.error:
+            raise self.error
+        connection = MagicMock()
+
+        async def execute(statement):
+            result = MagicMock()
+            result.scalar_one.return_value = self.lag
+            return result
+
+        connection.execute = execute
+        yield connection
+
+
+async def test_replica_pool_round_robins_over_fresh_replicas():
+    pool = ReplicaPool([FakeEngine(0.1), FakeEngine(5.0), FakeEngine(0.0)], max_lag=1.0)
+    assert pool.next_session_factory() is None
+
+    await pool.check_lag()
+
+    assert pool.healthy() == [0, 2]
+    chosen = [pool.next_session_factory() for _ in range(4)]
+    assert chosen == [pool.session_factories[index] for index in (0, 2, 0, 2)]
+
+
+async def test_replica_pool_falls_back_when_no_replica_is_usable():
+    pool = ReplicaPool(
+        [FakeEngine(error=OSError("down")), FakeEngine(3.0)], max_lag=1.0
+    )
+    await pool.check_lag()
+
+    assert pool.lags == [None, 3.0]
+    assert pool.next_session_factory() is None
+
+
+class FakeSession:
+    def __init__(self, existing_ids):
+        self.existing_ids = existing_ids
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def execute(self, statement, *args, **kwargs):
+        result = MagicMock()
+        result.scalars.return_value = list(self.existing_ids)
+        return result
+
+
+def make_instance(replica_ids, primary_ids):
+    instance = MagicMock()
+    instance.async_session = lambda: FakeSession(primary_ids)
+    replica_session = lambda: FakeSession(replica_ids)
+    instance.read_session = lambda: replica_session
+    return instance
+
+
+async def test_replica_misses_are_confirmed_on_the_primary():
+    instance = make_instance(
+        replica_ids=["ASupplier20241231"],
+        primary_ids=["ASupplier20241231", "BSupplier20241231"],
+    )
+    repository = SQLAlchemyProductRepository(instance, read_from_replicas=True)
+    keys = [
+        ProductKey("A", "Supplier", EXPIRATION_DATE),
+        ProductKey("B", "Supplier", EXPIRATION_DATE),
+        ProductKey("C", "Supplier", EXPIRATION_DATE),
+    ]
+
+    assert await repository.missing_from(keys) == [keys[2]]
+
+
+async def test_primary_reads_skip_the_replicas():
+    instance = make_instance(replica_ids=[], primary_ids=["ASupplier20241231"])
+    instance.read_session = MagicMock()
+    repository = SQLAlchemyProductRepository(instance)
+
+    assert (
+        await repository.missing_from([ProductKey("A", "Supplier", EXPIRATION_DATE)])
+        == []
+    )
+    instance.read_session.assert_not_called()
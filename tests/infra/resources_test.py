@@ -0,0 +1,25 @@
+import pytest
+
+from src.infra.resources import resources_per_process, split_budget
+
+
+@pytest.mark.parametrize(
+    "budget, processes, expected",
+    [
+        pytest.param(40, 4, 10, id="even_split"),
+        pytest.param(10, 3, 3, id="rounds_down"),
+        pytest.param(2, 8, 1, id="at_least_one"),
+        pytest.param(10, 0, 10, id="no_processes"),
+    ],
+)
+def test_split_budget(budget, processes, expected):
+    assert split_budget(budget, processes) == expected
+
+
+def test_resources_never_exceed_budget():
+    resources = resources_per_process(
+        postgres_connection_budget=50, broker_channel_budget=20, processes=6
+    )
+
+    assert (resources.postgres_pool_size + resources.postgres_max_overflow) * 6 <= 50
+    assert resources.broker_channel_pool_size * 6 <= 20
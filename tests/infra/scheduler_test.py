@@ -0,0 +1,35 @@
+import asyncio
+
+from src.infra.scheduler import PeriodicTask
+
+
+async def test_periodic_task_runs_until_stopped():
+    calls = []
+
+    async def callback():
+        calls.append(1)
+
+    task = PeriodicTask("test", 0.01, callback)
+    task.start()
+    await asyncio.sleep(0.05)
+    await task.stop()
+    runs = len(calls)
+    await asyncio.sleep(0.03)
+
+    assert runs >= 2
+    assert len(calls) == runs
+
+
+async def test_periodic_task_survives_failures():
+    calls = []
+
+    async def callback():
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    task = PeriodicTask("test", 0.01, callback)
+    task.start()
+    await asyncio.sleep(0.05)
+    await task.stop()
+
+    assert len(calls) >= 2
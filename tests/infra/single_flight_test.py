@@ -0,0 +1,157 @@
+import asyncio
+import datetime
+
+import pytest
+
+from src.domain.entities.product import ProductKey
+from src.infra.single_flight import SingleFlight, SingleFlightProductRepository
+
+
+class SlowRepository:
+    def __init__(self, result="product", error=None):
+        self.calls = 0
+        self.batches = []
+        self.release = asyncio.Event()
+        self.result = result
+        self.error = error
+
+    async def get_by_code_supplier_expiration(self, code, supplier, expiration_date):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return self.result
+
+    async def get_many(self, keys):
+        self.batches.append(keys)
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return [f"{self.result}-{key.code}" for key in keys]
+
+    async def exists_from(self, code, supplier, expiration_date):
+        return True
+
+
+EXPIRATION_DATE = datetime.datetime(2024, 12, 31)
+
+
+async def test_concurrent_identical_reads_share_one_call():
+    inner = SlowRepository()
+    repository = SingleFlightProductRepository(inner, SingleFlight("test"))
+
+    reads = [
+        asyncio.create_task(
+            repository.get_by_code_supplier_expiration("A", "S", EXPIRATION_DATE)
+        )
+        for _ in range(10)
+    ]
+    other = asyncio.create_task(
+        repository.get_by_code_supplier_expiration("B", "S", EXPIRATION_DATE)
+    )
+    await asyncio.sleep(0)
+    inner.release.set()
+
+    assert await asyncio.gather(*reads) == ["product"] * 10
+    await other
+    assert inner.calls == 2
+
+    await repository.get_by_code_supplier_expiration("A", "S", EXPIRATION_DATE)
+    assert inner.calls == 3
+
+
+async def test_errors_reach_every_waiter():
+    inner = SlowRepository(error=RuntimeError("db down"))
+    repository = SingleFlightProductRepository(inner, SingleFlight("test"))
+
+    reads = [
+        asyncio.create_task(
+            repository.get_by_code_supplier_expiration("A", "S", EXPIRATION_DATE)
+        )
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    inner.release.set()
+
+    results = await asyncio.gather(*reads, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert inner.calls == 1
+
+
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    inner = SlowRepository()
+    repository = SingleFlightProductRepository(inner, SingleFlight("test"))
+
+    first = asyncio.create_task(
+        repository.get_by_code_supplier_expiration("A", "S", EXPIRATION_DATE)
+    )
+    second = asyncio.create_task(
+        repository.get_by_code_supplier_expiration("A", "S", EXPIRATION_DATE)
+    )
+    await asyncio.sleep(0)
+    first.cancel()
+    inner.release.set()
+
+    assert await second == "product"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_other_methods_are_delegated():
+    repository = SingleFlightProductRepository(SlowRepository())
+
+    assert await repository.exists_from("A", "S", EXPIRATION_DATE) is True
+
+
+async def test_lookups_join_in_flight_reads_and_batch_the_rest():
+    inner = SlowRepository()
+    repository = SingleFlightProductRepository(inner, SingleFlight("test"))
+
+    single = asyncio.create_task(
+        repository.get_by_code_supplier_expiration("A", "S", EXPIRATION_DATE)
+    )
+    await asyncio.sleep(0)
+    lookup = asyncio.create_task(
+        repository.get_many(
+            [
+                ProductKey("B", "S", EXPIRATION_DATE),
+                ProductKey("A", "S", EXPIRATION_DATE),
+                ProductKey("C", "S", EXPIRATION_DATE),
+                ProductKey("B", "S", EXPIRATION_DATE),
+            ]
+        )
+    )
+    await asyncio.sleep(0)
+    joined = asyncio.create_task(
+        repository.get_by_code_supplier_expiration("C", "S", EXPIRATION_DATE)
+    )
+    await asyncio.sleep(0)
+    inner.release.set()
+
+    assert await lookup == ["product-B", "product", "product-C", "product-B"]
+    assert await single == "product"
+    assert await joined == "product-C"
+    assert inner.calls == 1
+    assert inner.batches == [
+        [ProductKey("B", "S", EXPIRATION_DATE), ProductKey("C", "S", EXPIRATION_DATE)]
+    ]
+
+
+async def test_lookup_errors_reach_every_waiter():
+    inner = SlowRepository(error=RuntimeError("db down"))
+    repository = SingleFlightProductRepository(inner, SingleFlight("test"))
+
+    lookup = asyncio.create_task(
+        repository.get_many([ProductKey("A", "S", EXPIRATION_DATE)])
+    )
+    await asyncio.sleep(0)
+    joined = asyncio.create_task(
+        repository.get_by_code_supplier_expiration("A", "S", EXPIRATION_DATE)
+    )
+    await asyncio.sleep(0)
+    inner.release.set()
+
+    results = await asyncio.gather(lookup, joined, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert inner.batches == [[ProductKey("A", "S", EXPIRATION_DATE)]]
+    assert inner.calls == 0
@@ -0,0 +1,143 @@
+import asyncio
+import datetime
+
+import pytest
+
+from src.domain.entities.product import SupplierValuation
+from src.infra.supplier_valuation import SupplierValuationCache, SupplierValuationFeed
+
+MODIFIED_AT = datetime.datetime(2024, 6, 1, tzinfo=datetime.UTC)
+
+
+def make_valuation(supplier, inventory_quantity=10):
+    return SupplierValuation(
+        supplier=supplier,
+        products=1,
+        inventory_quantity=inventory_quantity,
+        stock_value=inventory_quantity * 10.0,
+        potential_revenue=inventory_quantity * 15.0,
+        margin=inventory_quantity * 5.0,
+        weight_in_kilograms=inventory_quantity * 1.0,
+    )
+
+
+class FakeRepository:
+    def __init__(self, valuations):
+        self.valuations = {valuation.supplier: valuation for valuation in valuations}
+        self.calls = []
+        self.modified = {}
+        self.error = None
+
+    async def supplier_valuations(self, suppliers=None):
+        self.calls.append(suppliers)
+        await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        selected = sorted(self.valuations if suppliers is None else suppliers)
+        return [self.valuations[s] for s in selected if s in self.valuations]
+
+    async def suppliers_modified_since(self, since=None):
+        return {
+            supplier: (modified_at, 1)
+            for supplier, modified_at in self.modified.items()
+            if since is None or modified_at > since
+        }
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(repository, ttl=60.0):
+    clock = FakeClock()
+    return SupplierValuationCache(repository, ttl=ttl, clock=clock), clock
+
+
+async def test_repeated_reads_are_served_from_memory():
+    repository = FakeRepository([make_valuation("A"), make_valuation("B")])
+    cache, _ = make_cache(repository)
+
+    first = await cache.supplier_valuations()
+    second = await cache.supplier_valuations(["B", "missing"])
+
+    assert [valuation.supplier for valuation in first] == ["A", "B"]
+    assert second == [make_valuation("B")]
+    assert repository.calls == [None]
+
+
+async def test_concurrent_cold_reads_share_one_query():
+    repository = FakeRepository([make_valuation("A")])
+    cache, _ = make_cache(repository)
+
+    await asyncio.gather(*(cache.supplier_valuations() for _ in range(5)))
+
+    assert repository.calls == [None]
+
+
+async def test_invalidation_recomputes_only_changed_suppliers():
+    repository = FakeRepository([make_valuation("A"), make_valuation("B")])
+    cache, _ = make_cache(repository)
+    await cache.supplier_valuations()
+
+    repository.valuations["B"] = make_valuation("B", inventory_quantity=3)
+    del repository.valuations["A"]
+    repository.valuations["C"] = make_valuation("C")
+    cache.invalidate(["B", "A", "C"])
+
+    assert await cache.supplier_valuations() == [
+        make_valuation("B", inventory_quantity=3),
+        make_valuation("C"),
+    ]
+    assert repository.calls == [None, ["A", "B", "C"]]
+
+
+async def test_failed_refresh_keeps_suppliers_stale():
+    repository = FakeRepository([make_valuation("A")])
+    cache, _ = make_cache(repository)
+    await cache.supplier_valuations()
+    cache.invalidate(["A"])
+    repository.error = RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        await cache.supplier_valuations()
+
+    repository.error = None
+    await cache.supplier_valuations()
+    assert repository.calls == [None, ["A"], ["A"]]
+
+
+async def test_expired_cache_is_reloaded():
+    repository = FakeRepository([make_valuation("A")])
+    cache, clock = make_cache(repository, ttl=60)
+    await cache.supplier_valuations()
+
+    clock.now = 30
+    await cache.supplier_valuations()
+    clock.now = 61
+    await cache.supplier_valuations()
+
+    assert repository.calls == [None, None]
+
+
+async def test_feed_invalidates_suppliers_with_changed_products():
+    repository = FakeRepository([make_valuation("A"), make_valuation("B")])
+    cache, _ = make_cache(repository)
+    feed = SupplierValuationFeed(
+        cache, repository, overlap=datetime.timedelta(seconds=5)
+    )
+    repository.modified = {"A": MODIFIED_AT, "B": MODIFIED_AT}
+    await feed.poll()
+    await cache.supplier_valuations()
+
+    repository.modified["B"] = MODIFIED_AT + datetime.timedelta(minutes=1)
+    assert await feed.poll() == 1
+    assert feed.watermark == repository.modified["B"]
+    assert await feed.poll() == 0
+
+    await cache.supplier_valuations()
+    await cache.supplier_valuations()
+    assert repository.calls == [None, ["B"]]